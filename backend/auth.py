@@ -1,5 +1,6 @@
 import json
 import os
+import secrets
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
@@ -83,6 +84,21 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
         raise credentials_exception
     return user
 
+def metrics_authorized(authorization: str) -> bool:
+    """Bearer METRICS_TOKEN (for scrapers) or a panel JWT; METRICS_PUBLIC=true opts out"""
+    if os.environ.get("METRICS_PUBLIC", "").lower() == "true":
+        return True
+    token = os.environ.get("METRICS_TOKEN")
+    if token and secrets.compare_digest(authorization, f"Bearer {token}"):
+        return True
+    if not authorization.startswith("Bearer "):
+        return False
+    try:
+        get_current_user(authorization[len("Bearer "):])
+        return True
+    except HTTPException:
+        return False
+
 def must_change_password(username: str):
     user = get_user(username)
     return user and user.get("must_change", False)
@@ -0,0 +1,126 @@
+"""
+Boot-Time Benchmark für Blockpanel
+Compares cold starts with AppCDS-archived starts of a (stopped) server
+using the same "Done (" detection as the backend
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from cds_archive import CdsArchiveManager
+from jvm_profiles import build_java_command, DEFAULT_PROFILE
+
+# Max seconds for the world save after "stop"
+STOP_TIMEOUT = 60.0
+
+
+def timed_boot(command: List[str], cwd: str, timeout: float) -> Tuple[Optional[float], int]:
+    """Start the server, return (seconds until "Done (", exit code) and stop it again"""
+    started = time.monotonic()
+    process = subprocess.Popen(command, cwd=cwd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               stderr=subprocess.STDOUT, text=True, errors="replace")
+    # Reading stdout blocks, a JVM that hangs without output is only ended by the watchdog
+    watchdog = threading.Timer(timeout, process.kill)
+    watchdog.start()
+    boot_time = None
+    try:
+        for line in process.stdout:
+            if "Done (" in line:
+                boot_time = time.monotonic() - started
+                watchdog.cancel()
+                watchdog = threading.Timer(STOP_TIMEOUT, process.kill)
+                watchdog.start()
+                process.stdin.write("stop\n")
+                process.stdin.flush()
+                break
+        if boot_time is None:
+            process.kill()
+        for _ in process.stdout:
+            pass
+        return boot_time, process.wait()
+    finally:
+        watchdog.cancel()
+
+
+def summarize(times: List[Optional[float]]) -> dict:
+    ok = [t for t in times if t is not None]
+    return {
+        "runs": len(times),
+        "failed": len(times) - len(ok),
+        "mean_s": round(statistics.mean(ok), 2) if ok else None,
+        "min_s": round(min(ok), 2) if ok else None,
+        "max_s": round(max(ok), 2) if ok else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Blockpanel AppCDS Boot Benchmark")
+    parser.add_argument("server_dir", help="Directory of a stopped server (purpur.jar, eula.txt)")
+    parser.add_argument("--runs", type=int, default=3, help="Starts per mode")
+    parser.add_argument("--ram", default="2048", help="Heap size in MB")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE, help="JVM profile")
+    parser.add_argument("--timeout", type=float, default=180, help="Max seconds per boot")
+    parser.add_argument("--output", help="Output file for results (JSON)")
+    args = parser.parse_args()
+
+    server_dir = os.path.abspath(args.server_dir)
+    jar_path = os.path.join(server_dir, "purpur.jar")
+    base_command = build_java_command(args.ram, args.profile)
+    name = os.path.basename(server_dir)
+
+    with tempfile.TemporaryDirectory(prefix="cds-bench-") as archive_dir:
+        cds = CdsArchiveManager(archive_dir=archive_dir, enabled=True)
+
+        cold = []
+        for i in range(args.runs):
+            boot, _ = timed_boot(base_command, server_dir, args.timeout)
+            print(f"cold run {i + 1}: {boot if boot is None else round(boot, 2)}s")
+            cold.append(boot)
+
+        # First clean boot records the archive
+        build_command = cds.prepare_command(name, base_command, jar_path)
+        build_time, returncode = timed_boot(build_command, server_dir, args.timeout)
+        cds.on_exit(name, returncode)
+        print(f"archive build run: {build_time if build_time is None else round(build_time, 2)}s")
+
+        archived = []
+        for i in range(args.runs):
+            command = cds.prepare_command(name, base_command, jar_path)
+            if cds.get_mode(name) != "use":
+                print("❌ No usable CDS archive was created")
+                sys.exit(1)
+            boot, returncode = timed_boot(command, server_dir, args.timeout)
+            cds.on_exit(name, returncode)
+            print(f"archived run {i + 1}: {boot if boot is None else round(boot, 2)}s")
+            archived.append(boot)
+
+    result = {
+        "server_dir": server_dir,
+        "profile": args.profile,
+        "cold": summarize(cold),
+        "archive_build_s": round(build_time, 2) if build_time else None,
+        "archived": summarize(archived),
+    }
+    if result["cold"]["mean_s"] and result["archived"]["mean_s"]:
+        result["speedup"] = round(result["cold"]["mean_s"] / result["archived"]["mean_s"], 2)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"📄 Results saved to {args.output}")
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n⚠️  Benchmark interrupted by user")
+        sys.exit(1)
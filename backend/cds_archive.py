@@ -0,0 +1,182 @@
+"""
+AppCDS Archive Manager für Minecraft Server
+Builds a dynamic class-data-sharing archive per jar checksum on the first clean
+run (-XX:ArchiveClassesAtExit) and reuses it for every later start of any
+server on that jar (-XX:SharedArchiveFile).
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import time
+import logging
+from typing import Dict, List, Optional
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+# Warnings/errors of the cds log tag mean the archive could not be used
+_CDS_FAILURE = re.compile(r"\[(?:warning|error)\s*\]\[cds")
+
+
+class CdsArchiveManager:
+    def __init__(self, archive_dir: str = "/app/mc_servers/.cds",
+                 enabled: bool = os.environ.get("MC_APPCDS", "1") != "0"):
+        self.archive_dir = archive_dir
+        self.enabled = enabled
+        self.lock = Lock()
+        self._checksums: Dict[tuple, str] = {}
+        self._java_version: Optional[str] = None
+        self.building: Dict[str, str] = {}   # checksum -> servername
+        self.sessions: Dict[str, Dict] = {}  # servername -> {"checksum", "mode", "tmp"}
+
+    def jar_checksum(self, jar_path: str) -> str:
+        st = os.stat(jar_path)
+        key = (jar_path, st.st_size, st.st_mtime_ns)
+        checksum = self._checksums.get(key)
+        if checksum is None:
+            digest = hashlib.sha256()
+            with open(jar_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(chunk)
+            checksum = digest.hexdigest()
+            self._checksums[key] = checksum
+        return checksum
+
+    def java_version(self) -> str:
+        if self._java_version is None:
+            try:
+                out = subprocess.run(["java", "-version"], capture_output=True, text=True, timeout=30)
+                self._java_version = (out.stderr or out.stdout).strip()
+            except Exception as e:
+                logger.warning(f"Could not determine java version: {e}")
+                self._java_version = ""
+        return self._java_version
+
+    def _archive_path(self, checksum: str) -> str:
+        return os.path.join(self.archive_dir, f"{checksum}.jsa")
+
+    def _meta_path(self, checksum: str) -> str:
+        return os.path.join(self.archive_dir, f"{checksum}.json")
+
+    def _canonical_jar(self, jar_path: str, checksum: str) -> str:
+        """
+        CDS validates the classpath at runtime, so every server on the same jar
+        has to launch it from the same path: a hardlink named after the checksum.
+        """
+        jar_dir = os.path.join(self.archive_dir, "jars")
+        canonical = os.path.join(jar_dir, f"{checksum}.jar")
+        if not os.path.exists(canonical):
+            os.makedirs(jar_dir, exist_ok=True)
+            tmp = f"{canonical}.tmp-{os.getpid()}"
+            try:
+                os.link(jar_path, tmp)
+            except OSError:
+                shutil.copy2(jar_path, tmp)
+            os.replace(tmp, canonical)
+        return canonical
+
+    def _load_meta(self, checksum: str) -> Optional[Dict]:
+        try:
+            with open(self._meta_path(checksum), "r") as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+    def _is_valid(self, checksum: str) -> bool:
+        meta = self._load_meta(checksum)
+        archive = self._archive_path(checksum)
+        return (meta is not None and os.path.exists(archive)
+                and meta.get("java_version") == self.java_version()
+                and meta.get("size") == os.path.getsize(archive))
+
+    def invalidate(self, checksum: str, reason: str = ""):
+        with self.lock:
+            for path in (self._archive_path(checksum), self._meta_path(checksum)):
+                if os.path.exists(path):
+                    os.remove(path)
+        logger.warning(f"CDS archive {checksum[:12]} invalidated {reason}".strip())
+
+    def prepare_command(self, servername: str, command: List[str], jar_path: str) -> List[str]:
+        """
+        Return `command` with the CDS flags for this start.
+        Uses the archive if a valid one exists, otherwise lets the first server
+        on this jar record one at its next clean exit.
+        """
+        self.sessions.pop(servername, None)
+        if not self.enabled or "-jar" not in command:
+            return command
+        try:
+            checksum = self.jar_checksum(jar_path)
+            canonical = self._canonical_jar(jar_path, checksum)
+            os.makedirs(self.archive_dir, exist_ok=True)
+        except Exception as e:
+            logger.warning(f"CDS disabled for {servername}: {e}")
+            return command
+        jar_index = command.index("-jar")
+        flags: List[str] = []
+        with self.lock:
+            if os.path.exists(self._archive_path(checksum)) and self._is_valid(checksum):
+                flags = [f"-XX:SharedArchiveFile={self._archive_path(checksum)}", "-Xshare:auto"]
+                self.sessions[servername] = {"checksum": checksum, "mode": "use"}
+            elif checksum not in self.building:
+                tmp = f"{self._archive_path(checksum)}.{servername}.tmp"
+                flags = [f"-XX:ArchiveClassesAtExit={tmp}"]
+                self.building[checksum] = servername
+                self.sessions[servername] = {"checksum": checksum, "mode": "build", "tmp": tmp}
+        if not flags:
+            return command
+        return command[:jar_index] + flags + ["-jar", canonical] + command[jar_index + 2:]
+
+    def on_console_line(self, servername: str, line: str):
+        session = self.sessions.get(servername)
+        if session and session["mode"] == "use" and _CDS_FAILURE.search(line):
+            session["mode"] = "invalid"
+            self.invalidate(session["checksum"], f"after start of {servername}: {line.strip()}")
+
+    def on_exit(self, servername: str, returncode: Optional[int]):
+        session = self.sessions.pop(servername, None)
+        if not session or session["mode"] != "build":
+            return
+        checksum = session["checksum"]
+        tmp = session["tmp"]
+        with self.lock:
+            self.building.pop(checksum, None)
+            try:
+                if returncode == 0 and os.path.exists(tmp) and os.path.getsize(tmp) > 0:
+                    os.replace(tmp, self._archive_path(checksum))
+                    meta = {
+                        "checksum": checksum,
+                        "java_version": self.java_version(),
+                        "size": os.path.getsize(self._archive_path(checksum)),
+                        "created": int(time.time()),
+                        "built_by": servername,
+                    }
+                    with open(self._meta_path(checksum), "w") as f:
+                        json.dump(meta, f, indent=2)
+                    logger.info(f"CDS archive for jar {checksum[:12]} created by {servername}")
+                elif os.path.exists(tmp):
+                    os.remove(tmp)
+            except Exception as e:
+                logger.warning(f"Could not store CDS archive from {servername}: {e}")
+
+    def get_mode(self, servername: str) -> Optional[str]:
+        session = self.sessions.get(servername)
+        return session["mode"] if session else None
+
+    def list_archives(self) -> List[Dict]:
+        archives = []
+        if not os.path.exists(self.archive_dir):
+            return archives
+        for filename in sorted(os.listdir(self.archive_dir)):
+            if filename.endswith(".json"):
+                meta = self._load_meta(filename[:-5])
+                if meta:
+                    meta["valid"] = self._is_valid(meta["checksum"])
+                    archives.append(meta)
+        return archives
+
+# Global instance
+cds_manager = CdsArchiveManager()
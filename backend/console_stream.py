@@ -0,0 +1,65 @@
+"""
+Console Stream für WebSocket-Clients
+Bounded per-client buffer between the console pump threads and one
+WebSocket: producers never block, a slow client loses its oldest lines and
+is told how many were dropped
+"""
+import asyncio
+from collections import deque
+from typing import List, Optional, Tuple
+from threading import Lock
+
+DEFAULT_MAX_ITEMS = 1000
+
+
+class ConsoleStream:
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_items: int = DEFAULT_MAX_ITEMS):
+        self.loop = loop
+        self.max_items = max_items
+        self.items = deque()
+        self.dropped = 0
+        self.lock = Lock()
+        self.ready = asyncio.Event()
+        self._signaled = False
+
+    def push(self, item: tuple):
+        """Thread-safe; wakes the sender at most once per batch"""
+        with self.lock:
+            if len(self.items) >= self.max_items:
+                self.items.popleft()
+                self.dropped += 1
+            self.items.append(item)
+            notify = not self._signaled
+            self._signaled = True
+        if notify:
+            self.loop.call_soon_threadsafe(self.ready.set)
+
+    async def next_batch(self) -> Tuple[List[tuple], int]:
+        """Wait for items, return (items, lines dropped since the last batch)"""
+        await self.ready.wait()
+        self.ready.clear()
+        with self.lock:
+            items = list(self.items)
+            self.items.clear()
+            dropped, self.dropped = self.dropped, 0
+            self._signaled = False
+        return items, dropped
+
+
+def group_lines(items: List[tuple]) -> List[dict]:
+    """Turn queued items into messages, consecutive console lines become one "lines" message"""
+    messages: List[dict] = []
+    current: Optional[dict] = None
+    for item in items:
+        kind = item[0]
+        if kind == "line":
+            _, seq, line = item
+            if current is None or (seq is not None and current["seq"] is not None
+                                   and current["seq"] + len(current["lines"]) != seq):
+                current = {"type": "lines", "seq": seq, "lines": []}
+                messages.append(current)
+            current["lines"].append(line)
+        else:
+            current = None
+            messages.append(item[1])
+    return messages
@@ -0,0 +1,152 @@
+"""
+CPU Core Allocator for Minecraft Servers
+Assigns CPU sets to running servers (disjoint while enough cores are free,
+least-loaded overlap otherwise) and pins the JVMs to them
+"""
+import json
+import os
+import shutil
+import logging
+import psutil
+from typing import Dict, Iterable, List, Optional
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+
+def format_cpu_list(cpus: Iterable[int]) -> str:
+    return ",".join(str(cpu) for cpu in sorted(cpus))
+
+
+def apply_affinity(pid: int, cpus: List[int]) -> bool:
+    """Pin every thread of a running process (JVM threads don't pick up later changes of the main thread)"""
+    try:
+        proc = psutil.Process(pid)
+        for thread in proc.threads():
+            try:
+                os.sched_setaffinity(thread.id, cpus)
+            except ProcessLookupError:
+                pass
+        return True
+    except (psutil.Error, OSError) as e:
+        logger.warning(f"Could not set CPU affinity of PID {pid}: {e}")
+        return False
+
+
+class CpuAllocator:
+    def __init__(self,
+                 allocation_file: str = "/app/mc_servers/cpu_allocations.json",
+                 cpus: Optional[List[int]] = None):
+        self.allocation_file = allocation_file
+        self.cpus = sorted(cpus if cpus is not None else os.sched_getaffinity(0))
+        self.lock = Lock()
+
+    def _load_allocations(self) -> Dict[str, List[int]]:
+        try:
+            if os.path.exists(self.allocation_file):
+                with open(self.allocation_file, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not load CPU allocations: {e}")
+        return {}
+
+    def _save_allocations(self, allocations: Dict[str, List[int]]) -> bool:
+        try:
+            os.makedirs(os.path.dirname(self.allocation_file), exist_ok=True)
+            with open(self.allocation_file, 'w') as f:
+                json.dump(allocations, f, indent=2)
+            return True
+        except Exception as e:
+            logger.error(f"Could not save CPU allocations: {e}")
+            return False
+
+    def _core_load(self, allocations: Dict[str, List[int]]) -> Dict[int, int]:
+        load = {cpu: 0 for cpu in self.cpus}
+        for cores in allocations.values():
+            for cpu in cores:
+                if cpu in load:
+                    load[cpu] += 1
+        return load
+
+    def _pick(self, load: Dict[int, int], count: int, current: List[int] = ()) -> List[int]:
+        # Least loaded cores first; on a tie keep the current cores, then the lowest id
+        ranked = sorted(load, key=lambda cpu: (load[cpu], cpu not in current, cpu))
+        return sorted(ranked[:count])
+
+    def allocate_cpus(self, server_name: str, count: int) -> List[int]:
+        """Allocate `count` cores for a server and return them"""
+        count = max(1, min(count, len(self.cpus)))
+        with self.lock:
+            allocations = self._load_allocations()
+            existing = allocations.pop(server_name, None)
+            if existing and len(existing) == count and all(cpu in self.cpus for cpu in existing):
+                allocations[server_name] = existing
+                return existing
+            cores = self._pick(self._core_load(allocations), count)
+            allocations[server_name] = cores
+            self._save_allocations(allocations)
+        logger.info(f"Allocated CPUs {format_cpu_list(cores)} to {server_name}")
+        return cores
+
+    def release_cpus(self, server_name: str) -> bool:
+        with self.lock:
+            allocations = self._load_allocations()
+            if server_name not in allocations:
+                return False
+            cores = allocations.pop(server_name)
+            self._save_allocations(allocations)
+        logger.info(f"Released CPUs {format_cpu_list(cores)} from {server_name}")
+        return True
+
+    def release_stale(self, active: Iterable[str]):
+        """Drop allocations of servers that are no longer running"""
+        active = set(active)
+        with self.lock:
+            allocations = self._load_allocations()
+            stale = [name for name in allocations if name not in active]
+            for name in stale:
+                allocations.pop(name)
+            if stale:
+                self._save_allocations(allocations)
+                logger.info(f"Released stale CPU allocations of {', '.join(stale)}")
+
+    def rebalance(self) -> Dict[str, List[int]]:
+        """
+        Re-spread the remaining allocations after a server stopped so shared cores
+        move to freed ones. Returns the servers whose CPU set changed.
+        """
+        with self.lock:
+            allocations = self._load_allocations()
+            balanced: Dict[str, List[int]] = {}
+            for name in sorted(allocations, key=lambda n: -len(allocations[n])):
+                current = allocations[name]
+                balanced[name] = self._pick(self._core_load(balanced), len(current), current)
+            changed = {name: cores for name, cores in balanced.items() if cores != sorted(allocations[name])}
+            if changed:
+                self._save_allocations(balanced)
+        for name, cores in changed.items():
+            logger.info(f"Rebalanced {name} to CPUs {format_cpu_list(cores)}")
+        return changed
+
+    def get_server_cpus(self, server_name: str) -> Optional[List[int]]:
+        return self._load_allocations().get(server_name)
+
+    def pin_command(self, command: List[str], cpus: List[int]) -> List[str]:
+        """Prefix the launch command with taskset so the JVM starts pinned"""
+        if shutil.which("taskset"):
+            return ["taskset", "-c", format_cpu_list(cpus)] + command
+        return command
+
+    def get_allocation_status(self) -> dict:
+        allocations = self._load_allocations()
+        load = self._core_load(allocations)
+        return {
+            "cpus": self.cpus,
+            "load": {str(cpu): servers for cpu, servers in load.items()},
+            "free": [cpu for cpu, servers in load.items() if servers == 0],
+            "shared": [cpu for cpu, servers in load.items() if servers > 1],
+            "allocations": allocations
+        }
+
+# Global instance
+cpu_allocator = CpuAllocator()
@@ -0,0 +1,149 @@
+"""
+Fleet Manager für Minecraft Server
+Bulk start/stop with bounded parallelism and RAM-aware admission control,
+console command broadcasts streamed back as the servers answer
+"""
+import os
+import time
+import logging
+import psutil
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List
+from threading import Condition
+
+logger = logging.getLogger(__name__)
+
+
+class FleetManager:
+    def __init__(self,
+                 max_parallel: int = int(os.environ.get("BULK_MAX_PARALLEL", "2")),
+                 reserve_mb: int = int(os.environ.get("BULK_RAM_RESERVE_MB", "512")),
+                 broadcast_parallel: int = int(os.environ.get("BROADCAST_MAX_PARALLEL", "16"))):
+        self.max_parallel = max_parallel
+        # Commands are cheap network round trips, far more can run at once than JVM boots
+        self.broadcast_parallel = broadcast_parallel
+        # Memory that is always kept free for the OS, the panel and HAProxy
+        self.reserve_mb = reserve_mb
+
+    def _available_mb(self) -> int:
+        return int(psutil.virtual_memory().available / 1024 / 1024)
+
+    def _parallelism(self, parallel: int, count: int, default: int = None, limit: int = 8) -> int:
+        return max(1, min(parallel or default or self.max_parallel, limit, count or 1))
+
+    def bulk_start(self,
+                   servernames: List[str],
+                   start_fn: Callable[[str], Dict],
+                   ram_fn: Callable[[str], int],
+                   is_running_fn: Callable[[str], bool],
+                   parallel: int = None) -> List[Dict]:
+        """
+        Start servers with at most `parallel` JVMs booting at the same time.
+        A JVM is only launched when the currently available memory minus the
+        heap of all JVMs still booting from this batch covers its configured RAM;
+        otherwise it waits in the queue until a boot finishes. Servers that still
+        don't fit when nothing else is booting are reported as insufficient_memory.
+        """
+        # A name listed twice would race itself in start_fn and be reported twice
+        servernames = list(dict.fromkeys(servernames))
+        queue = deque(servernames)
+        results: Dict[str, Dict] = {}
+        cond = Condition()
+        state = {"booting_mb": 0, "booting": 0}
+
+        def worker():
+            while True:
+                with cond:
+                    if not queue:
+                        return
+                    name = queue.popleft()
+                started = time.monotonic()
+                if is_running_fn(name):
+                    results[name] = {"server": name, "status": "already running"}
+                    continue
+                ram = ram_fn(name)
+                with cond:
+                    while True:
+                        headroom = self._available_mb() - state["booting_mb"] - self.reserve_mb
+                        if headroom >= ram:
+                            state["booting_mb"] += ram
+                            state["booting"] += 1
+                            break
+                        if state["booting"] == 0:
+                            headroom = None
+                            break
+                        cond.wait(timeout=5)
+                if headroom is None:
+                    logger.warning(f"Bulk start: not enough memory for {name} ({ram}MB)")
+                    results[name] = {
+                        "server": name,
+                        "status": "insufficient_memory",
+                        "ram": ram,
+                        "available_mb": self._available_mb(),
+                    }
+                    continue
+                waited = round(time.monotonic() - started, 2)
+                try:
+                    outcome = start_fn(name)
+                except Exception as e:
+                    logger.error(f"Bulk start: failed to start {name}: {e}")
+                    outcome = {"status": "error", "error": str(e)}
+                finally:
+                    with cond:
+                        state["booting_mb"] -= ram
+                        state["booting"] -= 1
+                        cond.notify_all()
+                results[name] = {"server": name, "ram": ram, "queued_for": waited, **outcome}
+
+        workers = self._parallelism(parallel, len(servernames))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bulk-start") as pool:
+            for future in [pool.submit(worker) for _ in range(workers)]:
+                future.result()
+        return [results[name] for name in servernames if name in results]
+
+    def bulk_stop(self,
+                  servernames: List[str],
+                  stop_fn: Callable[[str], Dict],
+                  parallel: int = None) -> List[Dict]:
+        servernames = list(dict.fromkeys(servernames))
+
+        def stop_one(name: str) -> Dict:
+            try:
+                return {"server": name, **stop_fn(name)}
+            except Exception as e:
+                logger.error(f"Bulk stop: failed to stop {name}: {e}")
+                return {"server": name, "status": "error", "error": str(e)}
+
+        workers = self._parallelism(parallel, len(servernames))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bulk-stop") as pool:
+            return list(pool.map(stop_one, servernames))
+
+    def broadcast(self,
+                  servernames: List[str],
+                  send_fn: Callable[[str], Dict],
+                  parallel: int = None) -> Iterator[Dict]:
+        """
+        Run send_fn for every server with bounded parallelism and yield each
+        result as soon as it is there (completion order, not input order).
+        Closing the iterator early cancels the servers that haven't started yet.
+        """
+        def send_one(name: str) -> Dict:
+            started = time.monotonic()
+            try:
+                outcome = send_fn(name)
+            except Exception as e:
+                logger.warning(f"Broadcast: {name} failed: {e}")
+                outcome = {"status": "error", "error": str(e)}
+            return {"server": name, **outcome, "duration": round(time.monotonic() - started, 3)}
+
+        workers = self._parallelism(parallel, len(servernames), self.broadcast_parallel, 64)
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="broadcast")
+        try:
+            for future in as_completed([pool.submit(send_one, name) for name in servernames]):
+                yield future.result()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+# Global instance
+fleet_manager = FleetManager()
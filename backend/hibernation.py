@@ -0,0 +1,246 @@
+"""
+Idle Hibernation für Minecraft Server
+Stops servers that had no players for a configurable time and keeps their
+port bound with a lightweight listener that answers status pings with a
+"sleeping" MOTD and starts the server on the first real login attempt
+"""
+import json
+import os
+import socket
+import time
+import logging
+from typing import Callable, Dict, List, Optional
+from threading import Event, Lock, Thread
+
+from mc_protocol import (
+    ProtocolError, encode_packet, encode_string, parse_handshake, query_player_count, read_packet
+)
+
+logger = logging.getLogger(__name__)
+
+MARKER_FILE = "hibernated"
+CONNECTION_TIMEOUT = 5.0
+
+
+class WakeListener:
+    """Stand-in for a sleeping server on its game port"""
+
+    def __init__(self, servername: str, port: int, motd: str, on_wake: Callable[[], None]):
+        self.servername = servername
+        self.port = port
+        self.motd = motd
+        self.on_wake = on_wake
+        self.woken = Event()
+        self._sock: Optional[socket.socket] = None
+
+    def start(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(("0.0.0.0", self.port))
+        sock.listen(16)
+        self._sock = sock
+        Thread(target=self._accept_loop, name=f"wake-{self.servername}", daemon=True).start()
+        logger.info(f"Hibernation: {self.servername} sleeping, listening on port {self.port}")
+
+    def close(self):
+        sock, self._sock = self._sock, None
+        if sock:
+            try:
+                # shutdown() wakes up the blocked accept(), close() alone keeps the port bound
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+    def _accept_loop(self):
+        while self._sock is not None:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                break
+            Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _status_json(self, protocol: int) -> str:
+        return json.dumps({
+            "version": {"name": "Sleeping", "protocol": protocol},
+            "players": {"max": 0, "online": 0, "sample": []},
+            "description": {"text": f"{self.motd}\n§7💤 Sleeping - join to wake it up"},
+        })
+
+    def _handle(self, conn: socket.socket):
+        with conn:
+            conn.settimeout(CONNECTION_TIMEOUT)
+            try:
+                packet_id, payload = read_packet(conn)
+                if packet_id != 0x00:
+                    return
+                handshake = parse_handshake(payload)
+                if handshake["next_state"] == 1:
+                    self._handle_status(conn, handshake["protocol"])
+                elif handshake["next_state"] in (2, 3):
+                    self._handle_login(conn)
+            except (ProtocolError, OSError, ValueError):
+                # Legacy pings, port scanners, timeouts
+                return
+
+    def _handle_status(self, conn: socket.socket, protocol: int):
+        packet_id, _ = read_packet(conn)
+        if packet_id != 0x00:
+            return
+        conn.sendall(encode_packet(0x00, encode_string(self._status_json(protocol))))
+        packet_id, payload = read_packet(conn)
+        if packet_id == 0x01:
+            conn.sendall(encode_packet(0x01, payload[:8]))
+
+    def _handle_login(self, conn: socket.socket):
+        message = json.dumps({"text": "Server is starting, please reconnect in a moment."})
+        conn.sendall(encode_packet(0x00, encode_string(message)))
+        # Let the client close first so the port has no TIME_WAIT left on our side
+        try:
+            while conn.recv(1024):
+                pass
+        except OSError:
+            pass
+        if not self.woken.is_set():
+            self.woken.set()
+            logger.info(f"Hibernation: login attempt on {self.servername}, waking up")
+            Thread(target=self.on_wake, name=f"wake-start-{self.servername}", daemon=True).start()
+
+
+class HibernationManager:
+    def __init__(self,
+                 check_interval: float = float(os.environ.get("MC_IDLE_CHECK_INTERVAL", "30")),
+                 default_idle_timeout: float = float(os.environ.get("MC_IDLE_TIMEOUT", "0"))):
+        self.check_interval = check_interval
+        # Minutes without players before a server is stopped (0 = never)
+        self.default_idle_timeout = default_idle_timeout
+        self.lock = Lock()
+        self.idle_since: Dict[str, float] = {}
+        self.listeners: Dict[str, WakeListener] = {}
+        self.hooks: Dict[str, Callable] = {}
+        self._thread: Optional[Thread] = None
+
+    def configure(self, *, servers: Callable[[], List[str]], is_running: Callable[[str], bool],
+                  server_dir: Callable[[str], str], get_port: Callable[[str], int],
+                  get_motd: Callable[[str], str], idle_timeout: Callable[[str], Optional[float]],
+                  stop: Callable[[str], None], start: Callable[[str], object]):
+        self.hooks = dict(servers=servers, is_running=is_running, server_dir=server_dir, get_port=get_port,
+                          get_motd=get_motd, idle_timeout=idle_timeout, stop=stop, start=start)
+
+    def start(self):
+        if self._thread is not None or not self.hooks:
+            return
+        self.restore()
+        self._thread = Thread(target=self._loop, name="hibernation", daemon=True)
+        self._thread.start()
+
+    def _marker(self, servername: str) -> str:
+        return os.path.join(self.hooks["server_dir"](servername), MARKER_FILE)
+
+    def is_sleeping(self, servername: str) -> bool:
+        return servername in self.listeners
+
+    def _timeout_seconds(self, servername: str) -> float:
+        minutes = self.hooks["idle_timeout"](servername)
+        if minutes is None:
+            minutes = self.default_idle_timeout
+        return max(0.0, minutes) * 60
+
+    def _loop(self):
+        while True:
+            try:
+                self.check_idle()
+            except Exception as e:
+                logger.error(f"Hibernation check failed: {e}")
+            time.sleep(self.check_interval)
+
+    def check_idle(self, now: Optional[float] = None):
+        now = now or time.time()
+        for name in self.hooks["servers"]():
+            timeout = self._timeout_seconds(name)
+            if timeout <= 0 or not self.hooks["is_running"](name):
+                self.idle_since.pop(name, None)
+                continue
+            try:
+                players = query_player_count("127.0.0.1", self.hooks["get_port"](name))
+            except Exception:
+                # Booting or not answering: don't count this as idle time
+                self.idle_since.pop(name, None)
+                continue
+            if players > 0:
+                self.idle_since.pop(name, None)
+                continue
+            since = self.idle_since.setdefault(name, now)
+            if now - since >= timeout:
+                logger.info(f"Hibernation: {name} idle for {int(now - since)}s, stopping")
+                self.hibernate(name)
+
+    def hibernate(self, servername: str):
+        self.idle_since.pop(servername, None)
+        self.hooks["stop"](servername)
+        self._sleep(servername)
+
+    def _sleep(self, servername: str):
+        with open(self._marker(servername), "w") as f:
+            f.write(str(int(time.time())))
+        self._listen(servername)
+
+    def _listen(self, servername: str):
+        listener = WakeListener(
+            servername,
+            self.hooks["get_port"](servername),
+            self.hooks["get_motd"](servername),
+            on_wake=lambda: self.wake(servername),
+        )
+        try:
+            listener.start()
+        except OSError as e:
+            logger.error(f"Hibernation: could not bind port for {servername}: {e}")
+            return
+        with self.lock:
+            self.listeners[servername] = listener
+
+    def release(self, servername: str):
+        """Free the port of a sleeping server (before it is started or deleted)"""
+        with self.lock:
+            listener = self.listeners.pop(servername, None)
+        if listener:
+            listener.close()
+        try:
+            marker = self._marker(servername)
+            if os.path.exists(marker):
+                os.remove(marker)
+        except Exception:
+            pass
+
+    def wake(self, servername: str):
+        # start() releases the listener before the JVM binds the port
+        try:
+            result = self.hooks["start"](servername)
+        except Exception as e:
+            logger.error(f"Hibernation: starting {servername} failed: {e}")
+            result = None
+        if self.hooks["is_running"](servername):
+            return
+        if isinstance(result, dict) and result.get("status") == "already starting":
+            # Another start owns the port
+            return
+        # Failed start: go back to sleep instead of leaving the port closed
+        logger.error(f"Hibernation: {servername} did not start, listening again")
+        self.release(servername)
+        try:
+            self._sleep(servername)
+        except OSError as e:
+            logger.error(f"Hibernation: could not put {servername} back to sleep: {e}")
+
+    def restore(self):
+        """Re-open the listeners of servers that were sleeping before a backend restart"""
+        for name in self.hooks["servers"]():
+            if os.path.exists(self._marker(name)) and not self.hooks["is_running"](name):
+                self._listen(name)
+
+# Global instance
+hibernation_manager = HibernationManager()
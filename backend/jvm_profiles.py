@@ -0,0 +1,124 @@
+"""
+JVM Profile für Minecraft Server
+Named JVM tuning profiles (server.config: jvm_profile=, jvm_flags=) rendered
+into the launch command
+"""
+import re
+import shlex
+import logging
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE = "default"
+
+# Aikar's flags, see https://docs.papermc.io/paper/aikars-flags
+_G1_COMMON = [
+    "-XX:+UseG1GC",
+    "-XX:+ParallelRefProcEnabled",
+    "-XX:MaxGCPauseMillis=200",
+    "-XX:+UnlockExperimentalVMOptions",
+    "-XX:+DisableExplicitGC",
+    "-XX:+AlwaysPreTouch",
+    "-XX:G1HeapWastePercent=5",
+    "-XX:G1MixedGCCountTarget=4",
+    "-XX:G1MixedGCLiveThresholdPercent=90",
+    "-XX:G1RSetUpdatingPauseTimePercent=5",
+    "-XX:SurvivorRatio=32",
+    "-XX:+PerfDisableSharedMem",
+    "-XX:MaxTenuringThreshold=1",
+    "-Dusing.aikars.flags=https://mcflags.emc.gs",
+    "-Daikars.new.flags=true",
+]
+
+PROFILES: Dict[str, Dict] = {
+    "default": {
+        "description": "JVM defaults, only -Xmx",
+        "fixed_heap": False,
+        "flags": [],
+    },
+    "g1-low-pause": {
+        "description": "G1 tuned for short pauses (Aikar's flags), heaps up to 12GB",
+        "fixed_heap": True,
+        "flags": _G1_COMMON + [
+            "-XX:G1NewSizePercent=30",
+            "-XX:G1MaxNewSizePercent=40",
+            "-XX:G1HeapRegionSize=8M",
+            "-XX:G1ReservePercent=20",
+            "-XX:InitiatingHeapOccupancyPercent=15",
+        ],
+    },
+    "g1-large-heap": {
+        "description": "G1 for heaps of 12GB and more (Aikar's large-heap flags)",
+        "fixed_heap": True,
+        "flags": _G1_COMMON + [
+            "-XX:G1NewSizePercent=40",
+            "-XX:G1MaxNewSizePercent=50",
+            "-XX:G1HeapRegionSize=16M",
+            "-XX:G1ReservePercent=15",
+            "-XX:InitiatingHeapOccupancyPercent=20",
+        ],
+    },
+    "zgc": {
+        "description": "Generational ZGC, sub-millisecond pauses for big-RAM hosts",
+        "fixed_heap": True,
+        "flags": [
+            "-XX:+UseZGC",
+            "-XX:+ZGenerational",
+            "-XX:+AlwaysPreTouch",
+            "-XX:+DisableExplicitGC",
+            "-XX:+PerfDisableSharedMem",
+        ],
+    },
+}
+
+# Custom flags: -X..., -XX:..., -D... with a conservative character set
+_FLAG_PATTERN = re.compile(r"^-(?:XX:[+-]?[A-Za-z0-9_]+(?:=[A-Za-z0-9_.:/,%+-]*)?|X[a-z][A-Za-z0-9_:]*|D[A-Za-z0-9_.-]+(?:=[A-Za-z0-9_.:/,%+-]*)?)$")
+# Heap size is owned by ram=, the rest could run arbitrary commands or code
+_FORBIDDEN_FLAGS = ("-Xmx", "-Xms", "-XX:OnError", "-XX:OnOutOfMemoryError", "-Xbootclasspath", "-XX:Flags")
+
+
+class JvmProfileError(ValueError):
+    pass
+
+
+def list_profiles() -> List[Dict]:
+    return [
+        {"name": name, "description": profile["description"], "flags": profile["flags"]}
+        for name, profile in PROFILES.items()
+    ]
+
+
+def parse_custom_flags(flags: str) -> List[str]:
+    """Split and validate the jvm_flags= value"""
+    try:
+        parsed = shlex.split(flags or "")
+    except ValueError as e:
+        raise JvmProfileError(f"Invalid JVM flags: {e}")
+    for flag in parsed:
+        if flag.startswith(_FORBIDDEN_FLAGS):
+            raise JvmProfileError(f"JVM flag not allowed: {flag}")
+        if not _FLAG_PATTERN.match(flag):
+            raise JvmProfileError(f"Invalid JVM flag: {flag}")
+    return parsed
+
+
+def validate_profile(profile: str) -> str:
+    profile = profile or DEFAULT_PROFILE
+    if profile not in PROFILES:
+        raise JvmProfileError(f"Unknown JVM profile: {profile}. Available: {', '.join(PROFILES)}")
+    return profile
+
+
+def build_java_command(ram_mb: str, profile: str = DEFAULT_PROFILE, custom_flags: str = "",
+                       jar: str = "purpur.jar") -> List[str]:
+    """Render the launch command for a server"""
+    profile = validate_profile(profile)
+    settings = PROFILES[profile]
+    command = ["java", f"-Xmx{ram_mb}M"]
+    if settings["fixed_heap"]:
+        command.append(f"-Xms{ram_mb}M")
+    command.extend(settings["flags"])
+    command.extend(parse_custom_flags(custom_flags))
+    command.extend(["-jar", jar, "nogui"])
+    return command
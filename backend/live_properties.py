@@ -0,0 +1,92 @@
+"""
+Live Properties für Minecraft Server
+server.properties keys that a running server can take over through a
+console command (sent over RCON) instead of a restart. Everything else is
+only read at startup.
+"""
+import re
+import logging
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DIFFICULTIES = {"0": "peaceful", "1": "easy", "2": "normal", "3": "hard"}
+GAMEMODES = {"0": "survival", "1": "creative", "2": "adventure", "3": "spectator"}
+
+FORMAT_RE = re.compile(r"§[0-9a-fk-orx]", re.IGNORECASE)
+# Vanilla/Brigadier error answers ("Unknown or incomplete command", "Incorrect argument for command",
+# "Expected integer", "Invalid integer", "Integer must not be less than 0"), plus permission errors
+ERROR_RE = re.compile(r"^(Unknown|Incorrect|Expected|Invalid|Could not|Cannot|Can't|Error|"
+                      r"You do not have permission|I'm sorry)|must not be (less|more) than", re.IGNORECASE)
+
+
+def _difficulty(value: str) -> Optional[str]:
+    value = DIFFICULTIES.get(value, value.lower())
+    return f"difficulty {value}" if value in DIFFICULTIES.values() else None
+
+
+def _gamemode(value: str) -> Optional[str]:
+    value = GAMEMODES.get(value, value.lower())
+    return f"defaultgamemode {value}" if value in GAMEMODES.values() else None
+
+
+def _whitelist(value: str) -> Optional[str]:
+    value = value.lower()
+    return {"true": "whitelist on", "false": "whitelist off"}.get(value)
+
+
+def _idle_timeout(value: str) -> Optional[str]:
+    return f"setidletimeout {int(value)}" if value.isdigit() else None
+
+
+# key -> command builder (None = value can't be applied live)
+LIVE_COMMANDS: Dict[str, Callable[[str], Optional[str]]] = {
+    "difficulty": _difficulty,
+    "gamemode": _gamemode,
+    "white-list": _whitelist,
+    "player-idle-timeout": _idle_timeout,
+}
+
+
+def is_error_response(response: str) -> bool:
+    """Paper and Spigot color errors red (§c), Vanilla answers them in plain text"""
+    if response.lstrip().lower().startswith("§c"):
+        return True
+    return bool(ERROR_RE.search(FORMAT_RE.sub("", response).strip()))
+
+
+def live_command(key: str, value: str) -> Optional[str]:
+    builder = LIVE_COMMANDS.get(key)
+    return builder(value.strip()) if builder else None
+
+
+def apply_live(changes: Dict[str, str], execute: Callable[[List[str]], List[str]]) -> Dict[str, List]:
+    """
+    Apply changed keys of a running server. `execute` runs a batch of
+    console commands over one RCON connection. Returns applied_live, restart_required
+    and live_errors (keys whose command failed, they need a restart too).
+    """
+    commands = {key: live_command(key, value) for key, value in changes.items()}
+    live = {key: command for key, command in commands.items() if command}
+    result = {
+        "applied_live": [],
+        "restart_required": [key for key, command in commands.items() if not command],
+        "live_errors": [],
+    }
+    if not live:
+        return result
+    try:
+        responses = execute(list(live.values()))
+    except Exception as e:
+        logger.warning(f"Live apply of {', '.join(live)} failed: {e}")
+        result["restart_required"].extend(live)
+        result["live_errors"] = [{"key": key, "error": str(e)} for key in live]
+        return result
+    for index, key in enumerate(live):
+        response = responses[index] if index < len(responses) else None
+        if response is None or is_error_response(response):
+            result["restart_required"].append(key)
+            result["live_errors"].append({"key": key, "error": response or "No response"})
+        else:
+            result["applied_live"].append(key)
+    return result
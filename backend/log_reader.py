@@ -0,0 +1,268 @@
+"""
+Log Reader für Minecraft Server Logs
+Reverse tail that seeks from EOF block by block and incremental byte cursors,
+so polling endpoints only read what was appended since the last request
+instead of the whole latest.log / server.log. Opaque page cursors
+(file identity + byte offset) let clients page forwards and backwards.
+"""
+import os
+import re
+import base64
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+BLOCK_SIZE = 64 * 1024
+# How far back a fresh cursor looks for the server version
+SEED_LINES = 500
+MAX_PAGE_LINES = 2000
+
+JOIN_RE = re.compile(r"INFO\]: (?:\\u001b\[[^m]+m)?([A-Za-z0-9_]+) joined the game")
+LEAVE_RE = re.compile(r"INFO\]: (?:\\u001b\[[^m]+m)?([A-Za-z0-9_]+) left the game")
+VERSION_RE = re.compile(r"Starting minecraft server version ([^\s]+)")
+
+
+def tail_offset(f, lines: int, block_size: int = BLOCK_SIZE, end: Optional[int] = None) -> int:
+    """Byte offset where the last `lines` lines before `end` (default EOF) of an open binary file start"""
+    if end is None:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+    if lines <= 0 or end == 0:
+        return end
+    # A trailing newline ends the last line, it doesn't start a new one
+    f.seek(end - 1)
+    target = lines + (1 if f.read(1) == b"\n" else 0)
+    pos = end
+    seen = 0
+    while pos > 0:
+        step = min(block_size, pos)
+        pos -= step
+        f.seek(pos)
+        block = f.read(step)
+        count = block.count(b"\n")
+        if seen + count >= target:
+            idx = len(block)
+            for _ in range(target - seen):
+                idx = block.rindex(b"\n", 0, idx)
+            return pos + idx + 1
+        seen += count
+    return 0
+
+
+def tail_lines(path: str, lines: int, block_size: int = BLOCK_SIZE) -> List[str]:
+    """Last `lines` lines of a file without reading it from the start"""
+    if lines <= 0:
+        return []
+    try:
+        with open(path, "rb") as f:
+            f.seek(tail_offset(f, lines, block_size))
+            data = f.read()
+    except FileNotFoundError:
+        return []
+    return data.decode("utf-8", errors="replace").splitlines(keepends=True)
+
+
+def forward_offset(f, start: int, lines: int, size: int, block_size: int = BLOCK_SIZE) -> int:
+    """Byte offset after the next `lines` complete lines from `start` (a trailing partial line is left out)"""
+    pos = start
+    found = 0
+    end = start
+    while found < lines and pos < size:
+        f.seek(pos)
+        block = f.read(min(block_size, size - pos))
+        if not block:
+            break
+        idx = -1
+        while found < lines:
+            idx = block.find(b"\n", idx + 1)
+            if idx < 0:
+                break
+            found += 1
+            end = pos + idx + 1
+        pos += len(block)
+    return end
+
+
+def encode_cursor(ident: Tuple[int, int], offset: int) -> str:
+    raw = f"{ident[0]}:{ident[1]}:{offset}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Tuple[int, int], int]:
+    """Inverse of encode_cursor, ValueError for anything malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        dev, ino, offset = (int(part) for part in raw.split(":"))
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid log cursor: {cursor}") from e
+    if offset < 0:
+        raise ValueError(f"Invalid log cursor: {cursor}")
+    return (dev, ino), offset
+
+
+def read_page(path: str, cursor: Optional[str] = None, direction: str = "prev",
+              lines: int = 100, block_size: int = BLOCK_SIZE) -> Dict:
+    """
+    `lines` lines after (next) or before (prev) a cursor; only the bytes of
+    the page are read. Without a cursor "prev" starts at EOF, "next" at the
+    beginning. A cursor from a replaced or truncated file starts over (reset).
+    """
+    if direction not in ("next", "prev"):
+        raise ValueError(f"Invalid direction: {direction}")
+    lines = max(1, min(lines, MAX_PAGE_LINES))
+    position = decode_cursor(cursor) if cursor else None
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return {"lines": [], "prev": None, "next": None, "size": 0, "reset": position is not None,
+                "at_start": True, "at_end": True}
+    with f:
+        st = os.fstat(f.fileno())
+        ident = (st.st_dev, st.st_ino)
+        size = st.st_size
+        reset = False
+        if position is not None and (position[0] != ident or position[1] > size):
+            position = None
+            reset = True
+        if direction == "next":
+            start = position[1] if position else 0
+            end = forward_offset(f, start, lines, size, block_size)
+        else:
+            if position:
+                end = position[1]
+            else:
+                # Don't hand out a half-written last line
+                end = forward_offset(f, tail_offset(f, 1, block_size, size), 1, size, block_size)
+            start = tail_offset(f, lines, block_size, end)
+        f.seek(start)
+        data = f.read(end - start)
+    return {
+        "lines": data.decode("utf-8", errors="replace").splitlines(keepends=True),
+        "prev": encode_cursor(ident, start),
+        "next": encode_cursor(ident, end),
+        "size": size,
+        "reset": reset,
+        "at_start": start == 0,
+        "at_end": end == size,
+    }
+
+
+class LogCursor:
+    """
+    Remembers how far a log file was read (device, inode, byte offset).
+    A new inode (rotation, new latest.log) or a shrunk file starts over.
+    """
+
+    def __init__(self, path: str, start_lines: Optional[int] = None):
+        self.path = path
+        # None: read a (new) file from the beginning, N: only its last N lines
+        self.start_lines = start_lines
+        self.ident: Optional[Tuple[int, int]] = None
+        self.offset = 0
+        self._partial = b""
+
+    def _restart(self, ident: Tuple[int, int]):
+        self.ident = ident
+        self._partial = b""
+        self.offset = 0
+        if self.start_lines is not None:
+            with open(self.path, "rb") as f:
+                self.offset = tail_offset(f, self.start_lines)
+
+    def read_new(self) -> Tuple[List[str], bool]:
+        """Complete lines appended since the last call and whether the file was replaced"""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            reset = self.ident is not None
+            self.ident, self.offset, self._partial = None, 0, b""
+            return [], reset
+        ident = (st.st_dev, st.st_ino)
+        reset = False
+        if ident != self.ident or st.st_size < self.offset:
+            reset = self.ident is not None
+            self._restart(ident)
+        if st.st_size <= self.offset:
+            return [], reset
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(st.st_size - self.offset)
+        self.offset += len(data)
+        data = self._partial + data
+        # Keep a half-written last line for the next call
+        complete, newline, self._partial = data.rpartition(b"\n")
+        if not newline:
+            return [], reset
+        text = (complete + newline).decode("utf-8", errors="replace")
+        return text.splitlines(keepends=True), reset
+
+
+class LogState:
+    """Server version parsed incrementally from one log file"""
+
+    def __init__(self, path: str, seed_lines: int = SEED_LINES):
+        self.cursor = LogCursor(path, start_lines=seed_lines)
+        self.version_line: Optional[str] = None
+        self.lock = Lock()
+
+    def update(self):
+        with self.lock:
+            lines, reset = self.cursor.read_new()
+            if reset:
+                self.version_line = None
+            for line in lines:
+                self._parse(line)
+
+    def _parse(self, line: str):
+        if "Starting minecraft server version" in line:
+            self.version_line = line
+
+
+class LogReader:
+    def __init__(self, max_files: int = 256):
+        self.max_files = max_files
+        self.lock = Lock()
+        self.states: "OrderedDict[str, LogState]" = OrderedDict()
+
+    def _state(self, path: str) -> LogState:
+        with self.lock:
+            state = self.states.get(path)
+            if state is None:
+                state = self.states[path] = LogState(path)
+                while len(self.states) > self.max_files:
+                    self.states.popitem(last=False)
+            else:
+                self.states.move_to_end(path)
+        try:
+            state.update()
+        except OSError as e:
+            logger.warning(f"Could not read log {path}: {e}")
+        return state
+
+    def tail(self, path: str, lines: int) -> str:
+        return "".join(tail_lines(path, lines))
+
+    def server_version(self, path: str, with_variant: bool = False) -> Optional[str]:
+        line = self._state(path).version_line
+        if not line:
+            return None
+        m = VERSION_RE.search(line)
+        if not m:
+            return None
+        version = m.group(1)
+        # Purpur-Variante
+        if with_variant and "Purpur" in line:
+            version += " Purpur"
+        return version
+
+    def forget(self, path_prefix: str):
+        """Drop cached cursors below a directory (server deleted)"""
+        with self.lock:
+            for path in [p for p in self.states if p.startswith(path_prefix)]:
+                del self.states[path]
+
+# Global instance
+log_reader = LogReader()
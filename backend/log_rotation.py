@@ -0,0 +1,209 @@
+"""
+Log Rotation für die Supervisor-Konsole (server.log)
+server.log is rotated by size and age into <server>/server_logs/, rotated
+segments are gzipped in the background and old ones are removed according
+to the server's retention. segments.json lists all segments in order so
+readers (log search) never have to guess file names.
+"""
+import os
+import gzip
+import json
+import shutil
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_DIR = "server_logs"
+INDEX_FILE = "segments.json"
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+DEFAULT_MAX_AGE = 24 * 3600
+DEFAULT_RETENTION_DAYS = 14
+DEFAULT_MAX_SEGMENTS = 50
+
+# One background thread is enough: segments are rotated rarely
+_compressor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-compress")
+
+
+def segment_dir(log_path: str) -> str:
+    return os.path.join(os.path.dirname(log_path), SEGMENT_DIR)
+
+
+class SegmentIndex:
+    """
+    segments.json of one server: [{"file", "start", "end", "size", "compressed"}],
+    oldest first. Every change is written atomically (tmp + rename).
+    """
+
+    _locks: Dict[str, Lock] = {}
+    _locks_guard = Lock()
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.path = os.path.join(directory, INDEX_FILE)
+        # All writers of one directory share a lock (restart = new LogWriter)
+        with SegmentIndex._locks_guard:
+            self.lock = SegmentIndex._locks.setdefault(directory, Lock())
+
+    def load(self) -> List[dict]:
+        try:
+            with open(self.path, "r") as f:
+                segments = json.load(f)
+        except (OSError, ValueError):
+            return []
+        return [s for s in segments if isinstance(s, dict) and "file" in s]
+
+    def _save(self, segments: List[dict]):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(segments, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def segments(self) -> List[dict]:
+        """Segments whose file still exists, with absolute paths"""
+        result = []
+        for segment in self.load():
+            path = os.path.join(self.directory, segment["file"])
+            if os.path.exists(path):
+                result.append(dict(segment, path=path))
+        return result
+
+    def add(self, segment: dict):
+        with self.lock:
+            segments = self.load()
+            segments.append(segment)
+            self._save(segments)
+
+    def replace_file(self, old: str, new: str, size: int):
+        with self.lock:
+            segments = self.load()
+            for segment in segments:
+                if segment["file"] == old:
+                    segment.update(file=new, size=size, compressed=True)
+            self._save(segments)
+
+    def prune(self, retention_days: Optional[float], max_segments: Optional[int], now: float) -> List[str]:
+        """Delete segments beyond the retention, returns the removed file names"""
+        with self.lock:
+            segments = [s for s in self.load() if os.path.exists(os.path.join(self.directory, s["file"]))]
+            keep = segments
+            if retention_days is not None and retention_days > 0:
+                keep = [s for s in keep if s.get("end", now) >= now - retention_days * 86400]
+            if max_segments is not None and max_segments > 0:
+                keep = keep[-max_segments:]
+            removed = [s["file"] for s in segments if s not in keep]
+            for name in removed:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError as e:
+                    logger.warning(f"Could not remove log segment {name}: {e}")
+            self._save(keep)
+        return removed
+
+
+def compress_segment(index: SegmentIndex, name: str):
+    """gzip one rotated segment, keep its end time as mtime for the readers"""
+    src = os.path.join(index.directory, name)
+    dst = src + ".gz"
+    try:
+        st = os.stat(src)
+        tmp = dst + ".tmp"
+        with open(src, "rb") as f_in, gzip.open(tmp, "wb", compresslevel=6) as f_out:
+            shutil.copyfileobj(f_in, f_out, 1024 * 1024)
+        os.utime(tmp, (st.st_atime, st.st_mtime))
+        os.replace(tmp, dst)
+        index.replace_file(name, name + ".gz", os.path.getsize(dst))
+        os.remove(src)
+    except FileNotFoundError:
+        # Pruned before it was compressed
+        pass
+    except OSError as e:
+        logger.error(f"Could not compress log segment {src}: {e}")
+
+
+class LogWriter:
+    """
+    Append-only server.log that rotates by size and age into numbered-by-time
+    segments under server_logs/; rotated segments are compressed and pruned
+    in the background.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES, max_age: float = DEFAULT_MAX_AGE,
+                 retention_days: Optional[float] = DEFAULT_RETENTION_DAYS,
+                 max_segments: Optional[int] = DEFAULT_MAX_SEGMENTS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.retention_days = retention_days
+        self.max_segments = max_segments
+        self.index = SegmentIndex(segment_dir(path))
+        self.lock = Lock()
+        self._file = None
+        self._size = 0
+        self._opened_at = 0.0
+
+    def _open(self):
+        self._file = open(self.path, "a", encoding="utf-8", errors="replace")
+        self._size = self._file.tell()
+        self._opened_at = time.time()
+        if self._size:
+            # Continuing a file from an earlier run: it started before its last write
+            self._opened_at = min(self._opened_at, os.path.getmtime(self.path))
+
+    def rollover(self):
+        with self.lock:
+            self._rollover()
+
+    def _rollover(self):
+        started = self._opened_at
+        if self._file:
+            self._file.close()
+            self._file = None
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            now = time.time()
+            if not started:
+                started = os.path.getmtime(self.path)
+            name = "server-" + time.strftime("%Y-%m-%d-%H%M%S", time.localtime(started)) + ".log"
+            # Two rotations within one second
+            base, suffix = name, 1
+            while os.path.exists(os.path.join(self.index.directory, name)) or \
+                    os.path.exists(os.path.join(self.index.directory, name + ".gz")):
+                suffix += 1
+                name = base.replace(".log", f"-{suffix}.log")
+            os.makedirs(self.index.directory, exist_ok=True)
+            size = os.path.getsize(self.path)
+            os.replace(self.path, os.path.join(self.index.directory, name))
+            self.index.add({"file": name, "start": started, "end": now, "size": size, "compressed": False})
+            _compressor.submit(self._compress_and_prune, name)
+        self._open()
+
+    def _compress_and_prune(self, name: str):
+        compress_segment(self.index, name)
+        for segment in self.index.load():
+            # Leftovers of a panel restart during compression
+            if not segment.get("compressed") and segment["file"] != name:
+                compress_segment(self.index, segment["file"])
+        removed = self.index.prune(self.retention_days, self.max_segments, time.time())
+        if removed:
+            logger.info(f"Removed {len(removed)} old log segment(s) from {self.index.directory}")
+
+    def write(self, line: str):
+        with self.lock:
+            if self._file is None:
+                self._open()
+            if self._size >= self.max_bytes or (self._size and time.time() - self._opened_at >= self.max_age):
+                self._rollover()
+            self._file.write(line)
+            self._file.flush()
+            # max_bytes is a file size, console output is often not ASCII
+            self._size += len(line.encode("utf-8", errors="replace"))
+
+    def close(self):
+        with self.lock:
+            if self._file:
+                self._file.close()
+                self._file = None
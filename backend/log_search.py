@@ -0,0 +1,375 @@
+"""
+Log Search für Minecraft Server Logs
+Full-text search over latest.log, the rotated logs/*.log.gz and the
+supervisor's server.log with its segments. Files are scanned in parallel in
+a worker pool, rotated logs (immutable) get a persistent inverted index the
+first time they are read, so later searches skip files and blocks that
+cannot match.
+Results are merged across files and yielded in time order.
+"""
+import os
+import re
+import glob
+import gzip
+import json
+import heapq
+import time
+import logging
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from threading import Lock
+
+from log_rotation import SegmentIndex, segment_dir
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+INDEX_DIR = ".log_index"
+# Lines per index block: the index stores in which blocks a token occurs
+BLOCK_LINES = 512
+MAX_RESULTS = 10000
+# Log lines are written by several threads, small backwards jumps are not a new day
+DAY_ROLLOVER_SLACK = 300
+
+TOKEN_RE = re.compile(r"[a-z0-9_]{2,}")
+TIME_RE = re.compile(r"^(?:\x1b\[[0-9;]*m)*\[(\d{2}):(\d{2}):(\d{2})")
+ROTATED_RE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})-(\d+)\.log\.gz$")
+
+
+def line_seconds(line: str) -> Optional[int]:
+    """Seconds since midnight of a "[HH:MM:SS..." line, None for continuation lines"""
+    if len(line) > 9 and line[0] == "[" and line[3] == ":" and line[6] == ":":
+        try:
+            return int(line[1:3]) * 3600 + int(line[4:6]) * 60 + int(line[7:9])
+        except ValueError:
+            return None
+    if line.startswith("\x1b"):
+        m = TIME_RE.match(line)
+        if m:
+            return int(m.group(1)) * 3600 + int(m.group(2)) * 60 + int(m.group(3))
+    return None
+
+
+def local_timestamp(day: date, day_offset: int, seconds: int) -> float:
+    # mktime normalizes overflowing days and handles DST
+    return time.mktime((day.year, day.month, day.day + day_offset, 0, 0, seconds, 0, 0, -1))
+
+
+class LogSource:
+    """
+    One log file. Lines only carry a time of day, the date comes from the
+    rotated file name (first line) or from the mtime (last line).
+    """
+
+    def __init__(self, path: str, family: str, order: Tuple, start_date: Optional[date] = None):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.family = family
+        self.order = order
+        self.start_date = start_date
+        st = os.stat(path)
+        self.size = st.st_size
+        self.mtime = st.st_mtime
+
+    @property
+    def immutable(self) -> bool:
+        return self.path.endswith(".gz")
+
+    def open(self):
+        if self.immutable:
+            return gzip.open(self.path, "rt", encoding="utf-8", errors="replace")
+        return open(self.path, "r", encoding="utf-8", errors="replace")
+
+
+def log_sources(server_dir: str) -> List[LogSource]:
+    """
+    All searchable logs of a server. Files of one family never overlap in
+    time and are listed oldest first.
+    """
+    sources: List[LogSource] = []
+
+    def add(path: str, family: str, order: Tuple, start_date: Optional[date] = None):
+        try:
+            sources.append(LogSource(path, family, order, start_date))
+        except FileNotFoundError:
+            # Segment compressed or pruned in the meantime
+            pass
+
+    rotated = []
+    for path in glob.glob(os.path.join(server_dir, "logs", "*.log.gz")):
+        m = ROTATED_RE.match(os.path.basename(path))
+        if m:
+            day = date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+            rotated.append((day, int(m.group(4)), path))
+    for day, number, path in sorted(rotated):
+        add(path, "minecraft", (day.toordinal(), number), start_date=day)
+    latest = os.path.join(server_dir, "logs", "latest.log")
+    if os.path.exists(latest):
+        add(latest, "minecraft", (date.max.toordinal(), 0))
+    # Supervisor console: server.log.N of older panels (N=1 newest), the
+    # rotated segments in the order of their index, then server.log
+    console = os.path.join(server_dir, "server.log")
+    backups = []
+    for path in glob.glob(console + ".*"):
+        suffix = path[len(console) + 1:]
+        if suffix.isdigit():
+            backups.append((-int(suffix), path))
+    for negative, path in sorted(backups):
+        add(path, "console", (0, negative))
+    for position, segment in enumerate(SegmentIndex(segment_dir(console)).segments()):
+        add(segment["path"], "console", (1, position))
+    if os.path.exists(console):
+        add(console, "console", (2, 0))
+    return sources
+
+
+class LogIndex:
+    """
+    Inverted index of one immutable log: token -> blocks of BLOCK_LINES
+    lines it occurs in, plus the time range of the file. Stored as JSON next
+    to the server under .log_index/<file>.json.
+    """
+
+    def __init__(self, tokens: Dict[str, List[int]], first: Optional[float], last: Optional[float],
+                 size: int, mtime: float):
+        self.tokens = tokens
+        self.first = first
+        self.last = last
+        self.size = size
+        self.mtime = mtime
+
+    def candidate_blocks(self, needle: str) -> Optional[Set[int]]:
+        """Blocks that may contain `needle`, None when the index can't narrow it down"""
+        words = TOKEN_RE.findall(needle)
+        if not words:
+            return None
+        result: Optional[Set[int]] = None
+        for word in words:
+            # A substring of a line lies inside the token that contains it
+            blocks: Set[int] = set()
+            for token, token_blocks in self.tokens.items():
+                if word in token:
+                    blocks.update(token_blocks)
+            result = blocks if result is None else result & blocks
+            if not result:
+                return result
+        return result
+
+    def to_json(self) -> dict:
+        return {"version": INDEX_VERSION, "size": self.size, "mtime": self.mtime,
+                "block_lines": BLOCK_LINES, "first": self.first, "last": self.last, "tokens": self.tokens}
+
+    @classmethod
+    def from_json(cls, data: dict) -> Optional["LogIndex"]:
+        if data.get("version") != INDEX_VERSION or data.get("block_lines") != BLOCK_LINES:
+            return None
+        return cls(data["tokens"], data["first"], data["last"], data["size"], data["mtime"])
+
+
+class LogSearcher:
+    def __init__(self, workers: int = int(os.environ.get("MC_LOG_SEARCH_WORKERS", "4")),
+                 cache_size: int = 64):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="log-search")
+        self.lock = Lock()
+        self.cache_size = cache_size
+        self.indexes: "OrderedDict[str, LogIndex]" = OrderedDict()
+
+    # --- index persistence ---
+
+    def _index_path(self, source: LogSource) -> str:
+        server_dir = os.path.dirname(os.path.dirname(source.path))
+        return os.path.join(server_dir, INDEX_DIR, source.name + ".json")
+
+    def load_index(self, source: LogSource) -> Optional[LogIndex]:
+        index_path = self._index_path(source)
+        with self.lock:
+            index = self.indexes.get(index_path)
+            if index is not None:
+                self.indexes.move_to_end(index_path)
+        if index is None:
+            try:
+                with open(index_path, "r") as f:
+                    index = LogIndex.from_json(json.load(f))
+            except (OSError, ValueError, KeyError):
+                return None
+            if index is None:
+                return None
+            self._remember(index_path, index)
+        if index.size != source.size or index.mtime != source.mtime:
+            return None
+        return index
+
+    def _remember(self, index_path: str, index: LogIndex):
+        with self.lock:
+            self.indexes[index_path] = index
+            while len(self.indexes) > self.cache_size:
+                self.indexes.popitem(last=False)
+
+    def save_index(self, source: LogSource, index: LogIndex):
+        index_path = self._index_path(source)
+        try:
+            os.makedirs(os.path.dirname(index_path), exist_ok=True)
+            tmp_path = index_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(index.to_json(), f, separators=(",", ":"))
+            os.replace(tmp_path, index_path)
+        except OSError as e:
+            logger.warning(f"Could not save log index {index_path}: {e}")
+            return
+        self._remember(index_path, index)
+
+    def prune_indexes(self, server_dir: str, sources: List[LogSource]):
+        """Remove indexes of rotated logs that were deleted"""
+        index_dir = os.path.join(server_dir, INDEX_DIR)
+        if not os.path.isdir(index_dir):
+            return
+        keep = {source.name + ".json" for source in sources if source.immutable}
+        for entry in os.listdir(index_dir):
+            if entry.endswith(".json") and entry not in keep:
+                try:
+                    os.remove(os.path.join(index_dir, entry))
+                except OSError:
+                    pass
+
+    # --- scanning ---
+
+    @staticmethod
+    def _day_count(source: LogSource) -> Tuple[int, int]:
+        """(day rollovers, lines) of a log; needed before scanning to date lines from the end"""
+        day = lines = 0
+        previous = None
+        with source.open() as f:
+            for lines, line in enumerate(f, 1):
+                sec = line_seconds(line)
+                if sec is not None:
+                    if previous is not None and sec + DAY_ROLLOVER_SLACK < previous:
+                        day += 1
+                    previous = sec
+        return day, lines
+
+    def scan(self, source: LogSource, needle: str, start: Optional[float], end: Optional[float],
+             limit: int) -> List[Tuple[float, int, str]]:
+        """Matches of one file as (timestamp, line number, text), oldest first"""
+        index = self.load_index(source) if source.immutable else None
+        candidates: Optional[Set[int]] = None
+        if index is not None:
+            if (start is not None and index.last is not None and index.last < start) or \
+                    (end is not None and index.first is not None and index.first > end):
+                return []
+            candidates = index.candidate_blocks(needle)
+            if candidates is not None and not candidates:
+                return []
+        build = source.immutable and index is None
+        # Anchor of the day offsets: rotated logs by file name, the others by mtime (last line)
+        base: Optional[date] = None
+        shift = 0
+        max_lines = None
+        try:
+            if source.start_date is not None:
+                base = source.start_date
+            elif start is not None or end is not None:
+                # Date lines while scanning, so only matches inside the window are kept
+                days, max_lines = self._day_count(source)
+                base, shift = date.fromtimestamp(source.mtime), -days
+            f = source.open()
+        except FileNotFoundError:
+            return []
+        tokens: Dict[str, List[int]] = {}
+        matches: List[Tuple[float, int, str]] = []
+        # Without an anchor: (day offset, seconds, line number, text), dated after the scan
+        raw: List[Tuple[int, int, int, str]] = []
+        day = 0
+        seconds = previous = None
+        first = last = None
+        full = False
+        with f:
+            for number, line in enumerate(f, 1):
+                if max_lines is not None and number > max_lines:
+                    # Appended after the day count
+                    break
+                if full and not build and base is not None:
+                    break
+                sec = line_seconds(line)
+                if sec is not None:
+                    if previous is not None and sec + DAY_ROLLOVER_SLACK < previous:
+                        day += 1
+                    previous = seconds = sec
+                    if first is None:
+                        first = (day, sec)
+                    last = (day, sec)
+                block = (number - 1) // BLOCK_LINES
+                lowered = None
+                if build:
+                    lowered = line.lower()
+                    for token in set(TOKEN_RE.findall(lowered)):
+                        blocks = tokens.setdefault(token, [])
+                        if not blocks or blocks[-1] != block:
+                            blocks.append(block)
+                # Without an anchor the file is read to the end for the last timestamp
+                if full or (candidates is not None and block not in candidates):
+                    continue
+                if needle not in (lowered if lowered is not None else line.lower()):
+                    continue
+                text = line.rstrip("\r\n")
+                if base is None:
+                    raw.append((day, seconds if seconds is not None else 0, number, text))
+                else:
+                    ts = local_timestamp(base, day + shift, seconds if seconds is not None else 0)
+                    if start is not None and ts < start:
+                        continue
+                    if end is not None and ts > end:
+                        # Lines are in time order, nothing later can be inside the window
+                        full = True
+                        continue
+                    matches.append((ts, number, text))
+                full = len(matches) + len(raw) >= limit
+        if base is None:
+            base, shift = date.fromtimestamp(source.mtime), -(last[0] if last else 0)
+            matches = [(local_timestamp(base, day_offset + shift, sec), number, text)
+                       for day_offset, sec, number, text in raw]
+        if build:
+            self.save_index(source, LogIndex(
+                tokens,
+                local_timestamp(base, first[0] + shift, first[1]) if first else None,
+                local_timestamp(base, last[0] + shift, last[1]) if last else None,
+                source.size, source.mtime,
+            ))
+        return matches
+
+    def _family(self, jobs: List[Tuple[LogSource, Future]]) -> Iterator[Tuple[float, int, str, str]]:
+        for source, future in jobs:
+            for ts, number, text in future.result():
+                yield ts, number, source.name, text
+
+    def search(self, server_dir: str, query: str, start: Optional[float] = None,
+               end: Optional[float] = None, limit: int = 1000) -> Iterator[dict]:
+        """Yields matches ordered by time, followed by a summary record"""
+        needle = query.lower()
+        limit = max(1, min(limit, MAX_RESULTS))
+        sources = log_sources(server_dir)
+        self.prune_indexes(server_dir, sources)
+        families: Dict[str, List[Tuple[LogSource, Future]]] = {}
+        for source in sources:
+            # A file last written before the window can't contain matches
+            if start is not None and source.mtime < start:
+                continue
+            future = self.executor.submit(self.scan, source, needle, start, end, limit)
+            families.setdefault(source.family, []).append((source, future))
+        count = 0
+        try:
+            merged = heapq.merge(*(self._family(jobs) for jobs in families.values()))
+            for ts, number, name, text in merged:
+                yield {"time": ts, "file": name, "line": number, "text": text}
+                count += 1
+                if count >= limit:
+                    break
+        finally:
+            for jobs in families.values():
+                for _, future in jobs:
+                    future.cancel()
+        yield {"done": True, "matches": count, "truncated": count >= limit, "files": len(sources)}
+
+# Global instance
+log_searcher = LogSearcher()
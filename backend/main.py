@@ -1,5 +1,5 @@
 from fastapi import FastAPI, Depends, HTTPException, status, Request, Form, Body
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 import threading
 import time
 import yaml
@@ -53,8 +53,10 @@ from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from datetime import timedelta
-from auth import authenticate_user, create_access_token, get_current_user, must_change_password, set_new_user, get_security_question, reset_password
+from auth import authenticate_user, create_access_token, get_current_user, must_change_password, set_new_user, get_security_question, reset_password, metrics_authorized
 from routes import server_control
+from prometheus_metrics import registry as prometheus_registry, REQUEST_LATENCY, CONTENT_TYPE, threadpool_metrics
+import anyio.to_thread
 from fastapi.middleware.cors import CORSMiddleware
 import re
 
@@ -82,6 +84,24 @@ async def add_security_headers(request: Request, call_next):
     response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
     return response
 
+# Request-Latenz pro Route-Template (nicht pro konkreter URL, sonst explodieren die Labels)
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        REQUEST_LATENCY.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=str(status_code),
+        )
+
 # Trusted Host Middleware
 app.add_middleware(TrustedHostMiddleware, allowed_hosts=["*"])
 
@@ -149,6 +169,30 @@ def change_user(
 @app.on_event("startup")
 def fastapi_start_port_updater():
     start_port_updater()
+    server_control.hibernation_manager.start()
+    server_control.player_tracker.start()
+    server_control.overview_collector.start()
+    server_control.metrics_sampler.start()
+
+@app.on_event("shutdown")
+def fastapi_shutdown_servers():
+    # Alle Minecraft-Server parallel sauber herunterfahren
+    server_control.shutdown_all_servers()
+    server_control.metrics_store.save()
+
+# Prometheus Scrape-Endpunkt, geschützt mit METRICS_TOKEN oder JWT (Port 8000 ist veröffentlicht)
+@app.get("/metrics")
+async def prometheus_metrics(request: Request):
+    if not metrics_authorized(request.headers.get("Authorization", "")):
+        raise HTTPException(status_code=401, detail="Invalid metrics token",
+                            headers={"WWW-Authenticate": "Bearer"})
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    stats = limiter.statistics()
+    extra = threadpool_metrics(stats.borrowed_tokens, stats.total_tokens, stats.tasks_waiting)
+    # Collectors lesen nur gecachte Snapshots, trotzdem nicht im Event-Loop blockieren
+    body = await anyio.to_thread.run_sync(prometheus_registry.render)
+    body += "\n".join(line for metric in extra for line in metric.render()) + "\n"
+    return Response(content=body, media_type=CONTENT_TYPE)
 
 # API endpoint for available ports
 @app.get("/api/available-ports")
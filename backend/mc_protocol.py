@@ -0,0 +1,125 @@
+"""
+Minecraft Protocol Helpers
+Just enough of the Java Edition protocol for Server List Ping (status) and
+for answering handshakes while a server is hibernating
+"""
+import json
+import socket
+import struct
+from typing import Tuple
+
+# Any recent protocol version works for status requests
+STATUS_PROTOCOL_VERSION = 770
+MAX_PACKET_LENGTH = 2 ** 21
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def encode_varint(value: int) -> bytes:
+    value &= 0xFFFFFFFF
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def decode_varint(data: bytes, offset: int = 0) -> Tuple[int, int]:
+    """Decode a VarInt from data[offset:], return (value, new offset)"""
+    result = 0
+    for i in range(5):
+        if offset >= len(data):
+            raise ProtocolError("Truncated VarInt")
+        byte = data[offset]
+        offset += 1
+        result |= (byte & 0x7F) << (7 * i)
+        if not byte & 0x80:
+            if result & 0x80000000:
+                result -= 1 << 32
+            return result, offset
+    raise ProtocolError("VarInt too long")
+
+
+def encode_string(value: str) -> bytes:
+    raw = value.encode("utf-8")
+    return encode_varint(len(raw)) + raw
+
+
+def decode_string(data: bytes, offset: int = 0) -> Tuple[str, int]:
+    length, offset = decode_varint(data, offset)
+    end = offset + length
+    if end > len(data):
+        raise ProtocolError("Truncated string")
+    return data[offset:end].decode("utf-8", errors="replace"), end
+
+
+def encode_packet(packet_id: int, payload: bytes = b"") -> bytes:
+    body = encode_varint(packet_id) + payload
+    return encode_varint(len(body)) + body
+
+
+def _recv_exact(sock: socket.socket, length: int) -> bytes:
+    data = bytearray()
+    while len(data) < length:
+        chunk = sock.recv(length - len(data))
+        if not chunk:
+            raise ProtocolError("Connection closed")
+        data.extend(chunk)
+    return bytes(data)
+
+
+def read_varint_from_socket(sock: socket.socket) -> int:
+    result = 0
+    for i in range(5):
+        byte = _recv_exact(sock, 1)[0]
+        result |= (byte & 0x7F) << (7 * i)
+        if not byte & 0x80:
+            return result
+    raise ProtocolError("VarInt too long")
+
+
+def read_packet(sock: socket.socket) -> Tuple[int, bytes]:
+    """Read one uncompressed packet, return (packet id, payload)"""
+    length = read_varint_from_socket(sock)
+    if length <= 0 or length > MAX_PACKET_LENGTH:
+        raise ProtocolError(f"Invalid packet length {length}")
+    data = _recv_exact(sock, length)
+    packet_id, offset = decode_varint(data)
+    return packet_id, data[offset:]
+
+
+def parse_handshake(payload: bytes) -> dict:
+    protocol, offset = decode_varint(payload)
+    address, offset = decode_string(payload, offset)
+    if offset + 2 > len(payload):
+        raise ProtocolError("Truncated handshake")
+    port = struct.unpack(">H", payload[offset:offset + 2])[0]
+    next_state, _ = decode_varint(payload, offset + 2)
+    return {"protocol": protocol, "address": address, "port": port, "next_state": next_state}
+
+
+def encode_handshake(host: str, port: int, next_state: int, protocol: int = STATUS_PROTOCOL_VERSION) -> bytes:
+    payload = encode_varint(protocol) + encode_string(host) + struct.pack(">H", port) + encode_varint(next_state)
+    return encode_packet(0x00, payload)
+
+
+def query_status(host: str, port: int, timeout: float = 2.0) -> dict:
+    """Server List Ping: returns the status JSON (version, players, description)"""
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        sock.settimeout(timeout)
+        sock.sendall(encode_handshake(host, port, 1) + encode_packet(0x00))
+        packet_id, payload = read_packet(sock)
+        if packet_id != 0x00:
+            raise ProtocolError(f"Unexpected status packet 0x{packet_id:02x}")
+        response, _ = decode_string(payload)
+        return json.loads(response)
+
+
+def query_player_count(host: str, port: int, timeout: float = 2.0) -> int:
+    return int(query_status(host, port, timeout).get("players", {}).get("online", 0))
@@ -0,0 +1,148 @@
+"""
+Metrics Sampler für Minecraft Server
+Background thread that records CPU, memory, threads, players, disk usage,
+proxy sessions and tick health (TPS/MSPT) of every server into the metrics store
+"""
+import os
+import time
+import logging
+import psutil
+from typing import Callable, Dict, List, Optional, Tuple
+from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics_store import metrics_store, MetricsStore
+from process_tracker import process_tracker, ProcessTracker
+
+logger = logging.getLogger(__name__)
+
+METRICS = ["cpu_percent", "rss_mb", "threads", "players", "disk_mb", "proxy_sessions", "tps", "mspt"]
+
+
+def directory_size(path: str) -> int:
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
+
+def established_sessions() -> Dict[int, int]:
+    """ESTABLISHED TCP connections per local port (HAProxy connects to the game ports)"""
+    sessions: Dict[int, int] = {}
+    try:
+        for conn in psutil.net_connections(kind="tcp"):
+            if conn.status == psutil.CONN_ESTABLISHED and conn.laddr:
+                sessions[conn.laddr.port] = sessions.get(conn.laddr.port, 0) + 1
+    except (psutil.Error, OSError) as e:
+        logger.debug(f"Metrics: could not list connections: {e}")
+    return sessions
+
+
+class MetricsSampler:
+    def __init__(self, store: MetricsStore = metrics_store,
+                 processes: ProcessTracker = process_tracker,
+                 interval: float = float(os.environ.get("MC_METRICS_INTERVAL", "10")),
+                 disk_interval: float = 300.0,
+                 save_interval: float = 60.0,
+                 tick_workers: int = 8):
+        self.store = store
+        self.processes = processes
+        self.interval = interval
+        # Walking a world directory is expensive, its size is refreshed less often
+        self.disk_interval = disk_interval
+        self.save_interval = save_interval
+        self.disk_cache: Dict[str, Tuple[float, float]] = {}
+        # Last sample per server, read by the Prometheus exporter
+        self.latest: Dict[str, Dict[str, Optional[float]]] = {}
+        self.hooks: Dict[str, Callable] = {}
+        # Tick queries block on RCON (up to their timeout for a stalled server), they run
+        # side by side so one slow server doesn't delay the samples of all others
+        self.tick_executor = ThreadPoolExecutor(max_workers=tick_workers, thread_name_prefix="tick-sample")
+        self._thread: Optional[Thread] = None
+
+    def configure(self, *, servers: Callable[[], List[str]], get_pid: Callable[[str], Optional[int]],
+                  player_count: Callable[[str], int], server_dir: Callable[[str], str],
+                  get_port: Callable[[str], int],
+                  tick_health: Optional[Callable[[str], Dict[str, Optional[float]]]] = None):
+        self.hooks = dict(servers=servers, get_pid=get_pid, player_count=player_count,
+                          server_dir=server_dir, get_port=get_port, tick_health=tick_health)
+
+    def start(self):
+        if self._thread is not None or not self.hooks:
+            return
+        self._thread = Thread(target=self._loop, name="metrics-sampler", daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        last_save = time.time()
+        while True:
+            started = time.time()
+            try:
+                self.sample()
+            except Exception as e:
+                logger.error(f"Metrics sampling failed: {e}")
+            if started - last_save >= self.save_interval:
+                self.store.save()
+                last_save = started
+            time.sleep(max(0.0, self.interval - (time.time() - started)))
+
+    def _disk_mb(self, servername: str, now: float) -> float:
+        cached = self.disk_cache.get(servername)
+        if cached and now - cached[0] < self.disk_interval:
+            return cached[1]
+        size = round(directory_size(self.hooks["server_dir"](servername)) / 1024 / 1024, 1)
+        self.disk_cache[servername] = (now, size)
+        return size
+
+    def sample_server(self, servername: str, sessions: Dict[int, int], now: float) -> Dict[str, Optional[float]]:
+        values: Dict[str, Optional[float]] = {"disk_mb": self._disk_mb(servername, now)}
+        # The sampler is the collector that keeps the process tracker fresh
+        process = self.processes.refresh(servername, self.hooks["get_pid"](servername))
+        if process is None:
+            values.update(cpu_percent=0, rss_mb=0, threads=0, players=0, proxy_sessions=0)
+            return values
+        values.update(cpu_percent=process["cpu_percent"], rss_mb=process["rss_mb"], threads=process["threads"])
+        values["players"] = self.hooks["player_count"](servername)
+        try:
+            values["proxy_sessions"] = sessions.get(self.hooks["get_port"](servername), 0)
+        except ValueError:
+            values["proxy_sessions"] = None
+        return values
+
+    def sample(self):
+        now = time.time()
+        sessions = established_sessions()
+        names = self.hooks["servers"]()
+        ticks = {}
+        if self.hooks["tick_health"]:
+            # One RCON query per running server and interval; nothing is recorded if it fails
+            ticks = {name: self.tick_executor.submit(self.hooks["tick_health"], name)
+                     for name in names if self.hooks["get_pid"](name)}
+        latest = {}
+        for name in names:
+            latest[name] = self.sample_server(name, sessions, now)
+            if name in ticks:
+                try:
+                    tick = ticks[name].result()
+                except Exception as e:
+                    logger.debug(f"Metrics: tick sample of {name} failed: {e}")
+                    tick = {}
+                latest[name]["tps"] = tick.get("tps")
+                latest[name]["mspt"] = tick.get("mspt")
+            self.store.record(name, latest[name], now)
+        self.latest = latest
+
+# Global instance
+metrics_sampler = MetricsSampler()
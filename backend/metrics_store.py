@@ -0,0 +1,224 @@
+"""
+Metrics Store für Minecraft Server
+Fixed-size ring buffers (array-backed) per server and metric in several
+resolutions: every sample is added to all tiers, each slot keeps sum and
+count, so downsampling costs nothing at query time. Persisted as one compact
+binary file per server.
+"""
+import json
+import math
+import os
+import struct
+import time
+import logging
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+# (seconds per slot, slots): 10 s for 1 h, 1 min for 1 day, 10 min for 30 days
+TIERS: List[Tuple[int, int]] = [(10, 360), (60, 1440), (600, 4320)]
+FILE_MAGIC = b"BPM1"
+
+
+class RingSeries:
+    """One resolution of one metric"""
+
+    def __init__(self, interval: int, slots: int):
+        self.interval = interval
+        self.slots = slots
+        # Start time of the bucket each slot currently holds (0 = empty)
+        self.starts = array("q", bytes(8 * slots))
+        self.sums = array("d", bytes(8 * slots))
+        self.counts = array("I", bytes(4 * slots))
+
+    def add(self, ts: float, value: float):
+        bucket = int(ts // self.interval) * self.interval
+        i = (bucket // self.interval) % self.slots
+        if self.starts[i] != bucket:
+            self.starts[i] = bucket
+            self.sums[i] = 0.0
+            self.counts[i] = 0
+        self.sums[i] += value
+        self.counts[i] += 1
+
+    def query(self, start: float, end: float, group: int = 1) -> Tuple[List[int], List[Optional[float]]]:
+        """
+        Bucket start times and averages from start to end, None where nothing was
+        sampled. group > 1 merges that many adjacent buckets (weighted by sample count).
+        """
+        first = int(start // self.interval) * self.interval
+        # Never walk more than one lap of the ring
+        first = max(first, int(end // self.interval) * self.interval - (self.slots - 1) * self.interval)
+        timestamps, values = [], []
+        total, count = 0.0, 0
+        buckets = range(first, int(end) + 1, self.interval)
+        for n, bucket in enumerate(buckets, 1):
+            i = (bucket // self.interval) % self.slots
+            if self.starts[i] == bucket and self.counts[i]:
+                total += self.sums[i]
+                count += self.counts[i]
+            if n % group == 0 or n == len(buckets):
+                timestamps.append(bucket - (n - 1) % group * self.interval)
+                values.append(round(total / count, 2) if count else None)
+                total, count = 0.0, 0
+        return timestamps, values
+
+    def retention(self) -> int:
+        return self.interval * self.slots
+
+    def to_bytes(self) -> bytes:
+        return self.starts.tobytes() + self.sums.tobytes() + self.counts.tobytes()
+
+    def load_bytes(self, data: memoryview):
+        n = self.slots
+        for name, typecode, chunk in (("starts", "q", data[:8 * n]),
+                                      ("sums", "d", data[8 * n:16 * n]),
+                                      ("counts", "I", data[16 * n:20 * n])):
+            values = array(typecode)
+            values.frombytes(chunk)
+            setattr(self, name, values)
+
+    def byte_size(self) -> int:
+        return 20 * self.slots
+
+
+class MetricSeries:
+    def __init__(self, tiers: Iterable[Tuple[int, int]] = TIERS):
+        self.tiers = [RingSeries(interval, slots) for interval, slots in tiers]
+
+    def add(self, ts: float, value: float):
+        for tier in self.tiers:
+            tier.add(ts, value)
+
+    def pick_tier(self, start: float, end: float, max_points: int, now: float) -> RingSeries:
+        """Finest tier that still holds `start` and needs at most max_points buckets, else the coarsest"""
+        for tier in self.tiers:
+            if start >= now - tier.retention() - tier.interval and (end - start) / tier.interval <= max_points:
+                return tier
+        return self.tiers[-1]
+
+
+class MetricsStore:
+    def __init__(self, data_dir: str = "/app/mc_servers/.metrics",
+                 tiers: Iterable[Tuple[int, int]] = TIERS):
+        self.data_dir = data_dir
+        self.tiers = list(tiers)
+        self.lock = Lock()
+        self.series: Dict[str, Dict[str, MetricSeries]] = {}
+
+    def _path(self, servername: str) -> str:
+        return os.path.join(self.data_dir, f"{servername}.bin")
+
+    def _server(self, servername: str) -> Dict[str, MetricSeries]:
+        server = self.series.get(servername)
+        if server is None:
+            server = self.series[servername] = self._load(servername)
+        return server
+
+    def record(self, servername: str, values: Dict[str, Optional[float]], ts: Optional[float] = None):
+        ts = ts or time.time()
+        with self.lock:
+            server = self._server(servername)
+            for metric, value in values.items():
+                if value is None:
+                    continue
+                series = server.get(metric)
+                if series is None:
+                    series = server[metric] = MetricSeries(self.tiers)
+                series.add(ts, float(value))
+
+    def metrics(self, servername: str) -> List[str]:
+        with self.lock:
+            return sorted(self._server(servername))
+
+    def query(self, servername: str, metrics: List[str], start: float, end: float,
+              max_points: int = 500) -> dict:
+        """Chart-ready series: shared timestamps and one value list per metric"""
+        now = time.time()
+        end = min(end, now)
+        with self.lock:
+            server = self._server(servername)
+            reference = MetricSeries(self.tiers)
+            tier_index = reference.tiers.index(reference.pick_tier(start, end, max_points, now))
+            timestamps, _ = reference.tiers[tier_index].query(start, end)
+            # Even the coarsest tier may need more buckets than asked for: merge adjacent ones
+            group = max(1, math.ceil(len(timestamps) / max_points))
+            timestamps = timestamps[::group]
+            series = {}
+            for metric in metrics:
+                if metric in server:
+                    series[metric] = server[metric].tiers[tier_index].query(start, end, group)[1]
+        return {
+            "interval": self.tiers[tier_index][0] * group,
+            "start": int(start),
+            "end": int(end),
+            "timestamps": timestamps,
+            "series": series,
+        }
+
+    def forget(self, servername: str):
+        with self.lock:
+            self.series.pop(servername, None)
+        try:
+            os.remove(self._path(servername))
+        except FileNotFoundError:
+            pass
+
+    # Persistenz: Magic, Header-Länge, JSON-Header, dann die Arrays aller Tiers
+    def _load(self, servername: str) -> Dict[str, MetricSeries]:
+        path = self._path(servername)
+        server: Dict[str, MetricSeries] = {}
+        if not os.path.exists(path):
+            return server
+        try:
+            with open(path, "rb") as f:
+                data = memoryview(f.read())
+            if bytes(data[:4]) != FILE_MAGIC:
+                raise ValueError("bad magic")
+            header_len = struct.unpack(">I", data[4:8])[0]
+            header = json.loads(bytes(data[8:8 + header_len]))
+            if [tuple(t) for t in header["tiers"]] != self.tiers:
+                logger.info(f"Metrics: tier layout of {servername} changed, starting over")
+                return server
+            offset = 8 + header_len
+            for metric in header["metrics"]:
+                series = MetricSeries(self.tiers)
+                for tier in series.tiers:
+                    tier.load_bytes(data[offset:offset + tier.byte_size()])
+                    offset += tier.byte_size()
+                server[metric] = series
+        except Exception as e:
+            logger.warning(f"Metrics: could not load {path}: {e}")
+            return {}
+        return server
+
+    def save(self, servername: Optional[str] = None):
+        """Write one server (or all) to disk atomically"""
+        with self.lock:
+            names = [servername] if servername else list(self.series)
+            blobs = {}
+            for name in names:
+                server = self.series.get(name)
+                if not server:
+                    continue
+                metrics = sorted(server)
+                header = json.dumps({"tiers": self.tiers, "metrics": metrics}).encode()
+                parts = [FILE_MAGIC, struct.pack(">I", len(header)), header]
+                for metric in metrics:
+                    parts.extend(tier.to_bytes() for tier in server[metric].tiers)
+                blobs[name] = b"".join(parts)
+        os.makedirs(self.data_dir, exist_ok=True)
+        for name, blob in blobs.items():
+            path = self._path(name)
+            tmp = f"{path}.tmp"
+            try:
+                with open(tmp, "wb") as f:
+                    f.write(blob)
+                os.replace(tmp, path)
+            except OSError as e:
+                logger.error(f"Metrics: could not save {path}: {e}")
+
+# Global instance
+metrics_store = MetricsStore()
@@ -0,0 +1,163 @@
+"""
+Player Presence Tracker für Minecraft Server
+Follows latest.log of every running server in the background, keeps the set
+of online players (with join times) in memory and reconciles it with a
+Server List Ping when a server (or the backend) comes up
+"""
+import os
+import re
+import time
+import logging
+from typing import Callable, Dict, List, Optional
+from threading import Lock, RLock, Thread
+
+from log_reader import LogCursor, JOIN_RE, LEAVE_RE
+from mc_protocol import query_status
+
+logger = logging.getLogger(__name__)
+
+TIME_RE = re.compile(r"^\[(\d{2}):(\d{2}):(\d{2})")
+
+
+def _line_time(line: str, file_mtime: float) -> Optional[float]:
+    """Timestamp of a replayed log line ([HH:MM:SS ...]) on the day the log was last written"""
+    m = TIME_RE.match(line)
+    if not m:
+        return None
+    day = time.localtime(file_mtime)
+    ts = time.mktime((day.tm_year, day.tm_mon, day.tm_mday,
+                      int(m.group(1)), int(m.group(2)), int(m.group(3)), 0, 0, -1))
+    # Lines from before midnight
+    return ts - 86400 if ts > file_mtime + 60 else ts
+
+
+class ServerPresence:
+    def __init__(self, log_path: str):
+        # latest.log is one file per boot, so it is replayed from the start
+        self.cursor = LogCursor(log_path)
+        self.players: Dict[str, float] = {}
+        # Held across the whole update, the poller and requests share the cursor
+        self.lock = RLock()
+        self.reconciled = False
+
+    def snapshot(self) -> Dict[str, float]:
+        with self.lock:
+            return dict(self.players)
+
+    def update(self) -> bool:
+        """Apply newly appended lines; True if the log file was replaced"""
+        with self.lock:
+            replay = self.cursor.ident is None
+            lines, reset = self.cursor.read_new()
+            try:
+                mtime = os.path.getmtime(self.cursor.path)
+            except OSError:
+                mtime = time.time()
+            if reset:
+                self.players.clear()
+                self.reconciled = False
+            for line in lines:
+                if "joined the game" in line:
+                    m = JOIN_RE.search(line)
+                    if m and m.group(1) not in self.players:
+                        joined = _line_time(line, mtime) if (replay or reset) else None
+                        self.players[m.group(1)] = joined or time.time()
+                elif "left the game" in line:
+                    m = LEAVE_RE.search(line)
+                    if m:
+                        self.players.pop(m.group(1), None)
+        return reset
+
+    def reconcile(self, status: dict):
+        """Correct the log-derived set with the player list the server reports itself"""
+        players = status.get("players", {})
+        online = int(players.get("online", 0))
+        names = [p.get("name") for p in players.get("sample") or [] if p.get("name")]
+        with self.lock:
+            if online == 0:
+                self.players.clear()
+            elif len(names) >= online:
+                now = time.time()
+                self.players = {name: self.players.get(name, now) for name in names}
+            elif online != len(self.players):
+                # Sample is capped (12 names), keep what the log says
+                logger.warning(f"Player tracker: {self.cursor.path} lists {len(self.players)} "
+                               f"players, server reports {online}")
+            self.reconciled = True
+
+
+class PlayerTracker:
+    def __init__(self, poll_interval: float = float(os.environ.get("MC_PLAYER_POLL_INTERVAL", "1"))):
+        self.poll_interval = poll_interval
+        self.lock = Lock()
+        self.servers: Dict[str, ServerPresence] = {}
+        self.hooks: Dict[str, Callable] = {}
+        self._thread: Optional[Thread] = None
+
+    def configure(self, *, servers: Callable[[], List[str]], is_running: Callable[[str], bool],
+                  log_path: Callable[[str], str], get_port: Callable[[str], int]):
+        self.hooks = dict(servers=servers, is_running=is_running, log_path=log_path, get_port=get_port)
+
+    def start(self):
+        if self._thread is not None or not self.hooks:
+            return
+        self._thread = Thread(target=self._loop, name="player-tracker", daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while True:
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"Player tracker poll failed: {e}")
+            time.sleep(self.poll_interval)
+
+    def poll(self):
+        for name in self.hooks["servers"]():
+            if self.hooks["is_running"](name):
+                self._update(name)
+            else:
+                self.forget(name)
+
+    def _presence(self, servername: str) -> ServerPresence:
+        log_path = self.hooks["log_path"](servername)
+        with self.lock:
+            presence = self.servers.get(servername)
+            if presence is None or presence.cursor.path != log_path:
+                presence = self.servers[servername] = ServerPresence(log_path)
+            return presence
+
+    def _update(self, servername: str, reconcile: bool = True) -> ServerPresence:
+        presence = self._presence(servername)
+        try:
+            presence.update()
+        except OSError as e:
+            logger.warning(f"Player tracker: could not read log of {servername}: {e}")
+        if reconcile and not presence.reconciled:
+            try:
+                presence.reconcile(query_status("127.0.0.1", self.hooks["get_port"](servername)))
+                logger.info(f"Player tracker: {servername} reconciled, {len(presence.players)} online")
+            except Exception:
+                # Still booting, try again on the next poll
+                pass
+        return presence
+
+    def forget(self, servername: str):
+        with self.lock:
+            self.servers.pop(servername, None)
+
+    def get_players(self, servername: str) -> Dict[str, float]:
+        """Online players mapped to their join time"""
+        presence = self.servers.get(servername)
+        if presence is None:
+            # Not followed yet (poller not started or server just came up)
+            if not self.hooks or not self.hooks["is_running"](servername):
+                return {}
+            presence = self._update(servername, reconcile=False)
+        return presence.snapshot()
+
+    def get_count(self, servername: str) -> int:
+        return len(self.get_players(servername))
+
+# Global instance
+player_tracker = PlayerTracker()
@@ -0,0 +1,90 @@
+"""
+Process Control für Minecraft Server
+Graceful shutdown with exit notification (pidfd) and SIGTERM/SIGKILL escalation
+"""
+import os
+import select
+import signal
+import logging
+import psutil
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STOP_TIMEOUT = float(os.environ.get("MC_STOP_TIMEOUT", "60"))
+DEFAULT_TERM_TIMEOUT = float(os.environ.get("MC_TERM_TIMEOUT", "15"))
+KILL_TIMEOUT = 5.0
+
+
+def wait_for_exit(pid: int, timeout: Optional[float]) -> bool:
+    """
+    Block until `pid` has exited or `timeout` seconds passed.
+    Uses a pidfd so the kernel notifies us about the exit instead of polling;
+    falls back to psutil on systems without pidfd_open.
+    Returns True if the process is gone.
+    """
+    try:
+        fd = os.pidfd_open(pid)
+    except ProcessLookupError:
+        return True
+    except (AttributeError, OSError):
+        try:
+            psutil.Process(pid).wait(timeout=timeout)
+            return True
+        except psutil.NoSuchProcess:
+            return True
+        except psutil.TimeoutExpired:
+            return False
+    try:
+        readable, _, _ = select.select([fd], [], [], timeout)
+        return bool(readable)
+    finally:
+        os.close(fd)
+
+
+def _signal(pid: int, sig: int):
+    try:
+        os.kill(pid, sig)
+    except ProcessLookupError:
+        pass
+
+
+def graceful_stop(pid: int,
+                  send_stop: Callable[[], bool],
+                  stop_timeout: float = DEFAULT_STOP_TIMEOUT,
+                  term_timeout: float = DEFAULT_TERM_TIMEOUT,
+                  wait: Optional[Callable[[float], bool]] = None) -> str:
+    """
+    Stop a server process: console `stop` (saves the worlds) first, then SIGTERM
+    (the JVM shutdown hook saves as well), finally SIGKILL.
+    `wait(timeout)` defaults to wait_for_exit(pid, timeout).
+    Returns how the process ended: "stopped", "terminated", "killed" or "gone".
+    """
+    if not psutil.pid_exists(pid):
+        return "gone"
+    if wait is None:
+        wait = lambda timeout: wait_for_exit(pid, timeout)
+    try:
+        sent = send_stop()
+    except Exception as e:
+        logger.warning(f"Could not send stop command to PID {pid}: {e}")
+        sent = False
+    if sent and wait(stop_timeout):
+        return "stopped"
+    logger.warning(f"PID {pid} did not stop within {stop_timeout}s, sending SIGTERM")
+    _signal(pid, signal.SIGTERM)
+    if wait(term_timeout):
+        return "terminated"
+    logger.warning(f"PID {pid} did not terminate within {term_timeout}s, sending SIGKILL")
+    _signal(pid, signal.SIGKILL)
+    wait(KILL_TIMEOUT)
+    return "killed"
+
+
+def kill_process(pid: int) -> str:
+    if not psutil.pid_exists(pid):
+        return "gone"
+    _signal(pid, signal.SIGKILL)
+    wait_for_exit(pid, KILL_TIMEOUT)
+    return "killed"
+
@@ -0,0 +1,283 @@
+"""
+Process Supervisor für Minecraft Server
+Spawns the JVMs directly (no tmux) with piped stdin/stdout, tracks the real
+JVM PID, writes the console output through a rotating log writer
+(log_rotation) and restarts crashed servers with exponential backoff.
+"""
+import os
+import subprocess
+import time
+import logging
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+from threading import Event, Lock, Thread, Timer
+
+from process_control import graceful_stop, kill_process, DEFAULT_STOP_TIMEOUT, DEFAULT_TERM_TIMEOUT
+from log_rotation import LogWriter
+
+logger = logging.getLogger(__name__)
+
+CONSOLE_BUFFER_LINES = 500
+
+
+class ServerProcess:
+    def __init__(self, name: str, command: List[str], cwd: str, log_path: str,
+                 log_options: Optional[Dict] = None):
+        self.name = name
+        self.command = command
+        self.cwd = cwd
+        self.log = LogWriter(log_path, **(log_options or {}))
+        self.console = deque(maxlen=CONSOLE_BUFFER_LINES)
+        # Sequence number of the last console line (1-based, per process)
+        self.seq = 0
+        self.listeners: List[Callable[[str], None]] = []
+        self.popen: Optional[subprocess.Popen] = None
+        self.pid: Optional[int] = None
+        self.started_at: Optional[float] = None
+        self.returncode: Optional[int] = None
+        self.stop_requested = False
+        self.ready = Event()
+        self.exited = Event()
+        self._wake = Event()
+        self._stdin_lock = Lock()
+
+    def start(self, on_exit: Callable[["ServerProcess"], None]):
+        # server.log vom letzten Lauf behalten, aber neu beginnen
+        self.log.rollover()
+        self.popen = subprocess.Popen(
+            self.command,
+            cwd=self.cwd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace",
+            bufsize=1,
+            start_new_session=True,
+        )
+        self.pid = self.popen.pid
+        self.started_at = time.time()
+        Thread(target=self._pump, args=(on_exit,), name=f"console-{self.name}", daemon=True).start()
+
+    def _pump(self, on_exit: Callable[["ServerProcess"], None]):
+        """Forward console output until EOF, then reap the process"""
+        try:
+            for line in self.popen.stdout:
+                self.log.write(line)
+                self.console.append(line)
+                self.seq += 1
+                if not self.ready.is_set() and "Done (" in line:
+                    self.ready.set()
+                    self._wake.set()
+                for listener in list(self.listeners):
+                    try:
+                        listener(line)
+                    except Exception as e:
+                        logger.warning(f"Console listener for {self.name} failed: {e}")
+        except Exception as e:
+            logger.warning(f"Console reader for {self.name} failed: {e}")
+        finally:
+            self.returncode = self.popen.wait()
+            self.log.close()
+            # Exit hooks run before waiters are woken up, so a restart sees their results
+            try:
+                on_exit(self)
+            finally:
+                self.exited.set()
+                self._wake.set()
+
+    def is_running(self) -> bool:
+        # returncode is set as soon as the JVM is reaped, before the exit hooks run
+        return self.popen is not None and self.returncode is None and not self.exited.is_set()
+
+    def wait_ready(self, timeout: float) -> bool:
+        """Wait for "Done (" in the console; False on timeout or early exit"""
+        self._wake.wait(timeout)
+        return self.ready.is_set()
+
+    def wait_exit(self, timeout: Optional[float]) -> bool:
+        return self.exited.wait(timeout)
+
+    def send_command(self, command: str) -> bool:
+        if not self.is_running():
+            return False
+        try:
+            with self._stdin_lock:
+                self.popen.stdin.write(command.rstrip("\n") + "\n")
+                self.popen.stdin.flush()
+            return True
+        except (BrokenPipeError, ValueError, OSError):
+            return False
+
+    def console_tail(self, lines: int = 50) -> str:
+        return "".join(list(self.console)[-lines:])
+
+    def console_since(self, seq: int, limit: int = CONSOLE_BUFFER_LINES) -> Tuple[int, List[str]]:
+        """Buffered lines after `seq` (at most `limit`), returns (seq of the first line, lines)"""
+        lines = list(self.console)
+        last = self.seq
+        first = last - len(lines) + 1
+        start = max(seq + 1, first, last - limit + 1)
+        return start, lines[start - first:]
+
+
+class ProcessSupervisor:
+    def __init__(self,
+                 max_restarts: int = int(os.environ.get("MC_MAX_RESTARTS", "5")),
+                 backoff_base: float = float(os.environ.get("MC_RESTART_BACKOFF", "5")),
+                 backoff_max: float = 300.0,
+                 stable_after: float = 600.0):
+        self.max_restarts = max_restarts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        # A server that ran this long before crashing starts over with the backoff
+        self.stable_after = stable_after
+        self.lock = Lock()
+        self.processes: Dict[str, ServerProcess] = {}
+        self.restart_fns: Dict[str, Callable[[], None]] = {}
+        self.crashes: Dict[str, Dict] = {}
+        self.timers: Dict[str, Timer] = {}
+        self.exit_listeners: List[Callable[[ServerProcess], None]] = []
+        # Console subscribers per server name, kept across restarts: fn(proc, line), line None on exit
+        self.console_subscribers: Dict[str, List[Callable[[ServerProcess, Optional[str]], None]]] = {}
+
+    def start(self, name: str, command: List[str], cwd: str, log_path: str,
+              restart_fn: Optional[Callable[[], None]] = None,
+              listeners: Optional[List[Callable[[str], None]]] = None,
+              log_options: Optional[Dict] = None) -> ServerProcess:
+        with self.lock:
+            current = self.processes.get(name)
+            if current and current.is_running():
+                raise RuntimeError(f"Server {name} is already running")
+            timer = self.timers.pop(name, None)
+            if timer:
+                timer.cancel()
+            proc = ServerProcess(name, command, cwd, log_path, log_options)
+            # Register before the start so no console line is missed
+            proc.listeners.extend(listeners or [])
+            proc.listeners.append(lambda line, proc=proc: self._dispatch_console(proc, line))
+            proc.start(self._on_exit)
+            self.processes[name] = proc
+            if restart_fn:
+                self.restart_fns[name] = restart_fn
+        logger.info(f"Supervisor: started {name} (PID {proc.pid}): {' '.join(command)}")
+        return proc
+
+    def get(self, name: str) -> Optional[ServerProcess]:
+        proc = self.processes.get(name)
+        if proc and proc.is_running():
+            return proc
+        return None
+
+    def send_command(self, name: str, command: str) -> bool:
+        proc = self.get(name)
+        return proc.send_command(command) if proc else False
+
+    def stop(self, name: str,
+             stop_timeout: float = DEFAULT_STOP_TIMEOUT,
+             term_timeout: float = DEFAULT_TERM_TIMEOUT) -> str:
+        self._cancel_restart(name)
+        proc = self.get(name)
+        if not proc:
+            return "gone"
+        proc.stop_requested = True
+        return graceful_stop(
+            proc.pid,
+            lambda: proc.send_command("stop"),
+            stop_timeout=stop_timeout,
+            term_timeout=term_timeout,
+            wait=proc.wait_exit,
+        )
+
+    def kill(self, name: str) -> str:
+        self._cancel_restart(name)
+        proc = self.get(name)
+        if not proc:
+            return "gone"
+        proc.stop_requested = True
+        outcome = kill_process(proc.pid)
+        proc.wait_exit(5)
+        return outcome
+
+    def _cancel_restart(self, name: str):
+        with self.lock:
+            timer = self.timers.pop(name, None)
+            self.restart_fns.pop(name, None)
+        if timer:
+            timer.cancel()
+
+    def subscribe_console(self, name: str, subscriber: Callable[[ServerProcess, Optional[str]], None]):
+        with self.lock:
+            self.console_subscribers.setdefault(name, []).append(subscriber)
+
+    def unsubscribe_console(self, name: str, subscriber: Callable[[ServerProcess, Optional[str]], None]):
+        with self.lock:
+            subscribers = self.console_subscribers.get(name, [])
+            if subscriber in subscribers:
+                subscribers.remove(subscriber)
+            if not subscribers:
+                self.console_subscribers.pop(name, None)
+
+    def _dispatch_console(self, proc: ServerProcess, line: Optional[str]):
+        for subscriber in list(self.console_subscribers.get(proc.name, ())):
+            try:
+                subscriber(proc, line)
+            except Exception as e:
+                logger.warning(f"Console subscriber for {proc.name} failed: {e}")
+
+    def _on_exit(self, proc: ServerProcess):
+        self._dispatch_console(proc, None)
+        for listener in list(self.exit_listeners):
+            try:
+                listener(proc)
+            except Exception as e:
+                logger.warning(f"Exit listener for {proc.name} failed: {e}")
+        # Exit code 0 is a clean shutdown ("stop" from the console or in-game), not a crash
+        if proc.stop_requested or proc.returncode == 0:
+            logger.info(f"Supervisor: {proc.name} exited with code {proc.returncode}")
+            return
+        runtime = time.time() - (proc.started_at or time.time())
+        if not proc.ready.is_set():
+            # Never finished booting (EULA, broken jar, ...) - restarting won't help
+            logger.error(f"Supervisor: {proc.name} exited during startup with code {proc.returncode}")
+            return
+        with self.lock:
+            crash = self.crashes.setdefault(proc.name, {"restarts": 0})
+            if runtime >= self.stable_after:
+                crash["restarts"] = 0
+            crash.update({"time": int(time.time()), "returncode": proc.returncode})
+            restart_fn = self.restart_fns.get(proc.name)
+            if not restart_fn or crash["restarts"] >= self.max_restarts:
+                logger.error(f"Supervisor: {proc.name} crashed (code {proc.returncode}), not restarting")
+                return
+            delay = min(self.backoff_max, self.backoff_base * (2 ** crash["restarts"]))
+            crash["restarts"] += 1
+            timer = Timer(delay, self._restart, args=(proc.name, restart_fn))
+            timer.daemon = True
+            self.timers[proc.name] = timer
+        logger.error(f"Supervisor: {proc.name} crashed (code {proc.returncode}), restart "
+                     f"{crash['restarts']}/{self.max_restarts} in {delay:.0f}s")
+        timer.start()
+
+    def _restart(self, name: str, restart_fn: Callable[[], None]):
+        with self.lock:
+            self.timers.pop(name, None)
+        try:
+            restart_fn()
+        except Exception as e:
+            logger.error(f"Supervisor: restart of {name} failed: {e}")
+
+    def get_status(self, name: str) -> Dict:
+        proc = self.processes.get(name)
+        crash = self.crashes.get(name, {})
+        return {
+            "managed": bool(proc and proc.is_running()),
+            "pid": proc.pid if proc and proc.is_running() else None,
+            "last_exit_code": proc.returncode if proc else None,
+            "restarts": crash.get("restarts", 0),
+            "last_crash": crash.get("time"),
+            "restart_pending": name in self.timers,
+        }
+
+# Global instance
+supervisor = ProcessSupervisor()
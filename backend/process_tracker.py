@@ -0,0 +1,99 @@
+"""
+Process Tracker für Minecraft Server
+Keeps one long-lived psutil.Process handle per server JVM so CPU percent can
+be computed as a delta between refreshes. A collector refreshes all values
+inside oneshot(); request handlers only read the cached result.
+"""
+import time
+import logging
+import psutil
+from typing import Dict, Optional
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+
+class TrackedProcess:
+    def __init__(self, pid: int):
+        self.handle = psutil.Process(pid)
+        # First cpu_percent() call only primes the counter
+        self.handle.cpu_percent(None)
+        self.create_time = self.handle.create_time()
+        self.values: Dict[str, Optional[float]] = {}
+        self.refreshed_at: float = 0.0
+
+    @property
+    def pid(self) -> int:
+        return self.handle.pid
+
+    def refresh(self) -> Dict[str, Optional[float]]:
+        proc = self.handle
+        values: Dict[str, Optional[float]] = {"pid": proc.pid}
+        with proc.oneshot():
+            cpu = proc.cpu_percent(None)
+            # Right after the handle was created there is no meaningful delta yet
+            values["cpu_percent"] = round(cpu, 1) if self.refreshed_at else None
+            try:
+                # smaps_rollup: PSS/USS next to RSS
+                mem = proc.memory_full_info()
+                values["pss_mb"] = round(mem.pss / 1024 / 1024, 1)
+            except (psutil.AccessDenied, AttributeError):
+                mem = proc.memory_info()
+                values["pss_mb"] = None
+            values["rss_mb"] = round(mem.rss / 1024 / 1024, 1)
+            values["threads"] = proc.num_threads()
+            try:
+                values["fds"] = proc.num_fds()
+            except (psutil.AccessDenied, AttributeError):
+                values["fds"] = None
+            try:
+                io = proc.io_counters()
+                values["read_bytes"] = io.read_bytes
+                values["write_bytes"] = io.write_bytes
+            except (psutil.AccessDenied, AttributeError):
+                values["read_bytes"] = values["write_bytes"] = None
+        self.refreshed_at = time.time()
+        values["uptime"] = int(self.refreshed_at - self.create_time)
+        self.values = values
+        return values
+
+
+class ProcessTracker:
+    def __init__(self):
+        self.lock = Lock()
+        self.processes: Dict[str, TrackedProcess] = {}
+
+    def refresh(self, servername: str, pid: Optional[int]) -> Optional[Dict[str, Optional[float]]]:
+        """Collector side: update the cached values of one server (pid None = stopped)"""
+        if not pid:
+            self.forget(servername)
+            return None
+        with self.lock:
+            tracked = self.processes.get(servername)
+            if tracked is None or tracked.pid != pid:
+                try:
+                    tracked = self.processes[servername] = TrackedProcess(pid)
+                except psutil.Error:
+                    self.processes.pop(servername, None)
+                    return None
+        try:
+            return tracked.refresh()
+        except psutil.Error:
+            self.forget(servername)
+            return None
+
+    def get(self, servername: str, pid: Optional[int] = None) -> Optional[Dict[str, Optional[float]]]:
+        """Request side: cached values; only a server nobody refreshed yet is read once"""
+        tracked = self.processes.get(servername)
+        if tracked is not None and (pid is None or tracked.pid == pid):
+            return tracked.values or None
+        if pid:
+            return self.refresh(servername, pid)
+        return None
+
+    def forget(self, servername: str):
+        with self.lock:
+            self.processes.pop(servername, None)
+
+# Global instance
+process_tracker = ProcessTracker()
@@ -6,6 +6,7 @@ import subprocess
 import logging
 from typing import Dict, List
 from port_allocator import port_allocator
+from prometheus_metrics import PROXY_RELOADS
 
 logger = logging.getLogger(__name__)
 
@@ -153,17 +154,21 @@ backend backend_{server_name}
                                   capture_output=True, text=True, timeout=10)
             if result.returncode == 0:
                 logger.info("HAProxy erfolgreich neugeladen")
+                PROXY_RELOADS.inc(result="success")
                 return True
             else:
                 logger.error(f"HAProxy Reload fehlgeschlagen: {result.stderr}")
                 logger.debug(f"HAProxy Reload stdout: {result.stdout}")
+                PROXY_RELOADS.inc(result="failure")
                 return False
                 
         except subprocess.TimeoutExpired:
             logger.error("HAProxy Reload timeout after 10 seconds")
+            PROXY_RELOADS.inc(result="timeout")
             return False
         except Exception as e:
             logger.error(f"Fehler beim HAProxy Reload: {e}")
+            PROXY_RELOADS.inc(result="failure")
             return False
     
     def _alternative_reload(self) -> bool:
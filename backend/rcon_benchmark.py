@@ -0,0 +1,177 @@
+"""
+RCON Benchmark für Blockpanel
+Local fake RCON server that behaves like the vanilla one (auth, one packet
+per read, 4096 character response fragments, "Unknown request" answers for
+other packet types) and a benchmark of commands/sec: pooled connections vs.
+one connection per call
+"""
+import argparse
+import json
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+from typing import List, Optional
+
+from rcon_client import (RconConnection, RconPool, encode_packet, RESPONSE_FRAGMENT_CHARS,
+                         SERVERDATA_AUTH, SERVERDATA_EXECCOMMAND, SERVERDATA_RESPONSE_VALUE)
+
+# The vanilla RCON thread reads into a buffer of this size
+RECV_SIZE = 1460
+
+
+class _RconHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        server: "FakeRconServer" = self.server
+        sock = self.request
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with server.lock:
+            server.connections += 1
+        authenticated = False
+        try:
+            while True:
+                # Like vanilla: one read per packet, a length that doesn't match what was read
+                # (two packets sent together, a split packet) drops the client
+                data = sock.recv(RECV_SIZE)
+                if not data:
+                    return
+                (length,) = struct.unpack("<i", data[:4]) if len(data) >= 4 else (-1,)
+                if length < 10 or len(data) != length + 4:
+                    with server.lock:
+                        server.protocol_errors += 1
+                    return
+                request_id, packet_type = struct.unpack("<ii", data[4:12])
+                payload = data[12:-2].decode("utf-8", errors="replace")
+                if packet_type == SERVERDATA_AUTH:
+                    authenticated = payload == server.password
+                    sock.sendall(encode_packet(request_id if authenticated else -1, SERVERDATA_EXECCOMMAND, ""))
+                elif packet_type == SERVERDATA_EXECCOMMAND:
+                    if not authenticated:
+                        sock.sendall(encode_packet(-1, SERVERDATA_EXECCOMMAND, ""))
+                        continue
+                    if server.delay:
+                        time.sleep(server.delay)
+                    response = server.respond(payload)
+                    for start in range(0, max(len(response), 1), RESPONSE_FRAGMENT_CHARS):
+                        sock.sendall(encode_packet(request_id, SERVERDATA_RESPONSE_VALUE,
+                                                   response[start:start + RESPONSE_FRAGMENT_CHARS]))
+                else:
+                    sock.sendall(encode_packet(request_id, SERVERDATA_RESPONSE_VALUE,
+                                               f"Unknown request {packet_type:x}"))
+        except OSError:
+            pass
+
+
+class FakeRconServer(socketserver.ThreadingTCPServer):
+    """Fake server on 127.0.0.1; `respond(command)` produces the answer"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, password: str = "secret", port: int = 0, delay: float = 0.0):
+        super().__init__(("127.0.0.1", port), _RconHandler)
+        self.password = password
+        self.delay = delay
+        self.lock = threading.Lock()
+        # Accepted connections and clients dropped for sending more or less than one packet per read
+        self.connections = 0
+        self.protocol_errors = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def respond(self, command: str) -> str:
+        if command == "list":
+            return "There are 0 of a max of 20 players online: "
+        if command.startswith("big "):
+            return "x" * int(command.split()[1])
+        return f"Unknown or incomplete command: {command}"
+
+    def start(self) -> "FakeRconServer":
+        self._thread = threading.Thread(target=self.serve_forever, kwargs={"poll_interval": 0.05},
+                                        name="fake-rcon", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def bench_per_call(port: int, password: str, commands: List[str]) -> float:
+    started = time.perf_counter()
+    for command in commands:
+        conn = RconConnection("127.0.0.1", port, password)
+        conn.execute_many([command])
+        conn.close()
+    return time.perf_counter() - started
+
+
+def bench_pooled(pool: RconPool, commands: List[str]) -> float:
+    started = time.perf_counter()
+    for command in commands:
+        pool.execute("bench", command)
+    return time.perf_counter() - started
+
+
+def bench_batched(pool: RconPool, commands: List[str], batch: int) -> float:
+    started = time.perf_counter()
+    for i in range(0, len(commands), batch):
+        pool.execute_many("bench", commands[i:i + batch])
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Blockpanel RCON Benchmark")
+    parser.add_argument("--commands", type=int, default=2000, help="Commands per mode")
+    parser.add_argument("--batch", type=int, default=50, help="Commands per execute_many() batch")
+    parser.add_argument("--delay", type=float, default=0.0, help="Simulated server time per command (s)")
+    parser.add_argument("--port", type=int, help="Benchmark a real server on this RCON port instead")
+    parser.add_argument("--password", default="secret", help="RCON password")
+    parser.add_argument("--command", default="list", help="Command to run")
+    parser.add_argument("--output", help="Output file for results (JSON)")
+    args = parser.parse_args()
+
+    fake = None
+    port = args.port
+    if port is None:
+        fake = FakeRconServer(args.password, delay=args.delay).start()
+        port = fake.port
+    pool = RconPool(max_connections=1)
+    pool.configure(get_settings=lambda name: (port, args.password))
+    commands = [args.command] * args.commands
+
+    try:
+        # Warm-up (connection setup, first login)
+        pool.execute("bench", args.command)
+        results = {}
+        for mode, run in (("per_call", lambda: bench_per_call(port, args.password, commands)),
+                          ("pooled", lambda: bench_pooled(pool, commands)),
+                          ("batched", lambda: bench_batched(pool, commands, args.batch))):
+            seconds = run()
+            results[mode] = {"seconds": round(seconds, 3), "commands_per_s": round(len(commands) / seconds, 1)}
+            print(f"{mode}: {results[mode]['commands_per_s']} commands/s")
+    finally:
+        pool.forget("bench")
+        if fake:
+            fake.stop()
+
+    result = {"server": "fake" if fake else f"127.0.0.1:{port}", "commands": args.commands,
+              "batch": args.batch, "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"📄 Results saved to {args.output}")
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n⚠️  Benchmark interrupted by user")
+        sys.exit(1)
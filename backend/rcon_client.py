@@ -0,0 +1,263 @@
+"""
+RCON Client für Minecraft Server
+Source RCON protocol with a small per-server connection pool. The vanilla
+RCON thread reads one packet per read() and drops anything sent along with
+it, so every packet is sent on its own and only after the previous reply.
+Responses longer than one fragment (4096 characters) are followed by an
+empty marker packet: everything before the marker's answer belongs to the
+command.
+"""
+import os
+import socket
+import struct
+import time
+import logging
+import itertools
+from typing import Callable, Dict, List, Optional, Tuple
+from threading import Condition, Lock
+
+logger = logging.getLogger(__name__)
+
+SERVERDATA_RESPONSE_VALUE = 0
+SERVERDATA_EXECCOMMAND = 2
+SERVERDATA_AUTH = 3
+# Minecraft rejects packets larger than this
+MAX_COMMAND_LENGTH = 1446
+# Vanilla splits responses into 4096 byte payloads, other servers may not
+MAX_PACKET_LENGTH = 1024 * 1024
+# Vanilla splits responses into fragments of this many (UTF-16) characters
+RESPONSE_FRAGMENT_CHARS = 4096
+RCON_PORT_OFFSET = 1000
+DEFAULT_TIMEOUT = float(os.environ.get("MC_RCON_TIMEOUT", "5"))
+
+
+class RconError(Exception):
+    pass
+
+
+class RconAuthError(RconError):
+    pass
+
+
+class RconTimeout(RconError):
+    pass
+
+
+def rcon_port_for(game_port: int) -> int:
+    """RCON port of a server: game port + 1000 (the default 25575 collides with game ports)"""
+    return game_port + RCON_PORT_OFFSET
+
+
+def encode_packet(request_id: int, packet_type: int, payload: str) -> bytes:
+    body = struct.pack("<ii", request_id, packet_type) + payload.encode("utf-8") + b"\x00\x00"
+    return struct.pack("<i", len(body)) + body
+
+
+def _recv_exact(sock: socket.socket, length: int) -> bytes:
+    data = bytearray()
+    while len(data) < length:
+        chunk = sock.recv(length - len(data))
+        if not chunk:
+            raise RconError("Connection closed by server")
+        data.extend(chunk)
+    return bytes(data)
+
+
+def read_packet(sock: socket.socket) -> Tuple[int, int, str]:
+    """Read one packet, return (request id, type, payload)"""
+    (length,) = struct.unpack("<i", _recv_exact(sock, 4))
+    if length < 10 or length > MAX_PACKET_LENGTH:
+        raise RconError(f"Invalid packet length {length}")
+    body = _recv_exact(sock, length)
+    request_id, packet_type = struct.unpack("<ii", body[:8])
+    return request_id, packet_type, body[8:-2].decode("utf-8", errors="replace")
+
+
+class RconConnection:
+    """One authenticated RCON connection; not thread-safe, the pool hands it to one caller at a time"""
+
+    def __init__(self, host: str, port: int, password: str, timeout: float = DEFAULT_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.ids = itertools.count(1)
+        self.last_used = time.monotonic()
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        try:
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._login(password)
+        except Exception:
+            self.close()
+            raise
+
+    def _login(self, password: str):
+        request_id = next(self.ids)
+        self.sock.sendall(encode_packet(request_id, SERVERDATA_AUTH, password))
+        while True:
+            response_id, packet_type, _ = read_packet(self.sock)
+            # Some servers send an empty RESPONSE_VALUE before the auth response
+            if packet_type == SERVERDATA_RESPONSE_VALUE and response_id == request_id:
+                continue
+            if response_id == -1:
+                raise RconAuthError("RCON authentication failed")
+            if response_id == request_id:
+                return
+
+    def execute_many(self, commands: List[str], timeout: Optional[float] = None) -> List[str]:
+        """Run the commands one after another on this connection"""
+        for command in commands:
+            if len(command.encode("utf-8")) > MAX_COMMAND_LENGTH:
+                raise RconError(f"Command too long ({len(command)} characters)")
+        deadline = time.monotonic() + (timeout if timeout is not None else self.timeout)
+        responses = [self._execute(command, deadline) for command in commands]
+        self.last_used = time.monotonic()
+        return responses
+
+    def _send(self, request_id: int, packet_type: int, payload: str, deadline: float):
+        self.sock.settimeout(max(0.01, deadline - time.monotonic()))
+        self.sock.sendall(encode_packet(request_id, packet_type, payload))
+
+    def _read(self, deadline: float) -> Tuple[int, int, str]:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise socket.timeout("RCON response timed out")
+        self.sock.settimeout(remaining)
+        return read_packet(self.sock)
+
+    def _execute(self, command: str, deadline: float) -> str:
+        command_id = next(self.ids)
+        self._send(command_id, SERVERDATA_EXECCOMMAND, command, deadline)
+        marker_id = None
+        parts = []
+        while True:
+            response_id, _, payload = self._read(deadline)
+            if response_id == -1:
+                raise RconAuthError("RCON session is not authenticated")
+            if marker_id is not None and response_id == marker_id:
+                break
+            if response_id != command_id:
+                # Leftover of an earlier command
+                continue
+            parts.append(payload)
+            if marker_id is None:
+                if len(payload.encode("utf-16-le")) // 2 < RESPONSE_FRAGMENT_CHARS:
+                    break
+                # More fragments may follow. The server has finished the command and
+                # only reads again after its last fragment, so the marker is read on its own
+                marker_id = next(self.ids)
+                self._send(marker_id, SERVERDATA_RESPONSE_VALUE, "", deadline)
+        return "".join(parts)
+
+    def close(self):
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class RconPool:
+    """
+    Up to `max_connections` pooled connections per server. Connections are
+    created lazily, reused across requests and dropped after an error, after
+    `idle_timeout` seconds without use or when the server's RCON settings change.
+    """
+
+    def __init__(self, max_connections: int = int(os.environ.get("MC_RCON_POOL_SIZE", "2")),
+                 idle_timeout: float = 300.0, host: str = "127.0.0.1"):
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self.host = host
+        self.lock = Lock()
+        self.available = Condition(self.lock)
+        # servername -> idle connections / number of open connections / settings they were opened with
+        self.idle: Dict[str, List[RconConnection]] = {}
+        self.open_count: Dict[str, int] = {}
+        self.settings: Dict[str, Tuple[int, str]] = {}
+        self.get_settings: Optional[Callable[[str], Optional[Tuple[int, str]]]] = None
+
+    def configure(self, get_settings: Callable[[str], Optional[Tuple[int, str]]]):
+        """get_settings(servername) -> (rcon port, password) or None when RCON is disabled"""
+        self.get_settings = get_settings
+
+    def _acquire(self, servername: str, timeout: float) -> RconConnection:
+        settings = self.get_settings(servername) if self.get_settings else None
+        if not settings:
+            raise RconError(f"RCON is not enabled for {servername}")
+        deadline = time.monotonic() + timeout
+        with self.lock:
+            if self.settings.get(servername) != settings:
+                self._close_idle(servername)
+                self.settings[servername] = settings
+            while True:
+                idle = self.idle.get(servername)
+                while idle:
+                    conn = idle.pop()
+                    if time.monotonic() - conn.last_used < self.idle_timeout:
+                        return conn
+                    conn.close()
+                    self.open_count[servername] -= 1
+                if self.open_count.get(servername, 0) < self.max_connections:
+                    self.open_count[servername] = self.open_count.get(servername, 0) + 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RconError(f"No free RCON connection for {servername}")
+                self.available.wait(remaining)
+        port, password = settings
+        try:
+            return RconConnection(self.host, port, password, timeout=max(0.1, deadline - time.monotonic()))
+        except RconError:
+            self._discard(servername)
+            raise
+        except OSError as e:
+            self._discard(servername)
+            raise RconError(f"Could not connect to RCON of {servername} (port {port}): {e}") from e
+
+    def _release(self, servername: str, conn: RconConnection):
+        with self.lock:
+            if self.settings.get(servername) is None:
+                # forget() ran while the connection was in use
+                conn.close()
+                self.open_count[servername] = max(0, self.open_count.get(servername, 1) - 1)
+            else:
+                self.idle.setdefault(servername, []).append(conn)
+            self.available.notify()
+
+    def _discard(self, servername: str, conn: Optional[RconConnection] = None):
+        if conn:
+            conn.close()
+        with self.lock:
+            self.open_count[servername] = max(0, self.open_count.get(servername, 1) - 1)
+            self.available.notify()
+
+    def _close_idle(self, servername: str):
+        for conn in self.idle.pop(servername, []):
+            conn.close()
+            self.open_count[servername] = max(0, self.open_count.get(servername, 1) - 1)
+
+    def execute_many(self, servername: str, commands: List[str], timeout: float = DEFAULT_TIMEOUT) -> List[str]:
+        conn = self._acquire(servername, timeout)
+        try:
+            responses = conn.execute_many(commands, timeout)
+        except socket.timeout as e:
+            self._discard(servername, conn)
+            raise RconTimeout(f"RCON command timed out after {timeout}s") from e
+        except (OSError, RconError) as e:
+            self._discard(servername, conn)
+            if isinstance(e, RconError):
+                raise
+            raise RconError(f"RCON connection failed: {e}") from e
+        self._release(servername, conn)
+        return responses
+
+    def execute(self, servername: str, command: str, timeout: float = DEFAULT_TIMEOUT) -> str:
+        return self.execute_many(servername, [command], timeout)[0]
+
+    def forget(self, servername: str):
+        """Close the pooled connections of a server (stopped, deleted)"""
+        with self.lock:
+            self._close_idle(servername)
+            self.settings.pop(servername, None)
+
+# Global instance
+rcon_pool = RconPool()
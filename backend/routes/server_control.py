@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, BackgroundTasks, Form, Body
+from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, BackgroundTasks, Form, Body, Query, WebSocket, WebSocketDisconnect
 from auth import get_current_user
+import asyncio
+import anyio.to_thread
+import json
 import subprocess
 import os
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 import glob
 import psutil
 import requests
@@ -13,27 +16,40 @@ import tempfile
 import logging
 from proxy_manager import proxy_manager
 from port_allocator import port_allocator
+from server_provisioning import provision_server, rcon_properties
+from server_templates import template_manager, is_valid_template_name
+from fleet_manager import fleet_manager
+from process_control import graceful_stop, kill_process, DEFAULT_STOP_TIMEOUT, DEFAULT_TERM_TIMEOUT
+from process_supervisor import supervisor
+from jvm_profiles import build_java_command, list_profiles, JvmProfileError, DEFAULT_PROFILE
+from cds_archive import cds_manager
+from cpu_allocator import cpu_allocator, apply_affinity
+from hibernation import hibernation_manager
+from log_reader import log_reader, LogCursor, read_page
+from log_search import log_searcher
+from player_tracker import player_tracker
+from server_overview import overview_collector
+from metrics_store import metrics_store
+from metrics_sampler import metrics_sampler, METRICS
+from prometheus_metrics import registry as prometheus_registry, Gauge
+from process_tracker import process_tracker
+from console_stream import ConsoleStream, group_lines
+from rcon_client import rcon_pool, RconError, DEFAULT_TIMEOUT as DEFAULT_RCON_TIMEOUT
+from tick_monitor import tick_monitor
+from live_properties import apply_live
+from server_properties import properties_store, validate_changes
+from concurrent.futures import ThreadPoolExecutor
 import threading
 import time
 
 router = APIRouter()
 
+def set_properties(servername: str, changes: dict) -> dict:
+    """Mehrere Keys in server.properties mit einem atomaren Schreibvorgang setzen"""
+    return properties_store.update(safe_server_path(servername, "server.properties"), changes)
+
 def set_property_in_properties(servername: str, key: str, value: str):
-    prop_path = safe_server_path(servername, "server.properties")
-    lines = []
-    found = False
-    if os.path.exists(prop_path):
-        with open(prop_path, "r") as f:
-            for line in f:
-                if line.strip().startswith(f"{key}="):
-                    lines.append(f"{key}={value}\n")
-                    found = True
-                else:
-                    lines.append(line)
-    if not found:
-        lines.append(f"{key}={value}\n")
-    with open(prop_path, "w") as f:
-        f.writelines(lines)
+    set_properties(servername, {key: value})
 
 @router.get("/server/players_full")
 def get_players_full(servername: str, current_user: dict = Depends(get_current_user)):
@@ -57,28 +73,50 @@ def get_players_full(servername: str, current_user: dict = Depends(get_current_u
             pass
     return {"players": players}
 
+def update_properties(servername: str, changes: dict) -> dict:
+    """
+    Geänderte Keys in server.properties schreiben; läuft der Server, werden
+    live anwendbare Keys (difficulty, gamemode, white-list, ...) per RCON
+    übernommen, der Rest steht in restart_required. Ungültige Keys/Werte -> 400.
+    """
+    try:
+        validate_changes(changes)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    old = _read_properties(servername)
+    changed = {key: str(value) for key, value in changes.items() if old.get(key) != str(value)}
+    result = {"changed": list(changed), "applied_live": [], "restart_required": [], "live_errors": []}
+    if changed and get_server_proc(servername):
+        # Vor dem Schreiben: der RCON-Pool nutzt noch die Zugangsdaten des laufenden Servers
+        if get_rcon_settings(servername):
+            result.update(apply_live(changed, lambda commands: rcon_pool.execute_many(servername, commands)))
+        else:
+            result["restart_required"] = list(changed)
+    set_properties(servername, changed)
+    return result
+
 @router.post("/server/properties/set-seed")
 def set_seed(servername: str = Form(...), seed: str = Form(...), current_user: dict = Depends(get_current_user)):
-    set_property_in_properties(servername, "level-seed", seed)
-    return {"message": f"Seed gesetzt: {seed}"}
+    result = update_properties(servername, {"level-seed": seed})
+    return {"message": f"Seed gesetzt: {seed}", **result}
 
 @router.post("/server/properties/set-nether")
 def set_nether(servername: str = Form(...), allow: bool = Form(...), current_user: dict = Depends(get_current_user)):
-    set_property_in_properties(servername, "allow-nether", "true" if allow else "false")
-    return {"message": f"Nether {'erlaubt' if allow else 'verboten'}"}
+    result = update_properties(servername, {"allow-nether": "true" if allow else "false"})
+    return {"message": f"Nether {'erlaubt' if allow else 'verboten'}", **result}
 
 @router.post("/server/properties/set-difficulty")
 def set_difficulty(servername: str = Form(...), difficulty: str = Form(...), current_user: dict = Depends(get_current_user)):
     allowed = {"easy", "normal", "peaceful", "hard"}
     if difficulty not in allowed:
         raise HTTPException(status_code=400, detail="Ungültige Schwierigkeit. Erlaubt: easy, normal, peaceful, hard")
-    set_property_in_properties(servername, "difficulty", difficulty)
-    return {"message": f"Schwierigkeit gesetzt: {difficulty}"}
+    result = update_properties(servername, {"difficulty": difficulty})
+    return {"message": f"Schwierigkeit gesetzt: {difficulty}", **result}
 
 @router.post("/server/properties/set-motd")
 def set_motd(servername: str = Form(...), motd: str = Form(...), current_user: dict = Depends(get_current_user)):
-    set_property_in_properties(servername, "motd", motd)
-    return {"message": f"MOTD gesetzt: {motd}"}
+    result = update_properties(servername, {"motd": motd})
+    return {"message": f"MOTD gesetzt: {motd}", **result}
 
 def is_port_open(host: str, port: int, timeout: float = 0.5) -> bool:
     """Check if a port is open on the given host"""
@@ -162,17 +200,12 @@ def get_minecraft_server_ports() -> set:
     for server_name in os.listdir(mc_servers_dir):
         server_path = os.path.join(mc_servers_dir, server_name)
         if os.path.isdir(server_path):
-            properties_file = os.path.join(server_path, "server.properties")
-            if os.path.exists(properties_file):
-                try:
-                    with open(properties_file, 'r') as f:
-                        for line in f:
-                            if line.startswith('server-port='):
-                                port = int(line.split('=')[1].strip())
-                                used_ports.add(port)
-                                break
-                except (ValueError, IOError):
-                    continue
+            try:
+                port = properties_store.get(os.path.join(server_path, "server.properties"), "server-port")
+                if port is not None:
+                    used_ports.add(int(port))
+            except (ValueError, IOError):
+                continue
     
     return used_ports
 
@@ -276,18 +309,10 @@ def check_server_port(servername: str, current_user: dict = Depends(get_current_
     """
     Prüft, ob der Minecraft-Server-Port erreichbar ist (TCP connect).
     """
-    import time
-    prop_path = safe_server_path(servername, "server.properties")
-    port = 25565
-    if os.path.exists(prop_path):
-        with open(prop_path, "r") as f:
-            for line in f:
-                if line.strip().startswith("server-port="):
-                    try:
-                        port = int(line.strip().split("=", 1)[1])
-                    except Exception:
-                        port = 25565
-                    break
+    try:
+        port = int(get_server_property(servername, "server-port", "25565"))
+    except ValueError:
+        port = 25565
     # Versuche, den Port zu erreichen (localhost und 0.0.0.0)
     result = False
     for host in ["127.0.0.1", "0.0.0.0"]:
@@ -301,157 +326,366 @@ def check_server_port(servername: str, current_user: dict = Depends(get_current_
 
 @router.get("/server/uptime")
 def get_server_uptime(servername: str, current_user: dict = Depends(get_current_user)):
-    pid = get_server_proc(servername)
-    uptime = None
-    if pid:
-        try:
-            p = psutil.Process(pid)
-            uptime = int(time.time() - p.create_time())
-        except Exception:
-            uptime = None
-    return {"uptime": uptime}
+    process = process_tracker.get(servername, get_server_proc(servername))
+    return {"uptime": process["uptime"] if process else None}
 
 @router.get("/server/stats")
 def server_stats(servername: str, current_user: dict = Depends(get_current_user)):
     import time
     import locale as pylocale
     ram_allocated = get_server_ram(servername)
-    pid = get_server_proc(servername)
-    ram_used = None
-    uptime = None
-    if pid:
-        try:
-            p = psutil.Process(pid)
-            # Summe aller Java-Prozesse im tmux-Session
-            ram_used = int(p.memory_info().rss / 1024 / 1024)
-            for child in p.children(recursive=True):
-                try:
-                    ram_used += int(child.memory_info().rss / 1024 / 1024)
-                except Exception:
-                    pass
-            uptime = int(time.time() - p.create_time())
-        except Exception:
-            ram_used = None
-            uptime = None
+    # Prozesswerte aus dem Process-Tracker (vom Metrics-Sampler aktualisiert)
+    process = process_tracker.get(servername, get_server_proc(servername))
+    ram_used = int(process["rss_mb"]) if process else None
+    uptime = process["uptime"] if process else None
     plugin_dir = safe_server_path(servername, "plugins")
     plugins = []
     if os.path.exists(plugin_dir):
         plugins = [f for f in os.listdir(plugin_dir) if f.endswith(".jar")]
-    prop_path = safe_server_path(servername, "server.properties")
-    props = {}
-    if os.path.exists(prop_path):
-        with open(prop_path, "r") as f:
-            for line in f:
-                if "=" in line and not line.strip().startswith("#"):
-                    k, v = line.strip().split("=", 1)
-                    props[k] = v
+    props = _read_properties(servername)
     max_players = 0
     if "max-players" in props:
         try:
             max_players = int(props["max-players"])
         except Exception:
             max_players = 0
-    log_path = safe_server_path(servername, "logs", "latest.log")
-    if not os.path.exists(log_path):
-        log_path = safe_server_path(servername, "server.log")
-    # Version aus Log extrahieren
-    server_version = None
-    if os.path.exists(log_path):
-        try:
-            with open(log_path, "r", encoding="utf-8", errors="ignore") as f:
-                lines = f.readlines()[-200:]
-            for line in lines:
-                if "Starting minecraft server version" in line:
-                    m = re.search(r"Starting minecraft server version ([^\s]+)", line)
-                    if m:
-                        server_version = m.group(1)
-                        break
-        except Exception:
-            pass
-    # Player count aus Log: joined/left the game
-    online_players = 0
-    if os.path.exists(log_path):
-        try:
-            import re
-            player_set = set()
-            with open(log_path, "r", encoding="utf-8", errors="ignore") as f:
-                lines = f.readlines()[-500:]
-            for line in lines:
-                # joined
-                m = re.search(r"INFO\]: (?:\\u001b\[[^m]+m)?([A-Za-z0-9_]+) joined the game", line)
-                if m:
-                    player_set.add(m.group(1))
-                # left
-                m2 = re.search(r"INFO\]: (?:\\u001b\[[^m]+m)?([A-Za-z0-9_]+) left the game", line)
-                if m2:
-                    player_set.discard(m2.group(1))
-            online_players = len(player_set)
-        except Exception:
-            online_players = 0
+    log_path = get_server_log_path(servername)
+    # Player count aus dem Presence-Tracker (folgt latest.log im Hintergrund)
+    online_players = player_tracker.get_count(servername)
     port = props.get("server-port", "25565")
     address = f"{socket.gethostbyname(socket.gethostname())}:{port}"
-    # Live-Log aus tmux, falls Session läuft
+    # Live-Konsole aus dem Supervisor, falls der Server läuft
     live_log = None
-    session = get_tmux_session(servername)
-    try:
-        out = subprocess.check_output(["tmux", "capture-pane", "-t", session, "-p"], cwd=safe_server_path(servername))
-        live_log = out.decode(errors="ignore")
-    except Exception:
-        if os.path.exists(log_path):
-            try:
-                with open(log_path, "r", encoding="utf-8", errors="ignore") as f:
-                    live_log = "".join(f.readlines()[-30:])
-            except Exception:
-                live_log = ""
-        else:
+    proc = supervisor.get(servername)
+    if proc:
+        live_log = proc.console_tail(50)
+    else:
+        try:
+            live_log = log_reader.tail(log_path, 30)
+        except Exception:
             live_log = ""
     return {
         "ram_allocated": ram_allocated,
         "ram_used": ram_used,
         "uptime": uptime,
+        "cpu_percent": process["cpu_percent"] if process else None,
+        "process": process,
         "plugins": plugins,
         "player_count": online_players,
         "max_players": max_players,
         "address": address,
         "port": port,
-        "logs": live_log
+        "logs": live_log,
+        "jvm_profile": get_server_config(servername).get("jvm_profile", DEFAULT_PROFILE),
+        "cds": cds_manager.get_mode(servername),
+        "cpus": cpu_allocator.get_server_cpus(servername),
+        "supervisor": supervisor.get_status(servername)
+    }
+
+def _read_properties(servername: str) -> dict:
+    return properties_store.read(safe_server_path(servername, "server.properties"))
+
+def collect_server_overview(servername: str) -> dict:
+    """Alle Dashboard-Daten eines Servers in einem Durchgang"""
+    props = _read_properties(servername)
+    port = props.get("server-port", "25565")
+    pid = get_server_proc(servername)
+    process = process_tracker.get(servername, pid)
+    if pid:
+        status = "running"
+    elif hibernation_manager.is_sleeping(servername):
+        status = "sleeping"
+    else:
+        status = "stopped"
+    port_open = False
+    if pid:
+        try:
+            with socket.create_connection(("127.0.0.1", int(port)), timeout=0.5):
+                port_open = True
+        except (OSError, ValueError):
+            pass
+    try:
+        max_players = int(props.get("max-players", 0))
+    except ValueError:
+        max_players = 0
+    plugin_dir = safe_server_path(servername, "plugins")
+    plugins = []
+    if os.path.exists(plugin_dir):
+        plugins = [f for f in os.listdir(plugin_dir) if f.endswith(".jar")]
+    log_path = get_server_log_path(servername)
+    logs = ""
+    if pid:
+        proc = supervisor.get(servername)
+        logs = proc.console_tail(50) if proc else log_reader.tail(log_path, 50)
+    return {
+        "name": servername,
+        "status": status,
+        "ram_allocated": get_server_ram(servername),
+        "ram_used": int(process["rss_mb"]) if process else None,
+        "uptime": process["uptime"] if process else None,
+        "cpu_percent": process["cpu_percent"] if process else None,
+        "threads": process["threads"] if process else None,
+        "player_count": player_tracker.get_count(servername) if pid else 0,
+        "max_players": max_players,
+        "version": log_reader.server_version(log_path, with_variant=True),
+        "plugins": plugins,
+        "port": port,
+        "port_open": port_open,
+        "motd": props.get("motd"),
+        "jvm_profile": get_server_config(servername).get("jvm_profile", DEFAULT_PROFILE),
+        "cpus": cpu_allocator.get_server_cpus(servername),
+        "logs": logs,
     }
 
+@router.get("/server/overview")
+def server_overview(servername: str = None, current_user: dict = Depends(get_current_user)):
+    """
+    Dashboard-Daten aus dem gemeinsamen Snapshot (alle MC_OVERVIEW_INTERVAL Sekunden erneuert).
+    Ohne servername: alle Server, ohne Konsolen-Log.
+    """
+    snapshot = overview_collector.get()
+    if servername:
+        if not is_valid_servername(servername):
+            raise HTTPException(status_code=400, detail="Invalid server name")
+        server = snapshot.get(servername)
+        if server is None:
+            if not os.path.exists(safe_server_path(servername)):
+                raise HTTPException(status_code=404, detail="Server not found")
+            # Neu angelegt, noch nicht im Snapshot
+            server = collect_server_overview(servername)
+        return {"server": server, "age": overview_collector.age()}
+    servers = [{k: v for k, v in data.items() if k != "logs"} for data in snapshot.values()]
+    return {"servers": servers, "age": overview_collector.age()}
+
+WS_QUEUE_SIZE = 64
+
+def websocket_user(token: str):
+    """JWT aus dem Query-Parameter prüfen (Browser können beim WebSocket-Handshake keinen Auth-Header setzen)"""
+    try:
+        return get_current_user(token or "")
+    except HTTPException:
+        return None
+
+async def _wait_for_disconnect(websocket: WebSocket):
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+@router.websocket("/server/overview/ws")
+async def server_overview_ws(websocket: WebSocket, token: str = None, servername: str = None):
+    """
+    Push-Kanal fürs Dashboard: erst ein vollständiger Snapshot, danach nur geänderte Felder,
+    sobald der Collector sie sieht. Nachrichten: {"type": "snapshot"|"update", "servers": {name: fields|null}}
+    """
+    if not websocket_user(token) or (servername and not is_valid_servername(servername)):
+        await websocket.close(code=1008)
+        return
+    await websocket.accept()
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=WS_QUEUE_SIZE)
+
+    def select(changes: dict) -> dict:
+        if servername:
+            return {servername: changes[servername]} if servername in changes else {}
+        # Übersicht aller Server ohne Konsolen-Log
+        return {name: {k: v for k, v in data.items() if k != "logs"} if data else data
+                for name, data in changes.items()}
+
+    def offer(changes: dict):
+        if queue.full():
+            # Client kommt nicht hinterher: Deltas verwerfen und neu synchronisieren
+            while not queue.empty():
+                queue.get_nowait()
+            changes = None
+        queue.put_nowait(changes)
+
+    def on_change(changes: dict):
+        selected = select(changes)
+        if selected:
+            loop.call_soon_threadsafe(offer, selected)
+
+    overview_collector.subscribe(on_change)
+    disconnected = asyncio.create_task(_wait_for_disconnect(websocket))
+    try:
+        snapshot = await anyio.to_thread.run_sync(overview_collector.get)
+        await websocket.send_json({"type": "snapshot", "servers": select(snapshot)})
+        while True:
+            next_change = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait({next_change, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if disconnected in done:
+                next_change.cancel()
+                break
+            changes = next_change.result()
+            if changes is None:
+                await websocket.send_json({"type": "snapshot", "servers": select(overview_collector.snapshot)})
+            else:
+                await websocket.send_json({"type": "update", "servers": changes})
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        overview_collector.unsubscribe(on_change)
+        disconnected.cancel()
+
+@router.websocket("/server/console/ws")
+async def server_console_ws(websocket: WebSocket, servername: str, token: str = None,
+                            since: int = None, lines: int = 100):
+    """
+    Live-Konsole: Backlog ab Sequenznummer `since` (sonst die letzten `lines` Zeilen), danach jede
+    neue Zeile sofort. Befehle kommen über denselben Kanal: {"type": "command", "command": "say hi"}.
+    Ausgehend: hello, lines {seq, lines}, dropped {count}, started {pid}, exit {code}, command {ok}.
+    """
+    if not websocket_user(token) or not is_valid_servername(servername) \
+            or not os.path.exists(safe_server_path(servername)):
+        await websocket.close(code=1008)
+        return
+    await websocket.accept()
+    stream = ConsoleStream(asyncio.get_running_loop())
+    proc = supervisor.get(servername)
+    state = {"pid": proc.pid if proc else None}
+
+    def on_console(proc, line):
+        if line is None:
+            stream.push(("event", {"type": "exit", "pid": proc.pid, "code": proc.returncode}))
+            return
+        if proc.pid != state["pid"]:
+            state["pid"] = proc.pid
+            stream.push(("event", {"type": "started", "pid": proc.pid}))
+        stream.push(("line", proc.seq, line))
+
+    supervisor.subscribe_console(servername, on_console)
+    tasks = []
+    # Zeilen bis zu dieser Sequenznummer stecken schon im Backlog
+    skip_until = 0
+    try:
+        if proc:
+            start, backlog = proc.console_since(since if since is not None else proc.seq - lines)
+            skip_until = start + len(backlog) - 1
+            await websocket.send_json({"type": "hello", "running": True, "managed": True, "pid": proc.pid})
+            if backlog:
+                await websocket.send_json({"type": "lines", "seq": start, "lines": backlog})
+        else:
+            pid = get_server_proc(servername)
+            log_path = get_server_log_path(servername)
+            await websocket.send_json({"type": "hello", "running": bool(pid), "managed": False, "pid": pid})
+            if pid:
+                # Nicht vom Supervisor gestartet (Backend-Neustart): Logdatei verfolgen
+                tasks.append(asyncio.create_task(_follow_log(log_path, lines, stream)))
+            else:
+                backlog = await anyio.to_thread.run_sync(log_reader.tail, log_path, lines)
+                if backlog:
+                    await websocket.send_json({"type": "lines", "seq": None, "lines": backlog.splitlines(keepends=True)})
+        tasks.append(asyncio.create_task(_receive_console_commands(websocket, servername, stream)))
+        while True:
+            batch = asyncio.ensure_future(stream.next_batch())
+            done, _ = await asyncio.wait({batch, tasks[-1]}, return_when=asyncio.FIRST_COMPLETED)
+            if batch not in done:
+                batch.cancel()
+                break
+            items, dropped = batch.result()
+            fresh = []
+            for item in items:
+                if item[0] == "event" and item[1]["type"] == "started":
+                    skip_until = 0
+                elif item[0] == "line" and item[1] is not None and item[1] <= skip_until:
+                    continue
+                fresh.append(item)
+            if dropped:
+                # Backpressure: Client war zu langsam, älteste Zeilen verworfen
+                await websocket.send_json({"type": "dropped", "count": dropped})
+            for message in group_lines(fresh):
+                await websocket.send_json(message)
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        supervisor.unsubscribe_console(servername, on_console)
+        for task in tasks:
+            task.cancel()
+
+async def _follow_log(log_path: str, lines: int, stream: ConsoleStream, interval: float = 1.0):
+    cursor = LogCursor(log_path, start_lines=lines)
+    while True:
+        new_lines, _ = await anyio.to_thread.run_sync(cursor.read_new)
+        for line in new_lines:
+            stream.push(("line", None, line))
+        await asyncio.sleep(interval)
+
+async def _receive_console_commands(websocket: WebSocket, servername: str, stream: ConsoleStream):
+    """Liest Befehle vom Client; endet, wenn der Client die Verbindung schließt"""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+        text = message.get("text")
+        if not text:
+            continue
+        try:
+            data = json.loads(text)
+            command = data.get("command", "") if isinstance(data, dict) else ""
+        except ValueError:
+            command = text
+        command = command.strip().lstrip("/")
+        if not command:
+            continue
+        ok = await anyio.to_thread.run_sync(send_console_command, servername, command)
+        stream.push(("event", {"type": "command", "command": command, "ok": ok}))
+
+@router.get("/server/metrics")
+def get_server_metrics(
+    servername: str,
+    metrics: str = None,
+    start: float = None,
+    end: float = None,
+    seconds: int = Query(3600, alias="range"),
+    points: int = 500,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Verlauf aus dem Metrics-Store: gemeinsame Zeitstempel plus eine Werteliste pro Metrik.
+    metrics: kommagetrennt (Standard: alle), Zeitraum per start/end oder range (Sekunden).
+    """
+    if not os.path.exists(safe_server_path(servername)):
+        raise HTTPException(status_code=404, detail="Server not found")
+    names = [m.strip() for m in metrics.split(",") if m.strip()] if metrics else METRICS
+    unknown = [m for m in names if m not in METRICS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown metrics: {', '.join(unknown)}. Available: {', '.join(METRICS)}")
+    end = end or time.time()
+    start = start if start is not None else end - seconds
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    points = max(10, min(points, 5000))
+    return metrics_store.query(servername, names, start, end, max_points=points)
+
+# API: Tick-Events (anhaltender Lag / Erholung), optional pro Server und ab einer Event-ID
+@router.get("/server/events")
+def get_server_events(servername: str = None, since: int = 0, limit: int = 100,
+                      current_user: dict = Depends(get_current_user)):
+    if servername and not os.path.exists(safe_server_path(servername)):
+        raise HTTPException(status_code=404, detail="Server not found")
+    events = tick_monitor.get_events(servername, since, max(1, min(limit, 1000)))
+    return {"events": events, "last_id": events[-1]["id"] if events else since}
+
 @router.get("/server/playercount")
 def get_player_count(servername: str, current_user: dict = Depends(get_current_user)):
-    log_path = safe_server_path(servername, "logs", "latest.log")
-    if not os.path.exists(log_path):
-        log_path = safe_server_path(servername, "server.log")
     # max_players aus server.properties
-    prop_path = safe_server_path(servername, "server.properties")
-    max_players = 0
-    if os.path.exists(prop_path):
-        with open(prop_path, "r") as f:
-            for line in f:
-                if line.strip().startswith("max-players="):
-                    try:
-                        max_players = int(line.strip().split("=", 1)[1])
-                    except Exception:
-                        max_players = 0
-                    break
-    player_set = set()
-    if os.path.exists(log_path):
-        try:
-            import re
-            with open(log_path, "r", encoding="utf-8", errors="ignore") as f:
-                lines = f.readlines()[-500:]
-            for line in lines:
-                m = re.search(r"INFO\]: (?:\\u001b\[[^m]+m)?([A-Za-z0-9_]+) joined the game", line)
-                if m:
-                    player_set.add(m.group(1))
-                m2 = re.search(r"INFO\]: (?:\\u001b\[[^m]+m)?([A-Za-z0-9_]+) left the game", line)
-                if m2:
-                    player_set.discard(m2.group(1))
-        except Exception:
-            pass
-    player_count = len(player_set)
+    try:
+        max_players = int(get_server_property(servername, "max-players", "0"))
+    except ValueError:
+        max_players = 0
+    player_count = player_tracker.get_count(servername)
     return {"player_count": player_count, "max_players": max_players}
 
+@router.get("/server/players/online")
+def get_online_players(servername: str, current_user: dict = Depends(get_current_user)):
+    if not os.path.exists(safe_server_path(servername)):
+        raise HTTPException(status_code=404, detail="Server not found")
+    players = player_tracker.get_players(servername)
+    return {"players": [
+        {"name": name, "joined": int(joined), "online_seconds": int(time.time() - joined)}
+        for name, joined in sorted(players.items(), key=lambda item: item[1])
+    ]}
+
 @router.get("/server/players")
 def get_players(servername: str, current_user: dict = Depends(get_current_user)):
     usercache_path = safe_server_path(servername, "usercache.json")
@@ -485,14 +719,46 @@ import logging
 def get_pid_file(servername: str):
     return safe_server_path(servername, "mcserver.pid")
 
+def _remove_pid_file_on_exit(proc):
+    """Supervisor exit hook: drop the PID file of a JVM that is gone (crash or stop)"""
+    try:
+        pid_file = get_pid_file(proc.name)
+        with open(pid_file, "r") as f:
+            if int(f.read().strip()) == proc.pid:
+                os.remove(pid_file)
+    except Exception:
+        pass
+
+supervisor.exit_listeners.append(_remove_pid_file_on_exit)
+supervisor.exit_listeners.append(lambda proc: cds_manager.on_exit(proc.name, proc.returncode))
+# Status-Wechsel sofort an die WebSocket-Clients pushen
+supervisor.exit_listeners.append(lambda proc: overview_collector.request_refresh())
+
+def _release_cpus_on_exit(proc):
+    """Supervisor exit hook: free the cores of the server and spread the others onto them"""
+    if cpu_allocator.release_cpus(proc.name):
+        for name, cores in cpu_allocator.rebalance().items():
+            running = supervisor.get(name)
+            if running:
+                apply_affinity(running.pid, cores)
+
+supervisor.exit_listeners.append(_release_cpus_on_exit)
+supervisor.exit_listeners.append(lambda proc: rcon_pool.forget(proc.name))
+supervisor.exit_listeners.append(lambda proc: tick_monitor.forget(proc.name))
+
 def get_server_proc(servername: str):
+    proc = supervisor.get(servername)
+    if proc:
+        return proc.pid
+    # Fallback: JVM, die noch von einer früheren Backend-Instanz läuft
     pid_file = get_pid_file(servername)
     if not os.path.exists(pid_file):
         return None
     try:
         with open(pid_file, "r") as f:
             pid = int(f.read().strip())
-        os.kill(pid, 0)
+        if "java" not in psutil.Process(pid).name():
+            return None
         return pid
     except Exception:
         return None
@@ -528,34 +794,100 @@ logging.basicConfig(
 
 
 
-def get_tmux_session(servername: str):
-    return f"mc_{servername}"
+def get_server_log_path(servername: str) -> str:
+    """logs/latest.log des Servers, server.log (Supervisor-Konsole) als Fallback"""
+    log_path = safe_server_path(servername, "logs", "latest.log")
+    if not os.path.exists(log_path):
+        log_path = safe_server_path(servername, "server.log")
+    return log_path
 
-def get_server_ram(servername: str) -> str:
-    """Get RAM setting for server, default to 2048MB"""
+def get_server_config(servername: str) -> dict:
+    """Read server.config (key=value per line)"""
     config_path = safe_server_path(servername, "server.config")
-    default_ram = "2048"
+    config = {}
     if os.path.exists(config_path):
         try:
             with open(config_path, "r") as f:
                 for line in f:
-                    if line.strip().startswith("ram="):
-                        return line.strip().split("=", 1)[1]
+                    line = line.strip()
+                    if "=" in line and not line.startswith("#"):
+                        key, value = line.split("=", 1)
+                        config[key.strip()] = value.strip()
         except Exception:
             pass
-    return default_ram
+    return config
 
-def save_server_config(servername: str, ram: str, port: str = None):
-    """Save server configuration"""
+def get_server_ram(servername: str) -> str:
+    """Get RAM setting for server, default to 2048MB"""
+    return get_server_config(servername).get("ram", "2048")
+
+def save_server_config(servername: str, ram: str = None, port: str = None, **values):
+    """Save server configuration, keeping all keys that are not updated"""
     config_path = safe_server_path(servername, "server.config")
+    config = get_server_config(servername)
+    if ram:
+        config["ram"] = ram
+    if port:
+        config["port"] = port
+    for key, value in values.items():
+        if value is None:
+            config.pop(key, None)
+        else:
+            config[key] = str(value)
     try:
         with open(config_path, "w") as f:
-            f.write(f"ram={ram}\n")
-            if port:
-                f.write(f"port={port}\n")
+            for key, value in config.items():
+                f.write(f"{key}={value}\n")
     except Exception as e:
         logging.error(f"Failed to save config for {servername}: {e}")
 
+def get_server_java_command(servername: str) -> list:
+    """Launch command from ram=, jvm_profile= and jvm_flags= in server.config"""
+    config = get_server_config(servername)
+    return build_java_command(
+        config.get("ram", "2048"),
+        config.get("jvm_profile", DEFAULT_PROFILE),
+        config.get("jvm_flags", ""),
+    )
+
+def get_server_log_options(servername: str) -> dict:
+    """server.log rotation/retention from server.config (log_max_mb, log_rotate_hours,
+    log_retention_days, log_max_segments); missing or invalid values keep the defaults"""
+    config = get_server_config(servername)
+    options = {}
+    for key, option, scale in (("log_max_mb", "max_bytes", 1024 * 1024), ("log_rotate_hours", "max_age", 3600),
+                               ("log_retention_days", "retention_days", 1), ("log_max_segments", "max_segments", 1)):
+        try:
+            value = float(config[key])
+        except (KeyError, ValueError):
+            continue
+        if value > 0:
+            options[option] = int(value * scale) if option in ("max_bytes", "max_segments") else value * scale
+    return options
+
+def _allocate_server_cpus(servername: str):
+    """CPU set for cpus= in server.config (None = not pinned)"""
+    try:
+        count = int(get_server_config(servername).get("cpus", "0"))
+    except ValueError:
+        count = 0
+    if count <= 0:
+        return None
+    cpu_allocator.release_stale(
+        name for name in get_all_servernames() if name == servername or get_server_proc(name)
+    )
+    return cpu_allocator.allocate_cpus(servername, count)
+
+def get_server_property(servername: str, key: str, default: str = None):
+    """Read a single value from server.properties"""
+    return properties_store.get(safe_server_path(servername, "server.properties"), key, default)
+
+def _config_float(config: dict, key: str, default: float) -> float:
+    try:
+        return float(config[key])
+    except (KeyError, ValueError):
+        return default
+
 def get_used_ports():
     """Get all ports currently used by existing servers"""
     used_ports = set()
@@ -569,17 +901,12 @@ def get_used_ports():
         if not os.path.isdir(server_path):
             continue
             
-        props_path = os.path.join(server_path, "server.properties")
-        if os.path.exists(props_path):
-            try:
-                with open(props_path, "r") as f:
-                    for line in f:
-                        if line.strip().startswith("server-port="):
-                            port = int(line.strip().split("=", 1)[1])
-                            used_ports.add(port)
-                            break
-            except Exception:
-                pass
+        try:
+            port = properties_store.get(os.path.join(server_path, "server.properties"), "server-port")
+            if port is not None:
+                used_ports.add(int(port))
+        except Exception:
+            pass
     return used_ports
 
 def find_free_port(start_port: int = 25565, max_attempts: int = 1000):
@@ -617,30 +944,7 @@ def find_free_port(start_port: int = 25565, max_attempts: int = 1000):
 
 def set_server_port(servername: str, port: int):
     """Set the port in server.properties"""
-    props_path = safe_server_path(servername, "server.properties")
-    
-    # Read existing properties or create default ones
-    lines = []
-    port_set = False
-    
-    if os.path.exists(props_path):
-        with open(props_path, "r") as f:
-            lines = f.readlines()
-        
-        # Update existing port line
-        for i, line in enumerate(lines):
-            if line.strip().startswith("server-port="):
-                lines[i] = f"server-port={port}\n"
-                port_set = True
-                break
-    
-    # If port wasn't found in existing properties, add it
-    if not port_set:
-        lines.append(f"server-port={port}\n")
-    
-    # Write back to file
-    with open(props_path, "w") as f:
-        f.writelines(lines)
+    set_properties(servername, {"server-port": str(port)})
 
 @router.get("/server/ports/check")
 def check_port_availability(port: int = 25565, current_user: dict = Depends(get_current_user)):
@@ -705,6 +1009,24 @@ def start_server_internal(servername: str, current_user: dict):
     if get_server_proc(servername):
         return {"status": "already running"}
     
+    # Vor dem Lock prüfen: frühe Returns dürfen kein start.lock hinterlassen
+    jar_path = safe_server_path(servername, "purpur.jar")
+    base_path = safe_server_path(servername)
+    pid_file = get_pid_file(servername)
+    log_file = safe_server_path(servername, "server.log")
+    if not os.path.exists(jar_path):
+        logging.error(f"purpur.jar fehlt für {servername}!")
+        return JSONResponse(status_code=500, content={"error": "purpur.jar fehlt!"})
+    try:
+        # Ältere Server: RCON nachträglich einrichten (wirkt ab diesem Start)
+        ensure_rcon_properties(servername)
+    except OSError as e:
+        logging.warning(f"RCON: could not update server.properties of {servername}: {e}")
+    try:
+        command = get_server_java_command(servername)
+    except JvmProfileError as e:
+        logging.error(f"Invalid JVM configuration for {servername}: {e}")
+        return JSONResponse(status_code=400, content={"error": str(e)})
     try:
         # Ensure the server directory exists and has proper permissions
         os.makedirs(server_dir, exist_ok=True)
@@ -713,67 +1035,44 @@ def start_server_internal(servername: str, current_user: dict):
     except Exception as e:
         logging.error(f"Could not create start lock for {servername}: {e}")
         return JSONResponse(status_code=500, content={"error": "Could not create start lock."})
-    jar_path = safe_server_path(servername, "purpur.jar")
-    base_path = safe_server_path(servername)
-    pid_file = get_pid_file(servername)
-    log_file = safe_server_path(servername, "server.log")
-    if not os.path.exists(jar_path):
-        logging.error(f"purpur.jar fehlt für {servername}!")
-        return JSONResponse(status_code=500, content={"error": "purpur.jar fehlt!"})
-    session = get_tmux_session(servername)
-    ram_mb = get_server_ram(servername)
     try:
-        # Starte Java in tmux und leite stdout/stderr in server.log um
-        result = subprocess.run([
-            "tmux", "new-session", "-d", "-s", session, "sh", "-c", f"java -Xmx{ram_mb}M -jar purpur.jar nogui > server.log 2>&1"
-        ], cwd=base_path, capture_output=True, text=True)
-        if result.returncode != 0:
-            logging.error(f"tmux/java Fehler (rc={result.returncode}):\nSTDOUT:\n{result.stdout}\nSTDERR:\n{result.stderr}")
-            if os.path.exists(lock_file):
-                os.remove(lock_file)
-            return JSONResponse(status_code=500, content={"error": f"tmux/java Fehler: {result.stderr}"})
-        out = subprocess.check_output([
-            "tmux", "list-panes", "-t", session, "-F", "#{pane_pid}"
-        ], cwd=base_path)
-        pid = int(out.decode().strip())
+        # Schlafender Server: Port freigeben, bevor die JVM ihn bindet
+        hibernation_manager.release(servername)
+        command = cds_manager.prepare_command(servername, command, jar_path)
+        cpus = _allocate_server_cpus(servername)
+        if cpus:
+            command = cpu_allocator.pin_command(command, cpus)
+        # Java direkt unter dem Supervisor starten, Konsole landet in server.log
+        proc = supervisor.start(
+            servername,
+            command,
+            cwd=base_path,
+            log_path=log_file,
+            restart_fn=lambda: start_server_internal(servername, None),
+            listeners=[lambda line: cds_manager.on_console_line(servername, line)],
+            log_options=get_server_log_options(servername),
+        )
+        if cpus and command[0] != "taskset":
+            apply_affinity(proc.pid, cpus)
         with open(pid_file, "w") as f:
-            f.write(str(pid))
-        logging.info(f"Server {servername} gestartet (PID {pid})")
-
-        # Warte auf das letzte "Done" im Log (max 60s)
-        done_found = False
-        done_count = 0
-        max_wait = 60
-        waited = 0
-        last_done_line = -1
-        while waited < max_wait:
-            if not os.path.exists(log_file):
-                time.sleep(1)
-                waited += 1
-                continue
-            with open(log_file, "r", encoding="utf-8", errors="ignore") as f:
-                lines = f.readlines()
-            # Suche alle Zeilen mit "Done ("
-            done_lines = [i for i, line in enumerate(lines) if "Done (" in line]
-            if done_lines:
-                # Wenn es neue "Done"-Zeilen gibt, merke dir die letzte
-                if last_done_line != done_lines[-1]:
-                    last_done_line = done_lines[-1]
-                    done_count = len(done_lines)
-                # Prüfe, ob nach dem letzten "Done" noch weitere Server-Output-Zeilen kamen (z.B. "You can now connect")
-                # oder ob der Server wirklich bereit ist (optional: weitere Checks)
-                # Wir nehmen an: Wenn "Done (" das letzte relevante ist, ist der Server bereit
-                done_found = True
-                break
-            time.sleep(1)
-            waited += 1
-        if done_found:
+            f.write(str(proc.pid))
+        logging.info(f"Server {servername} gestartet (PID {proc.pid})")
+        overview_collector.request_refresh()
+
+        # Warte auf "Done (" in der Konsole (max 60s)
+        if proc.wait_ready(60):
+            overview_collector.request_refresh()
             status = "started"
+        elif proc.exited.is_set():
+            logging.error(f"Server {servername} exited during startup (code {proc.returncode})")
+            return JSONResponse(status_code=500, content={"error": f"Server exited during startup (code {proc.returncode})"})
         else:
             status = "booting"  # Timeout, aber Prozess läuft
         return {"status": status}
     except Exception as e:
         logging.error(f"Fehler beim Starten von {servername}: {e}")
+        if not supervisor.get(servername):
+            cds_manager.on_exit(servername, None)
         return JSONResponse(status_code=500, content={"error": str(e)})
     finally:
         if os.path.exists(lock_file):
@@ -789,41 +1088,114 @@ def system_health(current_user: dict = Depends(get_current_user)):
     except Exception as e:
         java_ok = False
         java_version = str(e)
-    # Check tmux
-    try:
-        tmux_out = subprocess.check_output(["tmux", "-V"])
-        tmux_ok = True
-        tmux_version = tmux_out.decode(errors="ignore").strip()
-    except Exception as e:
-        tmux_ok = False
-        tmux_version = str(e)
     # Check mc_servers dir
     mc_dir = "/app/mc_servers"
     mc_dir_exists = os.path.exists(mc_dir)
     mc_dir_writable = os.access(mc_dir, os.W_OK) if mc_dir_exists else False
     return {
         "java": {"ok": java_ok, "version": java_version},
-        "tmux": {"ok": tmux_ok, "version": tmux_version},
+        "supervisor": {"managed_servers": sorted(n for n in supervisor.processes if supervisor.get(n))},
         "mc_servers": {"exists": mc_dir_exists, "writable": mc_dir_writable}
     }
 
-@router.post("/server/stop")
-def stop_server(servername: str, current_user: dict = Depends(get_current_user)):
-    session = get_tmux_session(servername)
-    pid = get_server_proc(servername)
+def send_console_command(servername: str, command: str) -> bool:
+    """Write a command to the server console (stdin of the JVM)"""
+    return supervisor.send_command(servername, command)
+
+def ensure_rcon_properties(servername: str, new_password: bool = False):
+    """enable-rcon, rcon.port (game port + 1000) and rcon.password for the RCON pool"""
+    props = _read_properties(servername)
+    try:
+        port = int(props.get("server-port", "25565"))
+    except ValueError:
+        logging.warning(f"RCON: invalid server-port for {servername}, not provisioning RCON")
+        return
+    password = None if new_password else props.get("rcon.password") or None
+    set_properties(servername, rcon_properties(port, password))
+
+def get_rcon_settings(servername: str):
+    """(rcon port, password) from server.properties, None if RCON is disabled"""
+    props = _read_properties(servername)
+    if props.get("enable-rcon") != "true" or not props.get("rcon.password"):
+        return None
+    try:
+        return int(props.get("rcon.port", "25575")), props["rcon.password"]
+    except ValueError:
+        return None
+
+def _cleanup_server_session(servername: str):
     pid_file = get_pid_file(servername)
+    if os.path.exists(pid_file):
+        os.remove(pid_file)
+        logging.info(f"Stop: Removed PID file for {servername}")
+
+def shutdown_server(servername: str) -> dict:
+    """
+    Stoppt den Server sauber: `stop` in die Konsole, auf das Prozessende warten,
+    danach Eskalation auf SIGTERM/SIGKILL (Timeouts aus server.config oder Env).
+    """
+    pid = get_server_proc(servername)
     if not pid:
         logging.info(f"Stop: Server {servername} is not running.")
         return {"status": "not running"}
+    config = get_server_config(servername)
+    stop_timeout = _config_float(config, "stop_timeout", DEFAULT_STOP_TIMEOUT)
+    term_timeout = _config_float(config, "term_timeout", DEFAULT_TERM_TIMEOUT)
+    logging.info(f"Stop: Stopping server {servername} (PID {pid}, timeouts {stop_timeout}s/{term_timeout}s)")
+    started = time.monotonic()
+    if supervisor.get(servername):
+        outcome = supervisor.stop(servername, stop_timeout=stop_timeout, term_timeout=term_timeout)
+    else:
+        # Nicht vom Supervisor gestartet: keine Konsole, direkt SIGTERM
+        outcome = graceful_stop(pid, lambda: False, stop_timeout=stop_timeout, term_timeout=term_timeout)
+    _cleanup_server_session(servername)
+    duration = round(time.monotonic() - started, 2)
+    logging.info(f"Stop: Server {servername} {outcome} after {duration}s")
+    return {"status": "stopped", "shutdown": outcome, "duration": duration}
+
+def shutdown_all_servers():
+    """Stop all running servers in parallel (backend shutdown)"""
+    running = [name for name in get_all_servernames() if get_server_proc(name)]
+    if not running:
+        return []
+    logging.info(f"Shutting down {len(running)} server(s): {', '.join(running)}")
+    with ThreadPoolExecutor(max_workers=len(running), thread_name_prefix="shutdown") as pool:
+        return list(pool.map(shutdown_server, running))
+
+@router.get("/system/cds")
+def get_cds_archives(current_user: dict = Depends(get_current_user)):
+    """AppCDS archives per jar checksum"""
+    return {"enabled": cds_manager.enabled, "archives": cds_manager.list_archives()}
+
+# API: Konsolenbefehl per RCON ausführen und die Antwort zurückgeben
+@router.post("/server/command")
+def run_server_command(
+    servername: str,
+    command: str = Body(default=None, embed=True),
+    commands: list[str] = Body(default=None, embed=True),
+    timeout: float = Body(default=None, embed=True),
+    current_user: dict = Depends(get_current_user)
+):
+    """Ein Befehl (command) oder mehrere (commands, nacheinander über eine Verbindung)"""
+    batch = commands if commands else [command] if command else []
+    batch = [c.strip().lstrip("/") for c in batch if c and c.strip()]
+    if not batch:
+        raise HTTPException(status_code=400, detail="No command given")
+    if not get_server_proc(servername):
+        raise HTTPException(status_code=409, detail="Server is not running")
     try:
-        logging.info(f"Stop: Killing tmux session {session} for server {servername} (PID {pid})")
-        subprocess.run(["tmux", "kill-session", "-t", session], check=True)
-        if os.path.exists(pid_file):
-            os.remove(pid_file)
-            logging.info(f"Stop: Removed PID file for {servername}")
-        else:
-            logging.info(f"Stop: No PID file found for {servername}")
-        return {"status": "stopped"}
+        responses = rcon_pool.execute_many(servername, batch, timeout or DEFAULT_RCON_TIMEOUT)
+    except RconError as e:
+        logging.warning(f"RCON command for {servername} failed: {e}")
+        raise HTTPException(status_code=502, detail=str(e))
+    if commands:
+        return {"responses": [{"command": c, "response": r} for c, r in zip(batch, responses)]}
+    return {"command": batch[0], "response": responses[0]}
+
+@router.post("/server/stop")
+def stop_server(servername: str, current_user: dict = Depends(get_current_user)):
+    try:
+        return shutdown_server(servername)
     except Exception as e:
         logging.error(f"Stop: Error stopping server {servername}: {e}")
         return JSONResponse(status_code=500, content={"error": str(e)})
@@ -832,6 +1204,8 @@ def stop_server(servername: str, current_user: dict = Depends(get_current_user))
 def server_status(servername: str, current_user: dict = Depends(get_current_user)):
     if get_server_proc(servername):
         return {"status": "running"}
+    if hibernation_manager.is_sleeping(servername):
+        return {"status": "sleeping"}
     return {"status": "stopped"}
 
 @router.get("/system/ram")
@@ -849,8 +1223,7 @@ def restart_server(servername: str, current_user: dict = Depends(get_current_use
     if stop_response["status"] != "stopped":
         logging.warning(f"Restart: Stop failed or not running for {servername}: {stop_response}")
         return stop_response
-    # Warte 2 Sekunden, damit Prozess wirklich beendet ist
-    time.sleep(2)
+    # stop_server kehrt erst zurück, wenn der Prozess wirklich beendet ist
     logging.info(f"Restart: Starting server {servername}")
     start_response = start_server_internal(servername, current_user)
     if start_response.get("status") != "started":
@@ -859,6 +1232,133 @@ def restart_server(servername: str, current_user: dict = Depends(get_current_use
     logging.info(f"Restart: Server {servername} restarted successfully.")
     return {"status": "restarted"}
 
+def get_all_servernames() -> list:
+    """Names of all server directories"""
+    mc_servers_dir = os.environ.get("MC_SERVERS_DIR", os.path.join(os.getcwd(), "mc_servers"))
+    if not os.path.exists(mc_servers_dir):
+        return []
+    return sorted(
+        d for d in os.listdir(mc_servers_dir)
+        if is_valid_servername(d) and os.path.isdir(os.path.join(mc_servers_dir, d))
+    )
+
+def _lifecycle_outcome(response) -> dict:
+    """Normalize dict/JSONResponse results of the lifecycle functions"""
+    if isinstance(response, JSONResponse):
+        import json
+        body = json.loads(response.body)
+        return {"status": "error", "error": body.get("error", body)}
+    return response
+
+def _ram_mb(servername: str) -> int:
+    try:
+        return int(get_server_ram(servername))
+    except ValueError:
+        return 2048
+
+@router.post("/server/bulk/start")
+def bulk_start_servers(
+    servers: list[str] = Body(default=None, embed=True),
+    parallel: int = Body(default=None, embed=True),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Startet mehrere Server parallel (begrenzt) mit RAM-Admission-Control.
+    Ohne `servers` werden alle gestoppten Server gestartet.
+    """
+    names = servers or [name for name in get_all_servernames() if not get_server_proc(name)]
+    for name in names:
+        if not os.path.exists(safe_server_path(name)):
+            raise HTTPException(status_code=404, detail=f"Server not found: {name}")
+    results = fleet_manager.bulk_start(
+        names,
+        start_fn=lambda name: _lifecycle_outcome(start_server_internal(name, current_user)),
+        ram_fn=_ram_mb,
+        is_running_fn=lambda name: bool(get_server_proc(name)),
+        parallel=parallel,
+    )
+    return {"results": results}
+
+@router.post("/server/bulk/stop")
+def bulk_stop_servers(
+    servers: list[str] = Body(default=None, embed=True),
+    parallel: int = Body(default=None, embed=True),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Stoppt mehrere Server parallel. Ohne `servers` werden alle laufenden Server gestoppt.
+    """
+    names = servers or [name for name in get_all_servernames() if get_server_proc(name)]
+    for name in names:
+        if not os.path.exists(safe_server_path(name)):
+            raise HTTPException(status_code=404, detail=f"Server not found: {name}")
+    results = fleet_manager.bulk_stop(
+        names,
+        stop_fn=lambda name: _lifecycle_outcome(stop_server(name, current_user)),
+        parallel=parallel,
+    )
+    return {"results": results}
+
+def get_server_tags(servername: str) -> set:
+    """tags= in server.config (kommagetrennt)"""
+    value = get_server_config(servername).get("tags", "")
+    return {tag.strip() for tag in value.split(",") if tag.strip()}
+
+def _broadcast_command(servername: str, command: str, timeout: float) -> dict:
+    if not get_server_proc(servername):
+        return {"status": "not running"}
+    if get_rcon_settings(servername):
+        return {"status": "ok", "response": rcon_pool.execute(servername, command, timeout)}
+    # Ohne RCON nur in die Konsole schreiben, eine Antwort gibt es dann nicht
+    if send_console_command(servername, command):
+        return {"status": "sent", "response": None}
+    return {"status": "error", "error": "RCON disabled and no console attached"}
+
+@router.post("/server/broadcast")
+def broadcast_command(
+    command: str = Body(..., embed=True),
+    servers: list[str] = Body(default=None, embed=True),
+    tag: str = Body(default=None, embed=True),
+    parallel: int = Body(default=None, embed=True),
+    timeout: float = Body(default=None, embed=True),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Sendet einen Konsolenbefehl parallel an mehrere Server: `servers` (Namen),
+    `tag` (tags= in server.config) oder ohne Auswahl an alle laufenden Server.
+    Antworten kommen als NDJSON, sobald der jeweilige Server fertig ist;
+    die letzte Zeile fasst zusammen.
+    """
+    command = command.strip().lstrip("/")
+    if not command:
+        raise HTTPException(status_code=400, detail="No command given")
+    if servers:
+        names = list(dict.fromkeys(servers))
+        for name in names:
+            if not os.path.exists(safe_server_path(name)):
+                raise HTTPException(status_code=404, detail=f"Server not found: {name}")
+    elif tag:
+        names = [name for name in get_all_servernames() if tag in get_server_tags(name)]
+    else:
+        names = [name for name in get_all_servernames() if get_server_proc(name)]
+    timeout = timeout or DEFAULT_RCON_TIMEOUT
+    logging.info(f"Broadcast to {len(names)} server(s): {command}")
+
+    def stream():
+        started = time.monotonic()
+        counts = {}
+        for result in fleet_manager.broadcast(
+            names,
+            send_fn=lambda name: _broadcast_command(name, command, timeout),
+            parallel=parallel,
+        ):
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+            yield json.dumps(result) + "\n"
+        yield json.dumps({"done": True, "servers": len(names), "results": counts,
+                          "duration": round(time.monotonic() - started, 3)}) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
 @router.post("/server/create_and_start")
 def create_and_start_server(
     background_tasks: BackgroundTasks,
@@ -941,92 +1441,33 @@ def create_and_start_server(
         logging.error(f"Failed to save RAM config: {e}")
         raise HTTPException(status_code=500, detail="Failed to save RAM config.")
 
-    # 7. Initial-Run für EULA-Generierung
-    eula_path = safe_server_path(servername, "eula.txt")
+    # 7. eula.txt und server.properties aus Template schreiben (kein Initial-Run der JVM)
     try:
-        logging.info(f"Starting initial run for server {servername} with {ram}MB RAM on port {port}")
-        process = subprocess.Popen([
-            "java", f"-Xmx{ram}M", "-jar", "purpur.jar", "nogui"
-        ], cwd=base_path, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        import time
-        time.sleep(10)
-        try:
-            process.stdin.write("stop\n")
-            process.stdin.flush()
-            process.wait(timeout=10)
-            logging.info(f"Initial run completed gracefully for {servername}")
-        except Exception:
-            process.kill()
-            process.wait()
-            logging.info(f"Initial run force-killed for {servername}")
-        
-        # 8. Port in server.properties setzen
-        try:
-            set_server_port(servername, port)
-            logging.info(f"Set port {port} for server {servername}")
-        except Exception as e:
-            logging.error(f"Failed to set port for {servername}: {e}")
-            raise HTTPException(status_code=500, detail="Failed to set server port")
-        
-        # 9. HAProxy Konfiguration aktualisieren
-        try:
-            proxy_success, allocated_port = proxy_manager.add_server_proxy(servername, port)
-            if proxy_success:
-                # Update port if it was changed by the allocator
-                if allocated_port != port:
-                    port = allocated_port
-                    # Update server.properties with the actually allocated port
-                    set_server_port(servername, port)
-                    logging.info(f"Updated server.properties with allocated port {port}")
-                
-                logging.info(f"Added HAProxy configuration for {servername} on port {allocated_port}")
-            else:
-                logging.warning(f"Failed to add HAProxy configuration for {servername}")
-                # Don't fail the entire operation, but log the issue
-        except Exception as e:
-            logging.warning(f"HAProxy configuration failed for {servername}: {e}")
-            # Dies ist nicht kritisch für die Server-Erstellung
-        
-        # 10. EULA automatisch akzeptieren wenn gewünscht
-        if accept_eula:
-            if not os.path.exists(eula_path):
-                with open(eula_path, "w") as f:
-                    f.write("#By changing the setting below to TRUE you are indicating your agreement to our EULA (https://account.mojang.com/documents/minecraft_eula).\n")
-                    f.write("#Mon Jan 01 00:00:00 UTC 2024\n")
-                    f.write("eula=true\n")
-                logging.info(f"Created and accepted EULA file for {servername}")
-            else:
-                # EULA auf true setzen
-                with open(eula_path, "r") as f:
-                    lines = f.readlines()
-                with open(eula_path, "w") as f:
-                    for line in lines:
-                        if line.startswith("eula="):
-                            f.write("eula=true\n")
-                        else:
-                            f.write(line)
-                logging.info(f"Accepted EULA for {servername}")
-        else:
-            # EULA-Datei erstellen aber nicht akzeptieren
-            if not os.path.exists(eula_path):
-                with open(eula_path, "w") as f:
-                    f.write("#By changing the setting below to TRUE you are indicating your agreement to our EULA (https://account.mojang.com/documents/minecraft_eula).\n")
-                    f.write("#Mon Jan 01 00:00:00 UTC 2024\n")
-                    f.write("eula=false\n")
-                logging.info(f"Created EULA file for {servername} (not accepted)")
+        provision_server(base_path, purpur_url, port, accept_eula)
     except Exception as e:
-        logging.error(f"Initial run/EULA error: {e}")
-        if not accept_eula:
-            return JSONResponse(content={
-                "message": "Server created successfully. Please accept the EULA manually.",
-                "server_name": servername,
-                "port": port,
-                "eula_required": True
-            })
+        logging.error(f"Provisioning error for {servername}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to initialize server")
+
+    # 8. HAProxy Konfiguration aktualisieren
+    try:
+        proxy_success, allocated_port = proxy_manager.add_server_proxy(servername, port)
+        if proxy_success:
+            # Update port if it was changed by the allocator
+            if allocated_port != port:
+                port = allocated_port
+                # Update server.properties with the actually allocated port
+                set_server_port(servername, port)
+                logging.info(f"Updated server.properties with allocated port {port}")
+
+            logging.info(f"Added HAProxy configuration for {servername} on port {allocated_port}")
         else:
-            raise HTTPException(status_code=500, detail="Failed to initialize server")
+            logging.warning(f"Failed to add HAProxy configuration for {servername}")
+            # Don't fail the entire operation, but log the issue
+    except Exception as e:
+        logging.warning(f"HAProxy configuration failed for {servername}: {e}")
+        # Dies ist nicht kritisch für die Server-Erstellung
 
-    # 10. Server starten wenn EULA akzeptiert wurde
+    # 9. Server starten wenn EULA akzeptiert wurde
     if accept_eula:
         try:
             start_result = start_server_internal(servername, current_user)
@@ -1127,42 +1568,12 @@ def create_server(
         logging.error(f"Failed to save RAM config: {e}")
         raise HTTPException(status_code=500, detail="Failed to save RAM config.")
 
-    # 5. Initial-Run für EULA-Generierung
-    eula_path = safe_server_path(servername, "eula.txt")
+    # 5. eula.txt und server.properties aus Template schreiben (kein Initial-Run der JVM)
     try:
-        logging.info(f"Starting initial run for server {servername} with {ram}MB RAM")
-        process = subprocess.Popen([
-            "java", f"-Xmx{ram}M", "-jar", "purpur.jar", "nogui"
-        ], cwd=base_path, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        import time
-        time.sleep(10)
-        try:
-            process.stdin.write("stop\n")
-            process.stdin.flush()
-            process.wait(timeout=10)
-            logging.info(f"Initial run completed gracefully for {servername}")
-        except Exception:
-            process.kill()
-            process.wait()
-            logging.info(f"Initial run force-killed for {servername}")
-        # EULA-Datei prüfen/erstellen
-        if not os.path.exists(eula_path):
-            with open(eula_path, "w") as f:
-                f.write("#By changing the setting below to TRUE you are indicating your agreement to our EULA (https://account.mojang.com/documents/minecraft_eula).\n")
-                f.write("#Mon Jan 01 00:00:00 UTC 2024\n")
-                f.write("eula=false\n")
-            logging.info(f"Created default EULA file for {servername}")
+        provision_server(base_path, purpur_url, port, accept_eula=False)
     except Exception as e:
-        logging.error(f"Initial run/EULA error: {e}")
-        # Fallback: EULA-Datei anlegen
-        try:
-            with open(eula_path, "w") as f:
-                f.write("#By changing the setting below to TRUE you are indicating your agreement to our EULA (https://account.mojang.com/documents/minecraft_eula).\n")
-                f.write("#Mon Jan 01 00:00:00 UTC 2024\n")
-                f.write("eula=false\n")
-            logging.info(f"Created fallback EULA file for {servername}")
-        except Exception as e2:
-            logging.error(f"Could not create fallback EULA: {e2}")
+        logging.error(f"Provisioning error for {servername}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to initialize server")
 
     # 6. Server starten (optional, Backend-Lösung)
     try:
@@ -1177,6 +1588,116 @@ def create_server(
         logging.error(f"Start error: {e}")
         return JSONResponse(content={"message": "Server created, but failed to start automatically. Please accept the EULA and start the server manually.", "port": port})
 
+@router.get("/server/templates")
+def list_templates(current_user: dict = Depends(get_current_user)):
+    """List all server templates"""
+    return {"templates": template_manager.list_templates()}
+
+@router.post("/server/templates/create")
+def create_template(
+    servername: str = Form(...),
+    template: str = Form(...),
+    include_world: bool = Form(default=False),
+    current_user: dict = Depends(get_current_user)
+):
+    """Snapshot an existing server (jar, plugins, configs, optional world) as a named template"""
+    server_dir = safe_server_path(servername)
+    if not os.path.exists(server_dir):
+        raise HTTPException(status_code=404, detail="Server not found")
+    if not is_valid_template_name(template):
+        raise HTTPException(status_code=400, detail="Invalid template name")
+    if include_world and get_server_proc(servername):
+        raise HTTPException(status_code=409, detail="Stop the server before including its world in a template")
+    try:
+        meta = template_manager.create_template(template, server_dir, include_world)
+    except FileExistsError:
+        raise HTTPException(status_code=409, detail="Template already exists")
+    except Exception as e:
+        logging.error(f"Failed to create template {template} from {servername}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to create template")
+    return {"message": f"Template {template} created", "template": meta}
+
+@router.delete("/server/templates/delete")
+def delete_template(template: str, current_user: dict = Depends(get_current_user)):
+    if not is_valid_template_name(template):
+        raise HTTPException(status_code=400, detail="Invalid template name")
+    if not template_manager.delete_template(template):
+        raise HTTPException(status_code=404, detail="Template not found")
+    return {"message": f"Template {template} deleted"}
+
+@router.post("/server/create_from_template")
+def create_server_from_template(
+    servername: str = Form(...),
+    template: str = Form(...),
+    ram: str = Form(default=None),
+    port: int = Form(default=None),
+    start: bool = Form(default=False),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Erstellt einen Server als Klon eines Templates. Nur Port, Name und Config werden neu geschrieben.
+    """
+    if not is_valid_servername(servername):
+        raise HTTPException(status_code=400, detail="Invalid servername")
+    if not is_valid_template_name(template) or template_manager.get_template(template) is None:
+        raise HTTPException(status_code=404, detail="Template not found")
+    if ram is not None:
+        try:
+            ram_int = int(ram)
+            if ram_int < 512 or ram_int > 8192:
+                raise HTTPException(status_code=400, detail="RAM must be between 512MB and 8192MB")
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid RAM value")
+
+    base_path = safe_server_path(servername)
+    if os.path.exists(base_path):
+        raise HTTPException(status_code=400, detail="Server already exists")
+
+    allocated_port = port_allocator.allocate_port(servername, port)
+    if allocated_port is None:
+        raise HTTPException(status_code=500, detail="No available ports for server creation")
+    port = allocated_port
+
+    try:
+        template_manager.clone_template(template, base_path)
+    except Exception as e:
+        logging.error(f"Failed to clone template {template} for {servername}: {e}")
+        port_allocator.deallocate_port(servername)
+        raise HTTPException(status_code=500, detail="Failed to clone template")
+
+    # Port, Name und Config neu schreiben
+    try:
+        set_server_port(servername, port)
+        set_property_in_properties(servername, "query.port", str(port))
+        # Eigenes RCON-Passwort statt dem der Vorlage
+        ensure_rcon_properties(servername, new_password=True)
+        save_server_config(servername, ram or get_server_ram(servername), str(port))
+    except Exception as e:
+        logging.error(f"Failed to rewrite config for {servername}: {e}")
+        # Halb konfigurierten Klon (Port und RCON-Passwort der Vorlage) nicht stehen lassen
+        port_allocator.deallocate_port(servername)
+        shutil.rmtree(base_path, ignore_errors=True)
+        properties_store.forget(base_path + os.sep)
+        raise HTTPException(status_code=500, detail="Failed to configure cloned server")
+
+    try:
+        proxy_success, proxy_port = proxy_manager.add_server_proxy(servername, port)
+        if proxy_success and proxy_port != port:
+            port = proxy_port
+            set_server_port(servername, port)
+            set_property_in_properties(servername, "query.port", str(port))
+        elif not proxy_success:
+            logging.warning(f"Failed to add HAProxy configuration for {servername}")
+    except Exception as e:
+        logging.warning(f"HAProxy configuration failed for {servername}: {e}")
+
+    logging.info(f"Server {servername} created from template {template} on port {port}")
+    response = {"message": f"Server created from template {template}", "server_name": servername, "port": port}
+    if start:
+        start_result = start_server_internal(servername, current_user)
+        response["status"] = start_result.get("status") if isinstance(start_result, dict) else "failed"
+    return response
+
 @router.post("/server/accept_eula")
 def accept_eula(servername: str = Form(...), current_user: dict = Depends(get_current_user)):
     # Check if server directory exists
@@ -1204,6 +1725,8 @@ def delete_server(servername: str, current_user: dict = Depends(get_current_user
     if not os.path.exists(base_path):
         raise HTTPException(status_code=404, detail="Server not found")
     
+    hibernation_manager.release(servername)
+
     # HAProxy Konfiguration entfernen
     try:
         proxy_success = proxy_manager.remove_server_proxy(servername)
@@ -1217,6 +1740,10 @@ def delete_server(servername: str, current_user: dict = Depends(get_current_user
     
     try:
         shutil.rmtree(base_path)
+        log_reader.forget(base_path + os.sep)
+        properties_store.forget(base_path + os.sep)
+        metrics_store.forget(servername)
+        rcon_pool.forget(servername)
         return { "message": f"Server '{servername}' deleted."}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting server: {e}")
@@ -1228,17 +1755,11 @@ def list_servers_full(current_user: dict = Depends(get_current_user)):
     if not os.path.exists(base_dir):
         return {"servers":[]}
     for d in os.listdir(base_dir):
-        if not os.path.isdir(os.path.join(base_dir, d)):
+        # Skip internal directories like .templates
+        if not is_valid_servername(d) or not os.path.isdir(os.path.join(base_dir, d)):
             continue
-        prop_path = safe_server_path(d, "server.properties")
-        port = "25565"
-        if os.path.exists(prop_path):
-            with open(prop_path, "r") as f:
-                for line in f:
-                    if line.strip().startswith("server-port="):
-                        port = line.strip().split("=", 1)[1]
-                        break
-        status = "running" if get_server_proc(d) else "stopped"
+        port = get_server_property(d, "server-port", "25565")
+        status = "running" if get_server_proc(d) else ("sleeping" if hibernation_manager.is_sleeping(d) else "stopped")
         servers.append({
             "name": d,
             "port": port,
@@ -1252,13 +1773,7 @@ def get_properties(servername: str, current_user: dict = Depends(get_current_use
     prop_path = safe_server_path(servername, "server.properties")
     if not os.path.exists(prop_path):
         raise HTTPException(status_code=404, detail="server.properties not found")
-    props = {}
-    with open(prop_path, "r") as f:
-        for line in f:
-            if "=" in line and not line.strip().startswith("#"):
-                k, v = line.strip().split("=", 1)
-                props[k] = v
-    return props
+    return properties_store.read(prop_path)
 
 @router.post("/server/properties/set")
 def set_property(
@@ -1270,29 +1785,58 @@ def set_property(
     prop_path = safe_server_path(servername, "server.properties")
     if not os.path.exists(prop_path):
         raise HTTPException(status_code=404, detail="server.properties not found")
-    lines = []
-    found = False
-    with open(prop_path, "r") as f:
-        for line in f:
-            if line.strip().startswith(f"{key}="):
-                lines.append(f"{key}={value}\n")
-                found = True
-            else:
-                lines.append(line)
-    if not found:
-        lines.append(f"{key}={value}\n")
-    with open(prop_path, "w") as f:
-        f.writelines(lines)
-    return {"message": f"{key} set to {value}"}
+    result = update_properties(servername, {key: value})
+    return {"message": f"{key} set to {value}", **result}
+
+# API: Mehrere Properties in einem Request (ein Schreibvorgang, ein RCON-Batch)
+@router.post("/server/properties/batch")
+def set_properties_batch(servername: str, properties: dict = Body(..., embed=True),
+                         current_user: dict = Depends(get_current_user)):
+    prop_path = safe_server_path(servername, "server.properties")
+    if not os.path.exists(prop_path):
+        raise HTTPException(status_code=404, detail="server.properties not found")
+    changes = {}
+    for key, value in properties.items():
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        elif value is None or isinstance(value, (dict, list)):
+            raise HTTPException(status_code=400, detail=f"Invalid value for {key}")
+        changes[key] = str(value)
+    if "difficulty" in changes and changes["difficulty"] not in {"easy", "normal", "peaceful", "hard"}:
+        raise HTTPException(status_code=400, detail="Ungültige Schwierigkeit. Erlaubt: easy, normal, peaceful, hard")
+    result = update_properties(servername, changes)
+    return {"message": f"{len(result['changed'])} Properties geändert", **result}
 
 @router.get("/server/log")
 def get_log(servername: str, lines: int = 50, current_user: dict = Depends(get_current_user)):
     log_path = safe_server_path(servername, "logs", "latest.log")
-    if not os.path.exists(log_path):
-        return {"log": ""}
-    with open(log_path, "r") as f:
-        content = f.readlines()
-    return {"log": "".join(content[-lines:])}
+    return {"log": log_reader.tail(log_path, lines)}
+
+# API: Log seitenweise lesen (Cursor aus Dateiidentität + Byte-Offset)
+@router.get("/server/log/page")
+def get_log_page(servername: str, cursor: str = None, direction: str = "prev", lines: int = 100,
+                 current_user: dict = Depends(get_current_user)):
+    log_path = safe_server_path(servername, "logs", "latest.log")
+    try:
+        return read_page(log_path, cursor, direction, lines)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# API: Volltextsuche über latest.log, rotierte logs/*.log.gz und server.log
+@router.get("/server/logs/search")
+def search_logs(servername: str, q: str, start: float = None, end: float = None, limit: int = 1000,
+                current_user: dict = Depends(get_current_user)):
+    """
+    Treffer als NDJSON, zeitlich sortiert; start/end als Unix-Zeitstempel.
+    Die letzte Zeile ist eine Zusammenfassung ({"done": true, ...}).
+    """
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="Empty search query")
+    server_dir = safe_server_path(servername)
+    if not os.path.isdir(server_dir):
+        raise HTTPException(status_code=404, detail="Server not found")
+    results = log_searcher.search(server_dir, q, start, end, limit)
+    return StreamingResponse((json.dumps(item) + "\n" for item in results), media_type="application/x-ndjson")
 
 @router.get("/server/plugins")
 def list_plugins(servername: str, current_user: dict = Depends(get_current_user)):
@@ -1304,25 +1848,7 @@ def list_plugins(servername: str, current_user: dict = Depends(get_current_user)
 # API: Server-Version abrufen
 @router.get("/server/version")
 def get_server_version(servername: str, current_user: dict = Depends(get_current_user)):
-    log_path = safe_server_path(servername, "logs", "latest.log")
-    if not os.path.exists(log_path):
-        log_path = safe_server_path(servername, "server.log")
-    version = None
-    if os.path.exists(log_path):
-        try:
-            with open(log_path, "r", encoding="utf-8", errors="ignore") as f:
-                lines = f.readlines()[-200:]
-            for line in lines:
-                if "Starting minecraft server version" in line:
-                    m = re.search(r"Starting minecraft server version ([^\s]+)", line)
-                    if m:
-                        version = m.group(1)
-                        # Purpur-Variante
-                        if "Purpur" in line:
-                            version += " Purpur"
-                        break
-        except Exception:
-            pass
+    version = log_reader.server_version(get_server_log_path(servername), with_variant=True)
     return {"version": version}
 @router.delete("/server/plugins/delete")
 def delete_plugin(servername: str, plugin: str, current_user: dict = Depends(get_current_user)):
@@ -1334,15 +1860,15 @@ def delete_plugin(servername: str, plugin: str, current_user: dict = Depends(get
 
 @router.post("/server/kill")
 def kill_server(servername: str, current_user: dict = Depends(get_current_user)):
-    session = get_tmux_session(servername)
     pid = get_server_proc(servername)
-    pid_file = get_pid_file(servername)
     if not pid:
         return {"status": "not running"}
     try:
-        subprocess.run(["tmux", "kill-session", "-t", session], check=True)
-        if os.path.exists(pid_file):
-            os.remove(pid_file)
+        if supervisor.get(servername):
+            supervisor.kill(servername)
+        else:
+            kill_process(pid)
+        _cleanup_server_session(servername)
         return {"status": "killed"}
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": str(e)})
@@ -1396,6 +1922,96 @@ def set_server_ram_config(
     save_server_config(servername, ram)
     return {"message": f"RAM set to {ram}MB for server {servername}"}
 
+@router.get("/server/jvm")
+def get_server_jvm_config(servername: str, current_user: dict = Depends(get_current_user)):
+    """JVM profile, custom flags and the rendered launch command of a server"""
+    config = get_server_config(servername)
+    try:
+        command = get_server_java_command(servername)
+        error = None
+    except JvmProfileError as e:
+        command = None
+        error = str(e)
+    return {
+        "profile": config.get("jvm_profile", DEFAULT_PROFILE),
+        "flags": config.get("jvm_flags", ""),
+        "command": command,
+        "error": error,
+        "profiles": list_profiles()
+    }
+
+@router.post("/server/jvm/set")
+def set_server_jvm_config(
+    servername: str = Form(...),
+    profile: str = Form(default=DEFAULT_PROFILE),
+    flags: str = Form(default=""),
+    current_user: dict = Depends(get_current_user)
+):
+    """Set the JVM profile (and optional custom flags); applies on the next start"""
+    if not os.path.exists(safe_server_path(servername)):
+        raise HTTPException(status_code=404, detail="Server not found")
+    try:
+        command = build_java_command(get_server_ram(servername), profile, flags)
+    except JvmProfileError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    save_server_config(servername, jvm_profile=profile, jvm_flags=flags.strip() or None)
+    return {"message": f"JVM profile set to {profile} for server {servername}", "command": command}
+
+@router.post("/server/idle/set")
+def set_server_idle_timeout(
+    servername: str = Form(...),
+    minutes: float = Form(...),
+    current_user: dict = Depends(get_current_user)
+):
+    """Minutes without players before the server hibernates (0 = never)"""
+    if not os.path.exists(safe_server_path(servername)):
+        raise HTTPException(status_code=404, detail="Server not found")
+    if minutes < 0:
+        raise HTTPException(status_code=400, detail="minutes must not be negative")
+    save_server_config(servername, idle_timeout=minutes)
+    return {"message": f"Idle timeout set to {minutes} minutes for server {servername}"}
+
+@router.post("/server/hibernate")
+def hibernate_server(servername: str, current_user: dict = Depends(get_current_user)):
+    """Stop the server now and wake it on the next login attempt"""
+    if not get_server_proc(servername):
+        return {"status": "not running"}
+    hibernation_manager.hibernate(servername)
+    return {"status": "sleeping" if hibernation_manager.is_sleeping(servername) else "stopped"}
+
+@router.get("/server/cpus/allocations")
+def get_cpu_allocations(current_user: dict = Depends(get_current_user)):
+    """Get current CPU core allocation status"""
+    return cpu_allocator.get_allocation_status()
+
+@router.post("/server/cpus/set")
+def set_server_cpus(
+    servername: str = Form(...),
+    cpus: int = Form(...),
+    current_user: dict = Depends(get_current_user)
+):
+    """Set the number of dedicated cores (0 = not pinned); a running server is re-pinned immediately"""
+    if not os.path.exists(safe_server_path(servername)):
+        raise HTTPException(status_code=404, detail="Server not found")
+    if cpus < 0 or cpus > len(cpu_allocator.cpus):
+        raise HTTPException(status_code=400, detail=f"cpus must be between 0 and {len(cpu_allocator.cpus)}")
+    save_server_config(servername, cpus=cpus or None)
+    proc = supervisor.get(servername)
+    assigned = None
+    if proc:
+        if cpus:
+            assigned = _allocate_server_cpus(servername)
+            apply_affinity(proc.pid, assigned)
+        else:
+            cpu_allocator.release_cpus(servername)
+            apply_affinity(proc.pid, cpu_allocator.cpus)
+        for name, cores in cpu_allocator.rebalance().items():
+            running = supervisor.get(name)
+            if running:
+                apply_affinity(running.pid, cores)
+        assigned = cpu_allocator.get_server_cpus(servername)
+    return {"message": f"CPU cores set to {cpus or 'unpinned'} for server {servername}", "cpus": assigned}
+
 @router.post("/server/proxy/add")
 def add_server_to_proxy(
     servername: str = Form(...),
@@ -1411,17 +2027,9 @@ def add_server_to_proxy(
         
         # Get port from server.properties if not provided
         if port is None:
-            props_path = safe_server_path(servername, "server.properties")
-            if os.path.exists(props_path):
-                with open(props_path, "r") as f:
-                    for line in f:
-                        if line.strip().startswith("server-port="):
-                            try:
-                                port = int(line.strip().split("=", 1)[1])
-                                break
-                            except:
-                                pass
-            if port is None:
+            try:
+                port = int(get_server_property(servername, "server-port", "25565"))
+            except ValueError:
                 port = 25565  # Default port
         
         # Add to HAProxy
@@ -1481,3 +2089,122 @@ def get_proxy_status(current_user: dict = Depends(get_current_user)):
     except Exception as e:
         logging.error(f"Error getting proxy status: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+def _idle_timeout_minutes(servername: str):
+    value = get_server_config(servername).get("idle_timeout")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+hibernation_manager.configure(
+    servers=get_all_servernames,
+    is_running=lambda name: bool(get_server_proc(name)),
+    server_dir=safe_server_path,
+    get_port=lambda name: int(get_server_property(name, "server-port", "25565")),
+    get_motd=lambda name: get_server_property(name, "motd", "A Minecraft Server"),
+    idle_timeout=_idle_timeout_minutes,
+    stop=shutdown_server,
+    start=lambda name: start_server_internal(name, None),
+)
+
+rcon_pool.configure(get_settings=get_rcon_settings)
+
+player_tracker.configure(
+    servers=get_all_servernames,
+    is_running=lambda name: bool(get_server_proc(name)),
+    log_path=get_server_log_path,
+    get_port=lambda name: int(get_server_property(name, "server-port", "25565")),
+)
+
+overview_collector.configure(
+    servers=get_all_servernames,
+    collect=collect_server_overview,
+)
+
+metrics_sampler.configure(
+    servers=get_all_servernames,
+    get_pid=get_server_proc,
+    player_count=player_tracker.get_count,
+    server_dir=safe_server_path,
+    get_port=lambda name: int(get_server_property(name, "server-port", "25565")),
+    tick_health=tick_monitor.sample,
+)
+
+tick_monitor.configure(query=rcon_pool.execute)
+
+SERVER_STATES = ("running", "sleeping", "stopped")
+
+def _prometheus_server_metrics() -> list:
+    """Per-server gauges aus Overview-Snapshot, Process-Tracker und letztem Metrics-Sample (kein eigener Scan)"""
+    snapshot = overview_collector.get()
+    samples = metrics_sampler.latest
+    up = Gauge("blockpanel_server_up", "1 if the Minecraft server process is running", ["server"])
+    state = Gauge("blockpanel_server_status", "Current server state", ["server", "status"])
+    rss = Gauge("blockpanel_server_memory_rss_bytes", "Resident memory of the server JVM", ["server"])
+    ram_limit = Gauge("blockpanel_server_memory_allocated_bytes", "Configured heap size (-Xmx)", ["server"])
+    cpu = Gauge("blockpanel_server_cpu_percent", "CPU usage of the server JVM (100 = one core)", ["server"])
+    threads = Gauge("blockpanel_server_threads", "Threads of the server JVM", ["server"])
+    pss = Gauge("blockpanel_server_memory_pss_bytes", "Proportional set size of the server JVM", ["server"])
+    fds = Gauge("blockpanel_server_open_fds", "Open file descriptors of the server JVM", ["server"])
+    io_read = Gauge("blockpanel_server_io_read_bytes", "Bytes read from storage by the server JVM", ["server"])
+    io_write = Gauge("blockpanel_server_io_write_bytes", "Bytes written to storage by the server JVM", ["server"])
+    uptime = Gauge("blockpanel_server_uptime_seconds", "Seconds since the server process started", ["server"])
+    players = Gauge("blockpanel_server_players_online", "Online players", ["server"])
+    max_players = Gauge("blockpanel_server_players_max", "max-players from server.properties", ["server"])
+    port = Gauge("blockpanel_server_port", "Game port of the server", ["server"])
+    sessions = Gauge("blockpanel_server_proxy_sessions", "Established proxy connections to the game port", ["server"])
+    disk = Gauge("blockpanel_server_disk_bytes", "Size of the server directory", ["server"])
+    tps = Gauge("blockpanel_server_tps", "Ticks per second (20 = healthy)", ["server"])
+    mspt = Gauge("blockpanel_server_mspt", "Average milliseconds per tick over the last 5s", ["server"])
+    for name, data in snapshot.items():
+        sample = samples.get(name, {})
+        process = process_tracker.get(name) if data["status"] == "running" else None
+        up.set(1 if data["status"] == "running" else 0, server=name)
+        for status in SERVER_STATES:
+            state.set(1 if data["status"] == status else 0, server=name, status=status)
+        try:
+            ram_limit.set(int(data["ram_allocated"]) * 1024 * 1024, server=name)
+        except (TypeError, ValueError):
+            pass
+        if process:
+            for gauge, key, scale in ((rss, "rss_mb", 1024 * 1024), (pss, "pss_mb", 1024 * 1024),
+                                      (cpu, "cpu_percent", 1), (threads, "threads", 1), (fds, "fds", 1),
+                                      (io_read, "read_bytes", 1), (io_write, "write_bytes", 1)):
+                if process.get(key) is not None:
+                    gauge.set(process[key] * scale, server=name)
+        uptime.set(data.get("uptime") or 0, server=name)
+        players.set(data.get("player_count", 0), server=name)
+        max_players.set(data.get("max_players", 0), server=name)
+        try:
+            port.set(int(data["port"]), server=name)
+        except (TypeError, ValueError):
+            pass
+        if sample.get("proxy_sessions") is not None:
+            sessions.set(sample["proxy_sessions"], server=name)
+        if sample.get("disk_mb") is not None:
+            disk.set(sample["disk_mb"] * 1024 * 1024, server=name)
+        if sample.get("tps") is not None:
+            tps.set(sample["tps"], server=name)
+        if sample.get("mspt") is not None:
+            mspt.set(sample["mspt"], server=name)
+    return [up, state, rss, pss, ram_limit, cpu, threads, fds, io_read, io_write, uptime,
+            players, max_players, port, sessions, disk, tps, mspt]
+
+def _prometheus_allocator_metrics() -> list:
+    port_status = port_allocator.get_allocation_status()
+    ports = Gauge("blockpanel_ports_allocated", "Game ports allocated to servers", ["range"])
+    ports_total = Gauge("blockpanel_ports_capacity", "Game ports the allocator can hand out", ["range"])
+    for port_range in ("standard", "special"):
+        ports.set(port_status[f"{port_range}_range"]["used"], range=port_range)
+        ports_total.set(port_status[f"{port_range}_range"]["total"], range=port_range)
+    cpu_status = cpu_allocator.get_allocation_status()
+    cores = Gauge("blockpanel_cpu_cores_allocated", "Servers pinned to each CPU core", ["cpu"])
+    for cpu, servers in cpu_status["load"].items():
+        cores.set(servers, cpu=cpu)
+    free = Gauge("blockpanel_cpu_cores_free", "CPU cores no server is pinned to")
+    free.set(len(cpu_status["free"]))
+    return [ports, ports_total, cores, free]
+
+prometheus_registry.register_collector(_prometheus_server_metrics)
+prometheus_registry.register_collector(_prometheus_allocator_metrics)
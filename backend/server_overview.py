@@ -0,0 +1,122 @@
+"""
+Server Overview Snapshot für das Dashboard
+Collects everything the dashboard shows (status, RAM, uptime, players,
+version, plugins, port, console) for all servers in one pass on a fixed
+interval, so any number of open dashboards share the same snapshot.
+Subscribers (WebSocket clients) get only the fields that changed.
+"""
+import os
+import time
+import logging
+from typing import Callable, Dict, List, Optional
+from threading import Event, Lock, Thread
+
+logger = logging.getLogger(__name__)
+
+
+class OverviewCollector:
+    def __init__(self,
+                 interval: float = float(os.environ.get("MC_OVERVIEW_INTERVAL", "5")),
+                 idle_after: float = 60.0):
+        self.interval = interval
+        # Stop collecting when nobody asked for the overview for this long
+        self.idle_after = idle_after
+        self.lock = Lock()
+        self.snapshot: Dict[str, dict] = {}
+        self.collected_at: float = 0.0
+        self.last_access: float = 0.0
+        self.hooks: Dict[str, Callable] = {}
+        self.listeners: List[Callable[[Dict[str, Optional[dict]]], None]] = []
+        self._wake = Event()
+        self._thread: Optional[Thread] = None
+
+    def configure(self, *, servers: Callable[[], List[str]], collect: Callable[[str], dict]):
+        self.hooks = dict(servers=servers, collect=collect)
+
+    def start(self):
+        if self._thread is not None or not self.hooks:
+            return
+        self._thread = Thread(target=self._loop, name="overview-collector", daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while True:
+            if self.listeners or time.time() - self.last_access < self.idle_after:
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.error(f"Overview collection failed: {e}")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def request_refresh(self):
+        """Collect now instead of at the next interval (server started, stopped, crashed)"""
+        self._wake.set()
+
+    def subscribe(self, listener: Callable[[Dict[str, Optional[dict]]], None]):
+        """listener(changes) runs in the collector thread: {server: changed fields, or None if removed}"""
+        self.listeners.append(listener)
+        self._wake.set()
+
+    def unsubscribe(self, listener: Callable[[Dict[str, Optional[dict]]], None]):
+        try:
+            self.listeners.remove(listener)
+        except ValueError:
+            pass
+
+    @staticmethod
+    def diff(old: Dict[str, dict], new: Dict[str, dict]) -> Dict[str, Optional[dict]]:
+        changes: Dict[str, Optional[dict]] = {}
+        for name, data in new.items():
+            previous = old.get(name)
+            if previous is None:
+                changes[name] = data
+                continue
+            changed = {key: value for key, value in data.items() if previous.get(key) != value}
+            if changed:
+                changes[name] = changed
+        for name in old:
+            if name not in new:
+                changes[name] = None
+        return changes
+
+    def _notify(self, changes: Dict[str, Optional[dict]]):
+        for listener in list(self.listeners):
+            try:
+                listener(changes)
+            except Exception as e:
+                logger.warning(f"Overview listener failed: {e}")
+
+    def refresh(self, max_age: Optional[float] = None) -> Dict[str, dict]:
+        """One collection pass over all servers (skipped if the snapshot is younger than max_age)"""
+        with self.lock:
+            started = time.time()
+            if max_age is not None and started - self.collected_at <= max_age:
+                return self.snapshot
+            snapshot = {}
+            for name in self.hooks["servers"]():
+                try:
+                    snapshot[name] = self.hooks["collect"](name)
+                except Exception as e:
+                    logger.warning(f"Overview: could not collect {name}: {e}")
+            changes = self.diff(self.snapshot, snapshot)
+            self.snapshot = snapshot
+            self.collected_at = time.time()
+            logger.debug(f"Overview: collected {len(snapshot)} servers in {self.collected_at - started:.2f}s")
+            if changes:
+                self._notify(changes)
+            return snapshot
+
+    def get(self) -> Dict[str, dict]:
+        """Current snapshot; collects synchronously if it is missing or stale"""
+        self.last_access = time.time()
+        if self.last_access - self.collected_at > self.interval * 2:
+            # Collector was idle (or not started); concurrent callers share one pass
+            return self.refresh(max_age=self.interval * 2)
+        return self.snapshot
+
+    def age(self) -> float:
+        return round(time.time() - self.collected_at, 2) if self.collected_at else None
+
+# Global instance
+overview_collector = OverviewCollector()
@@ -0,0 +1,135 @@
+"""
+Server Properties für Minecraft Server
+Single reader/writer for server.properties: parsed files are cached and
+re-read only when their mtime or size changes, updates set any number of
+keys in one atomic write (temp file + rename) that keeps comments, blank
+lines and the key order.
+"""
+import os
+import shutil
+import logging
+from typing import Dict, List, Optional, Tuple
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+
+def _split(line: str) -> Optional[Tuple[str, str]]:
+    """(key, value) of a property line, None for comments and blank lines"""
+    stripped = line.strip()
+    if not stripped or stripped[0] in "#!" or "=" not in stripped:
+        return None
+    key, value = stripped.split("=", 1)
+    return key.strip(), value.strip()
+
+
+def parse_properties(lines: List[str]) -> Dict[str, str]:
+    values: Dict[str, str] = {}
+    for line in lines:
+        pair = _split(line)
+        if pair:
+            # Like java.util.Properties: the last occurrence wins
+            values[pair[0]] = pair[1]
+    return values
+
+
+def validate_changes(changes: Dict[str, str]):
+    """
+    Keys and values must fit on one `key=value` line. Java also ends lines at \\r
+    and ends keys at ':' and whitespace.
+    """
+    for key, value in changes.items():
+        if not key or key[0] in "#!" or any(c in key for c in "=: \t\f") or \
+                any(c in key or c in str(value) for c in "\r\n"):
+            raise ValueError(f"Invalid property {key!r}")
+
+
+class CachedProperties:
+    def __init__(self, stamp: Tuple[int, int], lines: List[str]):
+        self.stamp = stamp
+        self.lines = lines
+        self.values = parse_properties(lines)
+
+
+class PropertiesStore:
+    def __init__(self):
+        self.lock = Lock()
+        self.cache: Dict[str, CachedProperties] = {}
+
+    @staticmethod
+    def _stamp(st: os.stat_result) -> Tuple[int, int]:
+        return st.st_mtime_ns, st.st_size
+
+    def _load(self, path: str) -> Optional[CachedProperties]:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            self.cache.pop(path, None)
+            return None
+        cached = self.cache.get(path)
+        if cached is not None and cached.stamp == self._stamp(st):
+            return cached
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            lines = f.readlines()
+            # Stamp of the content actually read (the file may change in between)
+            stamp = self._stamp(os.fstat(f.fileno()))
+        cached = self.cache[path] = CachedProperties(stamp, lines)
+        return cached
+
+    def read(self, path: str) -> Dict[str, str]:
+        """All properties (copy), {} if the file doesn't exist"""
+        with self.lock:
+            cached = self._load(path)
+            return dict(cached.values) if cached else {}
+
+    def get(self, path: str, key: str, default: Optional[str] = None) -> Optional[str]:
+        with self.lock:
+            cached = self._load(path)
+            if cached is None:
+                return default
+            return cached.values.get(key, default)
+
+    def update(self, path: str, changes: Dict[str, str]) -> Dict[str, str]:
+        """
+        Set all keys in one write. Existing lines are changed in place, new keys
+        are appended; returns the keys whose value actually changed.
+        """
+        validate_changes(changes)
+        with self.lock:
+            cached = self._load(path)
+            lines = list(cached.lines) if cached else []
+            current = cached.values if cached else {}
+            changed = {key: str(value) for key, value in changes.items() if current.get(key) != str(value)}
+            if not changed:
+                return {}
+            seen = set()
+            for i, line in enumerate(lines):
+                pair = _split(line)
+                if pair and pair[0] in changed:
+                    lines[i] = f"{pair[0]}={changed[pair[0]]}\n"
+                    seen.add(pair[0])
+            if lines and not lines[-1].endswith("\n"):
+                lines[-1] += "\n"
+            lines.extend(f"{key}={value}\n" for key, value in changed.items() if key not in seen)
+            self._write(path, lines)
+        return changed
+
+    def _write(self, path: str, lines: List[str]):
+        tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+        self.cache[path] = CachedProperties(self._stamp(os.stat(path)), lines)
+
+    def forget(self, path_prefix: str):
+        """Drop cached files below a directory (server deleted)"""
+        with self.lock:
+            for path in [p for p in self.cache if p.startswith(path_prefix)]:
+                del self.cache[path]
+
+# Global instance
+properties_store = PropertiesStore()
@@ -0,0 +1,177 @@
+"""
+Server Provisioning für Minecraft Server
+Writes eula.txt and a complete server.properties from versioned templates,
+so a freshly created server boots exactly once (on its real start).
+"""
+import os
+import re
+import time
+import secrets
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from rcon_client import rcon_port_for
+
+logger = logging.getLogger(__name__)
+
+EULA_URL = "https://account.mojang.com/documents/minecraft_eula"
+
+# Fallback if the Minecraft version cannot be derived from the download URL
+DEFAULT_MINECRAFT_VERSION = "1.21.5"
+
+# (key, default, introduced in, removed in) - ordered like the vanilla file.
+# None means "always present" / "never removed".
+PROPERTY_TEMPLATE: List[Tuple[str, str, Optional[str], Optional[str]]] = [
+    ("accepts-transfers", "false", "1.20.5", None),
+    ("allow-flight", "false", None, None),
+    ("allow-nether", "true", None, None),
+    ("broadcast-console-to-ops", "true", None, None),
+    ("broadcast-rcon-to-ops", "true", None, None),
+    ("bug-report-link", "", "1.21", None),
+    ("difficulty", "easy", None, None),
+    ("enable-command-block", "false", None, None),
+    ("enable-jmx-monitoring", "false", None, None),
+    ("enable-query", "false", None, None),
+    ("enable-rcon", "false", None, None),
+    ("enable-status", "true", None, None),
+    ("enforce-secure-profile", "true", "1.19", None),
+    ("enforce-whitelist", "false", None, None),
+    ("entity-broadcast-range-percentage", "100", None, None),
+    ("force-gamemode", "false", None, None),
+    ("function-permission-level", "2", None, None),
+    ("gamemode", "survival", None, None),
+    ("generate-structures", "true", None, None),
+    ("generator-settings", "{}", None, None),
+    ("hardcore", "false", None, None),
+    ("hide-online-players", "false", "1.18", None),
+    ("initial-disabled-packs", "", "1.19.3", None),
+    ("initial-enabled-packs", "vanilla", "1.19.3", None),
+    ("level-name", "world", None, None),
+    ("level-seed", "", None, None),
+    ("level-type", "minecraft\\:normal", None, None),
+    ("log-ips", "true", "1.20.2", None),
+    ("max-chained-neighbor-updates", "1000000", "1.19", None),
+    ("max-players", "20", None, None),
+    ("max-tick-time", "60000", None, None),
+    ("max-world-size", "29999984", None, None),
+    ("motd", "A Minecraft Server", None, None),
+    ("network-compression-threshold", "256", None, None),
+    ("online-mode", "true", None, None),
+    ("op-permission-level", "4", None, None),
+    ("pause-when-empty-seconds", "60", "1.21.2", None),
+    ("player-idle-timeout", "0", None, None),
+    ("prevent-proxy-connections", "false", None, None),
+    ("pvp", "true", None, None),
+    ("query.port", "25565", None, None),
+    ("rate-limit", "0", None, None),
+    ("rcon.password", "", None, None),
+    ("rcon.port", "25575", None, None),
+    ("region-file-compression", "deflate", "1.20.5", None),
+    ("require-resource-pack", "false", None, None),
+    ("resource-pack", "", None, None),
+    ("resource-pack-id", "", "1.20.3", None),
+    ("resource-pack-prompt", "", None, None),
+    ("resource-pack-sha1", "", None, None),
+    ("server-ip", "", None, None),
+    ("server-port", "25565", None, None),
+    ("simulation-distance", "10", "1.18", None),
+    ("spawn-animals", "true", None, "1.21.2"),
+    ("spawn-monsters", "true", None, None),
+    ("spawn-npcs", "true", None, "1.21.2"),
+    ("spawn-protection", "16", None, None),
+    ("sync-chunk-writes", "true", None, None),
+    ("text-filtering-config", "", None, None),
+    ("text-filtering-version", "0", "1.21.2", None),
+    ("use-native-transport", "true", None, None),
+    ("view-distance", "10", None, None),
+    ("white-list", "false", None, None),
+]
+
+
+def _version_tuple(version: str) -> Tuple[int, ...]:
+    return tuple(int(part) for part in re.findall(r"\d+", version))
+
+
+def detect_minecraft_version(purpur_url: str) -> str:
+    """
+    Extract the Minecraft version from a Purpur download URL,
+    e.g. https://api.purpurmc.org/v2/purpur/1.21.5/2450/download -> 1.21.5
+    """
+    match = re.search(r"/purpur/(\d+\.\d+(?:\.\d+)?)(?:/|$)", purpur_url or "")
+    if match:
+        return match.group(1)
+    logger.warning(f"Could not detect Minecraft version from {purpur_url}, using {DEFAULT_MINECRAFT_VERSION}")
+    return DEFAULT_MINECRAFT_VERSION
+
+
+def get_property_template(version: str) -> Dict[str, str]:
+    """Return the default server.properties of the given Minecraft version (ordered)"""
+    current = _version_tuple(version)
+    template = {}
+    for key, default, since, until in PROPERTY_TEMPLATE:
+        if since and current < _version_tuple(since):
+            continue
+        if until and current >= _version_tuple(until):
+            continue
+        template[key] = default
+    return template
+
+
+def _java_timestamp() -> str:
+    # Same format the server uses for the header of its generated files
+    return time.strftime("%a %b %d %H:%M:%S UTC %Y", time.gmtime())
+
+
+def render_server_properties(version: str, overrides: Optional[Dict[str, str]] = None) -> str:
+    properties = get_property_template(version)
+    for key, value in (overrides or {}).items():
+        properties[key] = str(value)
+    lines = ["#Minecraft server properties\n", f"#{_java_timestamp()}\n"]
+    lines.extend(f"{key}={value}\n" for key, value in properties.items())
+    return "".join(lines)
+
+
+def rcon_properties(port: int, password: Optional[str] = None) -> Dict[str, str]:
+    """RCON on game port + 1000 with a random password (used by the panel's RCON pool)"""
+    return {
+        "enable-rcon": "true",
+        "rcon.port": str(rcon_port_for(port)),
+        "rcon.password": password or secrets.token_urlsafe(24),
+    }
+
+
+def write_server_properties(server_dir: str, version: str, port: int,
+                            motd: Optional[str] = None,
+                            overrides: Optional[Dict[str, str]] = None) -> str:
+    """Write a complete server.properties for a new server and return its path"""
+    values = {"server-port": str(port), "query.port": str(port)}
+    values.update(rcon_properties(port))
+    if motd:
+        values["motd"] = motd
+    values.update(overrides or {})
+    props_path = os.path.join(server_dir, "server.properties")
+    with open(props_path, "w") as f:
+        f.write(render_server_properties(version, values))
+    return props_path
+
+
+def write_eula(server_dir: str, accepted: bool) -> str:
+    eula_path = os.path.join(server_dir, "eula.txt")
+    with open(eula_path, "w") as f:
+        f.write(f"#By changing the setting below to TRUE you are indicating your agreement to our EULA ({EULA_URL}).\n")
+        f.write(f"#{_java_timestamp()}\n")
+        f.write(f"eula={'true' if accepted else 'false'}\n")
+    return eula_path
+
+
+def provision_server(server_dir: str, purpur_url: str, port: int, accept_eula: bool,
+                     motd: Optional[str] = None) -> str:
+    """
+    Prepare a new server directory without a warm-up run of the JVM.
+    Returns the Minecraft version the files were rendered for.
+    """
+    version = detect_minecraft_version(purpur_url)
+    write_server_properties(server_dir, version, port, motd=motd)
+    write_eula(server_dir, accept_eula)
+    logger.info(f"Provisioned {server_dir} for Minecraft {version} on port {port} (eula={accept_eula})")
+    return version
@@ -0,0 +1,185 @@
+"""
+Server Templates für Minecraft Server
+Snapshots an existing server directory as a named template and clones new
+servers from it (hardlinks for jars, copy-on-write copies for everything else)
+"""
+import json
+import os
+import re
+import shutil
+import time
+import fcntl
+import logging
+from typing import Dict, List, Optional
+from threading import Lock
+
+from server_properties import properties_store
+
+logger = logging.getLogger(__name__)
+
+# ioctl request for reflink copies (btrfs, xfs, ...), see linux/fs.h
+FICLONE = 0x40049409
+
+META_FILE = "template.json"
+
+# Runtime state that must never end up in a template
+EXCLUDED_FILES = {"mcserver.pid", "start.lock", "server.log", "session.lock", META_FILE}
+EXCLUDED_DIRS = {"logs", "crash-reports", "cache", "debug", "server_logs", ".log_index"}
+
+
+def is_valid_template_name(name: str) -> bool:
+    return bool(name) and re.match(r'^[a-zA-Z0-9_-]+$', name) is not None
+
+
+def _read_level_name(server_dir: str) -> str:
+    return properties_store.get(os.path.join(server_dir, "server.properties"), "level-name") or "world"
+
+
+def _reflink_or_copy(src: str, dst: str):
+    """Copy-on-write clone if the filesystem supports it, plain copy otherwise"""
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        shutil.copystat(src, dst)
+        return
+    except OSError:
+        pass
+    shutil.copy2(src, dst)
+
+
+def _link_or_copy(src: str, dst: str):
+    """Hardlink immutable files (jars), fall back to a copy across filesystems"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        _reflink_or_copy(src, dst)
+
+
+class TemplateManager:
+    def __init__(self, templates_dir: str = "/app/mc_servers/.templates"):
+        self.templates_dir = templates_dir
+        self.lock = Lock()
+
+    def _template_path(self, name: str) -> str:
+        if not is_valid_template_name(name):
+            raise ValueError("Invalid template name")
+        return os.path.join(self.templates_dir, name)
+
+    def _excluded_world_dirs(self, server_dir: str) -> set:
+        level_name = _read_level_name(server_dir)
+        return {level_name, f"{level_name}_nether", f"{level_name}_the_end"}
+
+    def get_template(self, name: str) -> Optional[Dict]:
+        meta_path = os.path.join(self._template_path(name), META_FILE)
+        if not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not read template metadata {meta_path}: {e}")
+            return None
+
+    def list_templates(self) -> List[Dict]:
+        templates = []
+        if not os.path.exists(self.templates_dir):
+            return templates
+        for name in sorted(os.listdir(self.templates_dir)):
+            if not is_valid_template_name(name):
+                continue
+            meta = self.get_template(name)
+            if meta:
+                templates.append(meta)
+        return templates
+
+    def create_template(self, name: str, server_dir: str, include_world: bool = False) -> Dict:
+        """
+        Snapshot server_dir as template `name`.
+        The snapshot is a real copy so later changes of the source server never leak into it.
+        """
+        target = self._template_path(name)
+        with self.lock:
+            if os.path.exists(target):
+                raise FileExistsError(f"Template {name} already exists")
+            excluded_dirs = set(EXCLUDED_DIRS)
+            if not include_world:
+                excluded_dirs |= self._excluded_world_dirs(server_dir)
+            tmp_target = f"{target}.tmp-{os.getpid()}"
+            os.makedirs(self.templates_dir, exist_ok=True)
+            files = 0
+            total_bytes = 0
+            try:
+                for root, dirs, filenames in os.walk(server_dir):
+                    rel_root = os.path.relpath(root, server_dir)
+                    if rel_root == ".":
+                        dirs[:] = [d for d in dirs if d not in excluded_dirs]
+                    os.makedirs(os.path.join(tmp_target, rel_root), exist_ok=True)
+                    for filename in filenames:
+                        if rel_root == "." and filename in EXCLUDED_FILES:
+                            continue
+                        src = os.path.join(root, filename)
+                        if os.path.islink(src) or not os.path.isfile(src):
+                            continue
+                        _reflink_or_copy(src, os.path.join(tmp_target, rel_root, filename))
+                        files += 1
+                        total_bytes += os.path.getsize(src)
+                meta = {
+                    "name": name,
+                    "source": os.path.basename(os.path.normpath(server_dir)),
+                    "created": int(time.time()),
+                    "include_world": include_world,
+                    "files": files,
+                    "bytes": total_bytes,
+                }
+                with open(os.path.join(tmp_target, META_FILE), "w") as f:
+                    json.dump(meta, f, indent=2)
+                os.rename(tmp_target, target)
+            except Exception:
+                shutil.rmtree(tmp_target, ignore_errors=True)
+                raise
+        logger.info(f"Created template {name} from {server_dir} ({files} files, {total_bytes} bytes)")
+        return meta
+
+    def delete_template(self, name: str) -> bool:
+        target = self._template_path(name)
+        with self.lock:
+            if not os.path.exists(target):
+                return False
+            shutil.rmtree(target)
+        logger.info(f"Deleted template {name}")
+        return True
+
+    def clone_template(self, name: str, target_dir: str) -> Dict:
+        """
+        Materialize template `name` into target_dir (which must not exist yet).
+        Jars are hardlinked, all other files are reflinked/copied because the
+        server writes to them.
+        """
+        source = self._template_path(name)
+        meta = self.get_template(name)
+        if meta is None:
+            raise FileNotFoundError(f"Template {name} not found")
+        if os.path.exists(target_dir):
+            raise FileExistsError(f"{target_dir} already exists")
+        started = time.monotonic()
+        try:
+            for root, dirs, filenames in os.walk(source):
+                rel_root = os.path.relpath(root, source)
+                os.makedirs(os.path.join(target_dir, rel_root), exist_ok=True)
+                for filename in filenames:
+                    if rel_root == "." and filename == META_FILE:
+                        continue
+                    src = os.path.join(root, filename)
+                    dst = os.path.join(target_dir, rel_root, filename)
+                    if filename.endswith(".jar"):
+                        _link_or_copy(src, dst)
+                    else:
+                        _reflink_or_copy(src, dst)
+        except Exception:
+            shutil.rmtree(target_dir, ignore_errors=True)
+            raise
+        logger.info(f"Cloned template {name} to {target_dir} in {time.monotonic() - started:.3f}s")
+        return meta
+
+# Global instance
+template_manager = TemplateManager()
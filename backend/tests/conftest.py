@@ -0,0 +1,17 @@
+import os
+import socket
+import sys
+
+import pytest
+
+# Backend modules import each other as top-level modules (like under uvicorn)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# auth refuses to import without it
+os.environ.setdefault("SECRET_KEY", "test-secret")
+
+
+@pytest.fixture
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
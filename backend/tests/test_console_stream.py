@@ -0,0 +1,44 @@
+import asyncio
+import threading
+
+from console_stream import ConsoleStream, group_lines
+
+
+def test_group_lines_merges_consecutive_lines():
+    items = [("line", 1, "a"), ("line", 2, "b"), ("event", {"type": "exit"}), ("line", 3, "c"), ("line", 7, "d")]
+    assert group_lines(items) == [
+        {"type": "lines", "seq": 1, "lines": ["a", "b"]},
+        {"type": "exit"},
+        {"type": "lines", "seq": 3, "lines": ["c"]},
+        {"type": "lines", "seq": 7, "lines": ["d"]},
+    ]
+
+
+def test_slow_client_drops_oldest_lines():
+    async def run():
+        stream = ConsoleStream(asyncio.get_running_loop(), max_items=3)
+        for seq in range(5):
+            stream.push(("line", seq, str(seq)))
+        return await stream.next_batch()
+
+    items, dropped = asyncio.run(run())
+    assert [item[1] for item in items] == [2, 3, 4]
+    assert dropped == 2
+
+
+def test_push_from_threads_wakes_the_sender():
+    async def run():
+        stream = ConsoleStream(asyncio.get_running_loop())
+        threads = [threading.Thread(target=lambda i=i: stream.push(("line", i, str(i)))) for i in range(50)]
+        for thread in threads:
+            thread.start()
+        received = []
+        while len(received) < 50:
+            items, dropped = await asyncio.wait_for(stream.next_batch(), 5)
+            assert dropped == 0
+            received.extend(items)
+        for thread in threads:
+            thread.join()
+        return received
+
+    assert sorted(item[1] for item in asyncio.run(run())) == list(range(50))
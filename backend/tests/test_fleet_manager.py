@@ -0,0 +1,93 @@
+import threading
+import time
+
+from fleet_manager import FleetManager
+
+
+def test_broadcast_yields_in_completion_order():
+    delays = {"slow": 0.3, "fast": 0.0, "mid": 0.1}
+
+    def send(name):
+        time.sleep(delays[name])
+        return {"status": "ok", "response": name}
+
+    results = list(FleetManager().broadcast(["slow", "fast", "mid"], send, parallel=3))
+    assert [r["server"] for r in results] == ["fast", "mid", "slow"]
+    assert all(r["status"] == "ok" and "duration" in r for r in results)
+
+
+def test_broadcast_parallelism_is_bounded():
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    def send(name):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.1)
+        with lock:
+            state["running"] -= 1
+        return {"status": "ok"}
+
+    servers = [f"s{i}" for i in range(6)]
+    assert len(list(FleetManager().broadcast(servers, send, parallel=2))) == 6
+    assert state["peak"] == 2
+    state["peak"] = 0
+    list(FleetManager().broadcast(servers, send, parallel=6))
+    assert state["peak"] == 6
+
+
+def test_broadcast_reports_failures_per_server():
+    def send(name):
+        if name == "bad":
+            raise ConnectionError("RCON refused")
+        return {"status": "ok"}
+
+    results = {r["server"]: r for r in FleetManager().broadcast(["good", "bad"], send)}
+    assert results["good"]["status"] == "ok"
+    assert results["bad"] == {"server": "bad", "status": "error", "error": "RCON refused",
+                              "duration": results["bad"]["duration"]}
+
+
+def test_closing_the_broadcast_cancels_queued_servers():
+    sent = []
+
+    def send(name):
+        sent.append(name)
+        time.sleep(0.05)
+        return {"status": "ok"}
+
+    results = FleetManager().broadcast([f"s{i}" for i in range(20)], send, parallel=2)
+    next(results)
+    results.close()
+    time.sleep(0.2)
+    assert len(sent) < 20
+
+
+def test_bulk_stop_keeps_input_order():
+    manager = FleetManager()
+    results = manager.bulk_stop(["a", "b", "c"], lambda name: {"status": "stopped"}, parallel=3)
+    assert [r["server"] for r in results] == ["a", "b", "c"]
+
+
+def test_bulk_start_waits_for_memory(monkeypatch):
+    manager = FleetManager(max_parallel=2, reserve_mb=0)
+    monkeypatch.setattr(manager, "_available_mb", lambda: 3000)
+    results = manager.bulk_start(["big", "huge", "small"],
+                                 start_fn=lambda name: {"status": "started"},
+                                 ram_fn=lambda name: {"big": 2048, "huge": 4096, "small": 512}[name],
+                                 is_running_fn=lambda name: False)
+    statuses = {r["server"]: r["status"] for r in results}
+    assert statuses == {"big": "started", "huge": "insufficient_memory", "small": "started"}
+
+
+def test_bulk_operations_ignore_duplicate_names():
+    manager = FleetManager(max_parallel=4, reserve_mb=0)
+    started, stopped = [], []
+    results = manager.bulk_start(["a", "b", "a"], start_fn=lambda name: started.append(name) or {"status": "started"},
+                                 ram_fn=lambda name: 0, is_running_fn=lambda name: False)
+    assert [r["server"] for r in results] == ["a", "b"]
+    assert sorted(started) == ["a", "b"]
+    results = manager.bulk_stop(["b", "a", "b"], lambda name: stopped.append(name) or {"status": "stopped"})
+    assert [r["server"] for r in results] == ["b", "a"]
+    assert sorted(stopped) == ["a", "b"]
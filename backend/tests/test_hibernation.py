@@ -0,0 +1,207 @@
+import json
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+from hibernation import HibernationManager, WakeListener, MARKER_FILE
+from mc_protocol import encode_handshake, encode_packet, encode_string, read_packet, query_status
+
+
+class FakeMinecraftServer:
+    """Stands in for a running JVM: answers Server List Pings with `players` online"""
+
+    def __init__(self, port: int, players: int = 0):
+        self.players = players
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(("0.0.0.0", port))
+        self.sock.listen(4)
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    def _accept_loop(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            with conn:
+                try:
+                    read_packet(conn)  # handshake
+                    read_packet(conn)  # status request
+                    status = {"version": {"name": "Purpur", "protocol": 770},
+                              "players": {"max": 20, "online": self.players}, "description": {"text": "up"}}
+                    conn.sendall(encode_packet(0x00, encode_string(json.dumps(status))))
+                except Exception:
+                    pass
+
+    def close(self):
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+def _login(port: int):
+    """Handshake with next_state=2 plus Login Start, like a joining client"""
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+        sock.sendall(encode_handshake("127.0.0.1", port, 2) + encode_packet(0x00, encode_string("Steve")))
+        return read_packet(sock)
+
+
+@pytest.fixture
+def manager(tmp_path, free_port):
+    manager = HibernationManager(check_interval=1, default_idle_timeout=0)
+    state = {"running": {"s1"}, "fake": None, "started": threading.Event(), "stops": 0}
+
+    def stop(name):
+        state["stops"] += 1
+        state["running"].discard(name)
+        if state["fake"]:
+            state["fake"].close()
+
+    def start(name):
+        manager.release(name)
+        # Binding fails if the wake listener still holds the port
+        state["fake"] = FakeMinecraftServer(free_port, players=1)
+        state["running"].add(name)
+        state["started"].set()
+
+    manager.configure(
+        servers=lambda: ["s1"],
+        is_running=lambda name: name in state["running"],
+        server_dir=lambda name: str(tmp_path),
+        get_port=lambda name: free_port,
+        get_motd=lambda name: "Lobby",
+        idle_timeout=lambda name: 1,
+        stop=stop,
+        start=start,
+    )
+    manager.state = state
+    yield manager
+    manager.release("s1")
+    if state["fake"]:
+        state["fake"].close()
+
+
+def test_check_idle_hibernates_after_timeout(manager, tmp_path, free_port):
+    manager.state["fake"] = FakeMinecraftServer(free_port, players=0)
+
+    manager.check_idle(now=1000.0)
+    manager.check_idle(now=1030.0)
+    assert not manager.is_sleeping("s1")
+    assert manager.state["stops"] == 0
+
+    manager.check_idle(now=1060.0)
+    assert manager.is_sleeping("s1")
+    assert manager.state["stops"] == 1
+    assert os.path.exists(tmp_path / MARKER_FILE)
+
+
+def test_players_online_reset_idle_time(manager, free_port):
+    manager.state["fake"] = FakeMinecraftServer(free_port, players=2)
+
+    manager.check_idle(now=1000.0)
+    manager.check_idle(now=2000.0)
+    assert not manager.is_sleeping("s1")
+    assert "s1" not in manager.idle_since
+
+
+def test_unreachable_server_is_not_counted_as_idle(manager):
+    # Running according to the supervisor, but nothing answers on the port (still booting)
+    manager.check_idle(now=1000.0)
+    manager.check_idle(now=2000.0)
+    assert not manager.is_sleeping("s1")
+    assert manager.state["stops"] == 0
+
+
+def test_wake_listener_answers_status_ping_with_motd(free_port):
+    woken = threading.Event()
+    listener = WakeListener("s1", free_port, "Lobby", on_wake=woken.set)
+    listener.start()
+    try:
+        status = query_status("127.0.0.1", free_port)
+    finally:
+        listener.close()
+    assert status["version"]["name"] == "Sleeping"
+    assert status["players"]["online"] == 0
+    assert status["description"]["text"].startswith("Lobby\n")
+    assert not woken.is_set()
+
+
+def test_login_attempt_wakes_server(free_port):
+    woken = threading.Event()
+    listener = WakeListener("s1", free_port, "Lobby", on_wake=woken.set)
+    listener.start()
+    try:
+        packet_id, payload = _login(free_port)
+        assert packet_id == 0x00  # Login Disconnect with the "starting" message
+        assert b"starting" in payload
+        assert woken.wait(5)
+    finally:
+        listener.close()
+
+
+def test_wake_releases_port_before_start(manager, tmp_path, free_port):
+    manager.state["running"].clear()
+    manager.hibernate("s1")
+    assert manager.is_sleeping("s1")
+
+    _login(free_port)
+    assert manager.state["started"].wait(5)
+    assert not manager.is_sleeping("s1")
+    assert not os.path.exists(tmp_path / MARKER_FILE)
+    # The started server owns the port now
+    assert query_status("127.0.0.1", free_port)["players"]["online"] == 1
+
+
+def test_restore_reopens_listener_after_backend_restart(manager, tmp_path, free_port):
+    manager.state["running"].clear()
+    (tmp_path / MARKER_FILE).write_text("0")
+
+    manager.restore()
+    assert manager.is_sleeping("s1")
+    assert query_status("127.0.0.1", free_port)["version"]["name"] == "Sleeping"
+
+
+@pytest.mark.parametrize("failure", ["returns", "raises", "before_release"])
+def test_failed_wake_goes_back_to_sleep(manager, tmp_path, free_port, failure):
+    attempts = threading.Event()
+
+    def start(name):
+        attempts.set()
+        if failure != "before_release":
+            manager.release(name)
+        if failure == "raises":
+            raise RuntimeError("JVM exited during startup")
+        return {"error": "Server exited during startup (code 1)"}
+
+    manager.hooks["start"] = start
+    manager.state["running"].clear()
+    manager.hibernate("s1")
+
+    _login(free_port)
+    assert attempts.wait(5)
+    for _ in range(50):
+        if manager.is_sleeping("s1") and not manager.listeners["s1"].woken.is_set():
+            break
+        time.sleep(0.1)
+    # A fresh listener holds the port again and the next login wakes again
+    assert manager.is_sleeping("s1")
+    assert os.path.exists(tmp_path / MARKER_FILE)
+    assert query_status("127.0.0.1", free_port)["version"]["name"] == "Sleeping"
+    attempts.clear()
+    _login(free_port)
+    assert attempts.wait(5)
+
+
+def test_concurrent_start_keeps_the_port(manager, free_port):
+    manager.hooks["start"] = lambda name: {"status": "already starting"}
+    manager.state["running"].clear()
+    manager.hibernate("s1")
+    manager.release("s1")
+    manager.wake("s1")
+    assert not manager.is_sleeping("s1")
@@ -0,0 +1,77 @@
+import pytest
+
+from live_properties import apply_live, is_error_response, live_command
+
+
+def test_live_command():
+    assert live_command("difficulty", "2") == "difficulty normal"
+    assert live_command("difficulty", " Hard ") == "difficulty hard"
+    assert live_command("difficulty", "nightmare") is None
+    assert live_command("gamemode", "creative") == "defaultgamemode creative"
+    assert live_command("white-list", "TRUE") == "whitelist on"
+    assert live_command("player-idle-timeout", "15") == "setidletimeout 15"
+    assert live_command("player-idle-timeout", "-1") is None
+    assert live_command("level-seed", "123") is None
+
+
+@pytest.mark.parametrize("response", [
+    "Unknown or incomplete command, see below for error",
+    "Incorrect argument for command",
+    "Expected integer",
+    "Invalid integer 'x'",
+    "Integer must not be less than 0, found -1",
+    "§cUnknown command. Type \"/help\" for help.",
+    "§cI'm sorry, but you do not have permission to perform this command.",
+])
+def test_error_responses(response):
+    assert is_error_response(response)
+
+
+@pytest.mark.parametrize("response", [
+    "The difficulty has been set to Normal",
+    "Nothing changed. The difficulty is already set to normal",
+    "Whitelist is now turned on",
+    "§aSet the player idle timeout to 15 minutes",
+    "",
+])
+def test_success_responses(response):
+    assert not is_error_response(response)
+
+
+def test_apply_live_splits_applied_and_failed_keys():
+    sent = []
+
+    def execute(commands):
+        sent.append(commands)
+        return ["The difficulty has been set to Hard", "§cInvalid integer"]
+
+    result = apply_live({"difficulty": "hard", "player-idle-timeout": "5", "motd": "hi"}, execute)
+    assert sent == [["difficulty hard", "setidletimeout 5"]]
+    assert result["applied_live"] == ["difficulty"]
+    assert result["restart_required"] == ["motd", "player-idle-timeout"]
+    assert result["live_errors"] == [{"key": "player-idle-timeout", "error": "§cInvalid integer"}]
+
+
+def test_apply_live_never_reports_keys_without_an_answer_as_applied():
+    result = apply_live({"difficulty": "hard", "white-list": "true"},
+                        lambda commands: ["The difficulty has been set to Hard"])
+    assert result["applied_live"] == ["difficulty"]
+    assert result["live_errors"] == [{"key": "white-list", "error": "No response"}]
+
+
+def test_apply_live_failed_connection_requires_restart():
+    def execute(commands):
+        raise ConnectionError("RCON refused")
+
+    result = apply_live({"difficulty": "hard", "white-list": "true"}, execute)
+    assert result["applied_live"] == []
+    assert result["restart_required"] == ["difficulty", "white-list"]
+    assert {e["error"] for e in result["live_errors"]} == {"RCON refused"}
+
+
+def test_nothing_live_sends_nothing():
+    def execute(commands):
+        raise AssertionError("no RCON round trip expected")
+
+    assert apply_live({"motd": "hi"}, execute) == {"applied_live": [], "restart_required": ["motd"],
+                                                   "live_errors": []}
@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+from log_reader import decode_cursor, encode_cursor, read_page, tail_lines
+
+
+@pytest.fixture
+def log(tmp_path):
+    path = tmp_path / "latest.log"
+    path.write_text("".join(f"line {i}\n" for i in range(1, 101)))
+    return str(path)
+
+
+@pytest.mark.parametrize("block_size", [4, 7, 64 * 1024])
+def test_tail_lines_across_block_boundaries(log, block_size):
+    assert tail_lines(log, 3, block_size) == ["line 98\n", "line 99\n", "line 100\n"]
+    assert len(tail_lines(log, 500, block_size)) == 100
+
+
+def test_cursor_round_trip_and_garbage():
+    assert decode_cursor(encode_cursor((5, 77), 1234)) == ((5, 77), 1234)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor((1, 2), -1))
+
+
+def test_pages_backwards_from_the_end(log):
+    page = read_page(log, lines=10, block_size=16)
+    assert page["lines"][0] == "line 91\n" and page["lines"][-1] == "line 100\n"
+    assert page["at_end"] and not page["at_start"]
+
+    older = read_page(log, page["prev"], "prev", lines=10, block_size=16)
+    assert older["lines"][0] == "line 81\n" and older["lines"][-1] == "line 90\n"
+    # next of the older page continues exactly where it ended
+    assert read_page(log, older["next"], "next", lines=10)["lines"] == page["lines"]
+
+
+def test_pages_forward_from_the_start(log):
+    page = read_page(log, direction="next", lines=60)
+    assert page["at_start"] and len(page["lines"]) == 60
+    rest = read_page(log, page["next"], "next", lines=60)
+    assert rest["lines"][0] == "line 61\n" and rest["at_end"]
+
+
+def test_half_written_last_line_is_held_back(log):
+    with open(log, "a") as f:
+        f.write("partial")
+    page = read_page(log, lines=2)
+    assert page["lines"] == ["line 99\n", "line 100\n"]
+    with open(log, "a") as f:
+        f.write(" done\n")
+    assert read_page(log, page["next"], "next")["lines"] == ["partial done\n"]
+
+
+def test_replaced_file_resets_cursor(log):
+    cursor = read_page(log, lines=5)["prev"]
+    os.remove(log)
+    with open(log, "w") as f:
+        f.write("fresh\n")
+    page = read_page(log, cursor, "prev")
+    assert page["reset"]
+    assert page["lines"] == ["fresh\n"]
+
+
+def test_invalid_direction(log):
+    with pytest.raises(ValueError):
+        read_page(log, direction="sideways")
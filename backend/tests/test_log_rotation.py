@@ -0,0 +1,95 @@
+import gzip
+import os
+import time
+
+from log_rotation import LogWriter, SegmentIndex, _compressor, compress_segment, segment_dir
+
+
+def _drain():
+    """Wait for the background compress/prune jobs (single worker, FIFO)"""
+    _compressor.submit(lambda: None).result(5)
+
+
+def test_size_counts_bytes_not_characters(tmp_path):
+    log = tmp_path / "server.log"
+    writer = LogWriter(str(log), max_bytes=100)
+    line = "ä" * 30 + "\n"  # 31 characters, 61 bytes
+    writer.write(line)
+    writer.write(line)  # 61 < 100: same file
+    writer.write(line)  # 122 >= 100: rotates before writing
+    writer.close()
+    _drain()
+    assert log.stat().st_size == 61
+    segments = SegmentIndex(segment_dir(str(log))).segments()
+    assert len(segments) == 1
+    with gzip.open(segments[0]["path"], "rb") as f:
+        assert len(f.read()) == 122
+
+
+def test_rotation_by_age_and_compression(tmp_path):
+    log = tmp_path / "server.log"
+    writer = LogWriter(str(log), max_age=3600)
+    writer.write("old\n")
+    writer._opened_at -= 7200
+    writer.write("new\n")
+    writer.close()
+    _drain()
+    assert log.read_text() == "new\n"
+    (segment,) = SegmentIndex(segment_dir(str(log))).segments()
+    assert segment["compressed"] and segment["file"].endswith(".log.gz")
+    with gzip.open(segment["path"], "rt") as f:
+        assert f.read() == "old\n"
+
+
+def test_rotations_within_one_second_get_distinct_names(tmp_path):
+    log = tmp_path / "server.log"
+    writer = LogWriter(str(log), max_bytes=1)
+    for i in range(3):
+        writer.write(f"{i}\n")
+    writer.close()
+    _drain()
+    files = [s["file"] for s in SegmentIndex(segment_dir(str(log))).load()]
+    assert len(files) == len(set(files)) == 2
+
+
+def _segment(index, name, end):
+    path = os.path.join(index.directory, name)
+    os.makedirs(index.directory, exist_ok=True)
+    with open(path, "w") as f:
+        f.write(name)
+    index.add({"file": name, "start": end - 10, "end": end, "size": len(name), "compressed": False})
+
+
+def test_prune_by_retention_and_count(tmp_path):
+    index = SegmentIndex(str(tmp_path / "server_logs"))
+    now = time.time()
+    for i, age_days in enumerate([30, 20, 5, 3, 1]):
+        _segment(index, f"s{i}.log", now - age_days * 86400)
+
+    assert index.prune(retention_days=14, max_segments=None, now=now) == ["s0.log", "s1.log"]
+    assert index.prune(retention_days=None, max_segments=2, now=now) == ["s2.log"]
+    assert [s["file"] for s in index.segments()] == ["s3.log", "s4.log"]
+    assert sorted(os.listdir(index.directory)) == ["s3.log", "s4.log", "segments.json"]
+
+
+def test_missing_files_are_dropped_from_the_index(tmp_path):
+    index = SegmentIndex(str(tmp_path / "server_logs"))
+    now = time.time()
+    _segment(index, "a.log", now)
+    _segment(index, "b.log", now)
+    os.remove(os.path.join(index.directory, "a.log"))
+    assert [s["file"] for s in index.segments()] == ["b.log"]
+    index.prune(None, None, now)
+    assert [s["file"] for s in index.load()] == ["b.log"]
+
+
+def test_compress_keeps_mtime_and_tolerates_pruned_segment(tmp_path):
+    index = SegmentIndex(str(tmp_path / "server_logs"))
+    _segment(index, "a.log", time.time())
+    path = os.path.join(index.directory, "a.log")
+    os.utime(path, (1000, 1000))
+    compress_segment(index, "a.log")
+    assert os.path.getmtime(path + ".gz") == 1000
+    assert not os.path.exists(path)
+    assert index.load()[0]["file"] == "a.log.gz"
+    compress_segment(index, "gone.log")
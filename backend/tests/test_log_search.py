@@ -0,0 +1,115 @@
+import gzip
+import os
+from datetime import date
+
+import pytest
+
+from log_search import INDEX_DIR, LogIndex, LogSearcher, line_seconds, local_timestamp, log_sources
+
+
+def _ts(day: date, clock: str) -> float:
+    h, m, s = (int(part) for part in clock.split(":"))
+    return local_timestamp(day, 0, h * 3600 + m * 60 + s)
+
+
+def _write_rotated(server_dir, name, lines):
+    os.makedirs(server_dir / "logs", exist_ok=True)
+    with gzip.open(server_dir / "logs" / name, "wt") as f:
+        f.write("".join(line + "\n" for line in lines))
+
+
+def _write_latest(server_dir, lines, mtime):
+    os.makedirs(server_dir / "logs", exist_ok=True)
+    path = server_dir / "logs" / "latest.log"
+    path.write_text("".join(line + "\n" for line in lines))
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def searcher():
+    searcher = LogSearcher(workers=2)
+    yield searcher
+    searcher.executor.shutdown()
+
+
+def _search(searcher, server_dir, query, **kwargs):
+    results = list(searcher.search(str(server_dir), query, **kwargs))
+    return results[:-1], results[-1]
+
+
+def test_line_seconds():
+    assert line_seconds("[01:02:03] [Server thread/INFO]: hi") == 3723
+    assert line_seconds("\x1b[0m[00:00:10 INFO]: hi") == 10
+    assert line_seconds("\tat java.lang.Thread.run") is None
+
+
+def test_candidate_blocks_match_substrings_of_tokens():
+    index = LogIndex({"steve": [0, 2], "joined": [0, 1, 2], "creeper": [1]}, None, None, 0, 0)
+    assert index.candidate_blocks("eve joined") == {0, 2}
+    assert index.candidate_blocks("zombie") == set()
+    assert index.candidate_blocks("!") is None
+
+
+def test_rotated_log_gets_an_index_and_is_dated_by_name(tmp_path, searcher):
+    day = date(2026, 1, 2)
+    _write_rotated(tmp_path, "2026-01-02-1.log.gz",
+                   ["[10:00:00] [Server thread/INFO]: Steve joined the game",
+                    "[10:00:05] [Server thread/INFO]: Alex joined the game"])
+    matches, summary = _search(searcher, tmp_path, "steve")
+    assert [(m["time"], m["file"], m["line"]) for m in matches] == [(_ts(day, "10:00:00"), "2026-01-02-1.log.gz", 1)]
+    assert summary == {"done": True, "matches": 1, "truncated": False, "files": 1}
+    assert (tmp_path / INDEX_DIR / "2026-01-02-1.log.gz.json").exists()
+
+    # Second search is answered with the index, a miss doesn't open the file
+    searcher.indexes.clear()
+    assert _search(searcher, tmp_path, "creeper")[0] == []
+    assert [m["line"] for m in _search(searcher, tmp_path, "alex")[0]] == [2]
+
+
+def test_deleted_rotated_log_drops_its_index(tmp_path, searcher):
+    _write_rotated(tmp_path, "2026-01-02-1.log.gz", ["[10:00:00] [Server thread/INFO]: hello"])
+    _search(searcher, tmp_path, "hello")
+    os.remove(tmp_path / "logs" / "2026-01-02-1.log.gz")
+    _search(searcher, tmp_path, "hello")
+    assert os.listdir(tmp_path / INDEX_DIR) == []
+
+
+def test_live_log_is_dated_from_mtime_across_midnight(tmp_path, searcher):
+    day = date(2026, 3, 5)
+    _write_latest(tmp_path, ["[23:59:50] [Server thread/INFO]: before midnight",
+                             "[00:00:10] [Server thread/INFO]: after midnight"],
+                  mtime=_ts(day, "00:05:00"))
+    matches, _ = _search(searcher, tmp_path, "midnight")
+    assert [m["time"] for m in matches] == [_ts(date(2026, 3, 4), "23:59:50"), _ts(day, "00:00:10")]
+
+
+def test_window_keeps_only_matches_inside_and_respects_limit(tmp_path, searcher):
+    day = date(2026, 3, 5)
+    lines = [f"[10:{minute:02d}:00] [Server thread/INFO]: tick {minute}" for minute in range(60)]
+    _write_latest(tmp_path, lines, mtime=_ts(day, "11:00:00"))
+
+    matches, summary = _search(searcher, tmp_path, "tick", start=_ts(day, "10:20:00"),
+                               end=_ts(day, "10:29:59"))
+    assert [m["text"][-7:] for m in matches] == [f"tick {minute}" for minute in range(20, 30)]
+
+    matches, summary = _search(searcher, tmp_path, "tick", start=_ts(day, "10:20:00"), limit=3)
+    assert [m["line"] for m in matches] == [21, 22, 23]
+    assert summary["truncated"]
+
+    # Rotated logs are dated by their name, no day count needed
+    _write_rotated(tmp_path, "2026-03-05-1.log.gz", lines)
+    scanned = searcher.scan(log_sources(str(tmp_path))[0], "tick", _ts(day, "10:58:00"), None, 100)
+    assert [number for _, number, _ in scanned] == [59, 60]
+
+
+def test_results_of_both_families_are_merged_in_time_order(tmp_path, searcher):
+    day = date(2026, 3, 5)
+    _write_latest(tmp_path, ["[10:00:00] [Server thread/INFO]: hello one",
+                             "[10:00:20] [Server thread/INFO]: hello three"], mtime=_ts(day, "10:01:00"))
+    console = tmp_path / "server.log"
+    console.write_text("[10:00:10] [Server thread/INFO]: hello two\n")
+    os.utime(console, (_ts(day, "10:01:00"), _ts(day, "10:01:00")))
+
+    matches, summary = _search(searcher, tmp_path, "hello")
+    assert [m["text"].split()[-1] for m in matches] == ["one", "two", "three"]
+    assert summary["files"] == 2
@@ -0,0 +1,39 @@
+import json
+from datetime import timedelta
+
+import pytest
+
+import auth
+
+
+@pytest.fixture(autouse=True)
+def users(tmp_path, monkeypatch):
+    users_file = tmp_path / "users.json"
+    users_file.write_text(json.dumps({"admin": {"username": "admin"}}))
+    monkeypatch.setattr(auth, "USERS_FILE", str(users_file))
+    monkeypatch.delenv("METRICS_TOKEN", raising=False)
+    monkeypatch.delenv("METRICS_PUBLIC", raising=False)
+
+
+def test_metrics_require_authentication_by_default():
+    assert not auth.metrics_authorized("")
+    assert not auth.metrics_authorized("Bearer nonsense")
+
+
+def test_metrics_token(monkeypatch):
+    monkeypatch.setenv("METRICS_TOKEN", "scrape-me")
+    assert auth.metrics_authorized("Bearer scrape-me")
+    assert not auth.metrics_authorized("Bearer scrape-you")
+
+
+def test_panel_jwt_is_accepted():
+    token = auth.create_access_token({"sub": "admin"})
+    assert auth.metrics_authorized(f"Bearer {token}")
+    expired = auth.create_access_token({"sub": "admin"}, expires_delta=timedelta(minutes=-1))
+    assert not auth.metrics_authorized(f"Bearer {expired}")
+    assert not auth.metrics_authorized(f"Bearer {auth.create_access_token({'sub': 'ghost'})}")
+
+
+def test_explicit_opt_out(monkeypatch):
+    monkeypatch.setenv("METRICS_PUBLIC", "true")
+    assert auth.metrics_authorized("")
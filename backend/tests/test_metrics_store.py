@@ -0,0 +1,99 @@
+import time
+
+from metrics_store import MetricsStore, RingSeries
+
+TIERS = [(10, 6), (60, 10)]
+
+
+def test_ring_averages_samples_per_bucket():
+    ring = RingSeries(10, 6)
+    ring.add(1000, 2.0)
+    ring.add(1005, 4.0)
+    ring.add(1010, 7.0)
+    assert ring.query(1000, 1020) == ([1000, 1010, 1020], [3.0, 7.0, None])
+
+
+def test_ring_overwrites_slots_after_one_lap():
+    ring = RingSeries(10, 6)
+    ring.add(1000, 1.0)
+    ring.add(1060, 5.0)  # same slot, one lap later
+    timestamps, values = ring.query(1000, 1060)
+    # Never more than one lap: the 1000 bucket is gone
+    assert timestamps[0] == 1010
+    assert values[-1] == 5.0
+    assert values[:-1] == [None] * 5
+
+
+def test_query_picks_coarser_tier_for_long_ranges(tmp_path):
+    store = MetricsStore(str(tmp_path), tiers=TIERS)
+    now = time.time()
+    for ts in range(int(now) - 300, int(now), 10):
+        store.record("s1", {"cpu": 50.0, "players": None}, ts=ts)
+
+    short = store.query("s1", ["cpu"], now - 40, now)
+    assert short["interval"] == 10
+    long = store.query("s1", ["cpu"], now - 300, now)
+    assert long["interval"] == 60
+    assert len(long["timestamps"]) == len(long["series"]["cpu"])
+    assert store.metrics("s1") == ["cpu"]
+
+
+def test_max_points_forces_coarser_tier(tmp_path):
+    store = MetricsStore(str(tmp_path), tiers=TIERS)
+    now = time.time()
+    assert store.query("s1", ["cpu"], now - 50, now, max_points=2)["interval"] == 60
+
+
+def test_max_points_merges_buckets_of_the_coarsest_tier(tmp_path):
+    store = MetricsStore(str(tmp_path))
+    now = time.time()
+    store.record("s1", {"cpu": 40.0}, ts=now - 3000)
+    result = store.query("s1", ["cpu"], now - 30 * 86400, now, max_points=500)
+    assert len(result["timestamps"]) == len(result["series"]["cpu"]) <= 500
+    assert result["interval"] == 600 * 9
+    assert result["timestamps"][1] - result["timestamps"][0] == result["interval"]
+    assert [v for v in result["series"]["cpu"] if v is not None] == [40.0]
+
+
+def test_merged_buckets_are_weighted_by_sample_count():
+    ring = RingSeries(10, 6)
+    ring.add(1000, 10.0)
+    ring.add(1001, 10.0)
+    ring.add(1010, 40.0)
+    # (10 + 10 + 40) / 3, not the mean of the two bucket averages
+    assert ring.query(1000, 1050, group=3) == ([1000, 1030], [20.0, None])
+    assert ring.query(1000, 1040, group=3) == ([1000, 1030], [20.0, None])
+
+
+def test_save_and_load_round_trip(tmp_path):
+    store = MetricsStore(str(tmp_path), tiers=TIERS)
+    now = time.time()
+    store.record("s1", {"cpu": 10.0, "ram": 512.0}, ts=now - 5)
+    store.save()
+
+    reloaded = MetricsStore(str(tmp_path), tiers=TIERS)
+    assert reloaded.metrics("s1") == ["cpu", "ram"]
+    result = reloaded.query("s1", ["cpu", "ram"], now - 20, now)
+    assert 10.0 in result["series"]["cpu"]
+    assert 512.0 in result["series"]["ram"]
+
+
+def test_changed_tier_layout_starts_over(tmp_path):
+    store = MetricsStore(str(tmp_path), tiers=TIERS)
+    store.record("s1", {"cpu": 10.0})
+    store.save("s1")
+    assert MetricsStore(str(tmp_path), tiers=[(5, 6)]).metrics("s1") == []
+
+
+def test_corrupt_file_is_ignored(tmp_path):
+    (tmp_path / "s1.bin").write_bytes(b"junk")
+    assert MetricsStore(str(tmp_path), tiers=TIERS).metrics("s1") == []
+
+
+def test_forget_removes_file(tmp_path):
+    store = MetricsStore(str(tmp_path), tiers=TIERS)
+    store.record("s1", {"cpu": 1.0})
+    store.save()
+    store.forget("s1")
+    assert not (tmp_path / "s1.bin").exists()
+    assert store.metrics("s1") == []
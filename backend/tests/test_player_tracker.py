@@ -0,0 +1,74 @@
+import os
+
+from player_tracker import PlayerTracker, ServerPresence
+
+
+def _append(path, *lines):
+    with open(path, "a") as f:
+        for line in lines:
+            f.write(line + "\n")
+
+
+def test_join_and_leave_update_the_online_set(tmp_path):
+    log = tmp_path / "latest.log"
+    _append(log, "[10:00:00] [Server thread/INFO]: Steve joined the game",
+            "[10:00:05] [Server thread/INFO]: Alex joined the game")
+    presence = ServerPresence(str(log))
+    presence.update()
+    assert set(presence.snapshot()) == {"Steve", "Alex"}
+
+    _append(log, "[10:01:00] [Server thread/INFO]: Steve left the game")
+    presence.update()
+    assert set(presence.snapshot()) == {"Alex"}
+
+
+def test_partial_line_is_applied_once_complete(tmp_path):
+    log = tmp_path / "latest.log"
+    log.write_text("[10:00:00] [Server thread/INFO]: Steve joined")
+    presence = ServerPresence(str(log))
+    presence.update()
+    assert presence.snapshot() == {}
+
+    _append(log, " the game")
+    presence.update()
+    assert set(presence.snapshot()) == {"Steve"}
+
+
+def test_new_log_file_clears_players(tmp_path):
+    log = tmp_path / "latest.log"
+    _append(log, "[10:00:00] [Server thread/INFO]: Steve joined the game")
+    presence = ServerPresence(str(log))
+    presence.update()
+    presence.reconciled = True
+
+    os.remove(log)
+    _append(log, "[11:00:00] [Server thread/INFO]: Done (3.2s)!")
+    assert presence.update() is True
+    assert presence.snapshot() == {}
+    assert presence.reconciled is False
+
+
+def test_reconcile_with_full_sample_replaces_log_state(tmp_path):
+    presence = ServerPresence(str(tmp_path / "latest.log"))
+    presence.players = {"Steve": 1.0, "Ghost": 2.0}
+    presence.reconcile({"players": {"online": 2, "sample": [{"name": "Steve"}, {"name": "Alex"}]}})
+    assert presence.players["Steve"] == 1.0
+    assert set(presence.players) == {"Steve", "Alex"}
+
+    presence.reconcile({"players": {"online": 0}})
+    assert presence.players == {}
+
+
+def test_stopped_server_is_forgotten(tmp_path):
+    log = tmp_path / "latest.log"
+    _append(log, "[10:00:00] [Server thread/INFO]: Steve joined the game")
+    running = {"s1"}
+    tracker = PlayerTracker()
+    tracker.configure(servers=lambda: ["s1"], is_running=lambda name: name in running,
+                      log_path=lambda name: str(log), get_port=lambda name: 1)
+    assert tracker.get_count("s1") == 1
+
+    running.clear()
+    tracker.poll()
+    assert "s1" not in tracker.servers
+    assert tracker.get_count("s1") == 0
@@ -0,0 +1,48 @@
+import subprocess
+import sys
+
+import pytest
+
+from process_tracker import ProcessTracker
+
+
+@pytest.fixture
+def child():
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+    yield proc
+    proc.kill()
+    proc.wait()
+
+
+def test_first_refresh_has_no_cpu_delta_yet(child):
+    tracker = ProcessTracker()
+    values = tracker.refresh("s1", child.pid)
+    assert values["pid"] == child.pid
+    assert values["cpu_percent"] is None
+    assert values["rss_mb"] > 0
+    assert tracker.refresh("s1", child.pid)["cpu_percent"] is not None
+
+
+def test_handle_is_reused_and_get_reads_the_cache(child):
+    tracker = ProcessTracker()
+    tracker.refresh("s1", child.pid)
+    handle = tracker.processes["s1"].handle
+    tracker.refresh("s1", child.pid)
+    assert tracker.processes["s1"].handle is handle
+    assert tracker.get("s1") is tracker.processes["s1"].values
+
+
+def test_exited_process_is_forgotten(child):
+    tracker = ProcessTracker()
+    tracker.refresh("s1", child.pid)
+    child.kill()
+    child.wait()
+    assert tracker.refresh("s1", child.pid) is None
+    assert "s1" not in tracker.processes
+
+
+def test_stopped_server_returns_none(child):
+    tracker = ProcessTracker()
+    tracker.refresh("s1", child.pid)
+    assert tracker.refresh("s1", None) is None
+    assert tracker.get("s1") is None
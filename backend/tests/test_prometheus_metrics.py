@@ -0,0 +1,74 @@
+import math
+
+import pytest
+
+from prometheus_metrics import Counter, Gauge, Histogram, Registry, format_sample, threadpool_metrics
+
+
+def test_format_sample_escapes_labels_and_values():
+    assert format_sample("up", {}, 1.0) == "up 1"
+    assert format_sample("x", {"server": 'a"b\\c\nd'}, 0.5) == 'x{server="a\\"b\\\\c\\nd"} 0.5'
+    assert format_sample("x", {}, math.nan) == "x NaN"
+    assert format_sample("x", {}, math.inf) == "x +Inf"
+
+
+def test_counter_and_gauge_render_per_label_set():
+    counter = Counter("reloads_total", "Reloads", ["result"])
+    counter.inc(result="ok")
+    counter.inc(2, result="ok")
+    counter.inc(result="error")
+    assert counter.render() == [
+        "# HELP reloads_total Reloads",
+        "# TYPE reloads_total counter",
+        'reloads_total{result="ok"} 3',
+        'reloads_total{result="error"} 1',
+    ]
+    gauge = Gauge("players", "Players", ["server"])
+    gauge.set(4, server="s1")
+    gauge.set(2, server="s1")
+    assert gauge.render()[-1] == 'players{server="s1"} 2'
+
+
+def test_wrong_labels_are_rejected():
+    with pytest.raises(ValueError):
+        Counter("c", "c", ["server"]).inc(host="x")
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("latency", "Latency", ["route"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value, route="/a")
+    lines = histogram.render()[2:]
+    assert lines == [
+        'latency_bucket{route="/a",le="0.1"} 1',
+        'latency_bucket{route="/a",le="1"} 3',
+        'latency_bucket{route="/a",le="+Inf"} 4',
+        'latency_sum{route="/a"} 4.25',
+        'latency_count{route="/a"} 4',
+    ]
+
+
+def test_registry_renders_collectors_and_survives_failing_ones():
+    registry = Registry()
+    registry.register(Gauge("static", "Static")).set(1)
+
+    def collector():
+        gauge = Gauge("collected", "Collected")
+        gauge.set(7)
+        return [gauge]
+
+    def broken():
+        raise RuntimeError("boom")
+
+    registry.register_collector(broken)
+    registry.register_collector(collector)
+    body = registry.render()
+    assert "static 1\n" in body
+    assert body.endswith("collected 7\n")
+
+
+def test_threadpool_metrics():
+    rendered = [line for metric in threadpool_metrics(3, 40, 1) for line in metric.render()]
+    assert "blockpanel_threadpool_in_use 3" in rendered
+    assert "blockpanel_threadpool_limit 40" in rendered
+    assert "blockpanel_threadpool_waiting 1" in rendered
@@ -0,0 +1,114 @@
+import socket
+import time
+
+import pytest
+
+from rcon_benchmark import FakeRconServer
+from rcon_client import (RconAuthError, RconConnection, RconError, RconPool, RconTimeout, encode_packet,
+                         SERVERDATA_AUTH, SERVERDATA_EXECCOMMAND)
+
+
+@pytest.fixture
+def fake():
+    server = FakeRconServer("secret").start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def pool(fake):
+    pool = RconPool(max_connections=2)
+    pool.configure(get_settings=lambda name: (fake.port, "secret"))
+    yield pool
+    pool.forget("s1")
+
+
+def test_fake_drops_clients_that_send_packets_together(fake):
+    # Guards the fake itself: it must catch coalesced packets like the vanilla server
+    with socket.create_connection(("127.0.0.1", fake.port), timeout=2) as sock:
+        sock.sendall(encode_packet(1, SERVERDATA_AUTH, "secret") + encode_packet(2, SERVERDATA_EXECCOMMAND, "list"))
+        assert sock.recv(4096) == b""
+    assert fake.protocol_errors == 1
+
+
+def test_execute(pool, fake):
+    assert pool.execute("s1", "list") == "There are 0 of a max of 20 players online: "
+    assert pool.execute("s1", "foo").startswith("Unknown or incomplete command")
+    assert fake.protocol_errors == 0
+
+
+def test_auth_failure(fake):
+    with pytest.raises(RconAuthError):
+        RconConnection("127.0.0.1", fake.port, "wrong")
+    pool = RconPool()
+    pool.configure(get_settings=lambda name: (fake.port, "wrong"))
+    with pytest.raises(RconAuthError):
+        pool.execute("s1", "list")
+    # The failed connection doesn't count against the pool
+    assert pool.open_count["s1"] == 0
+
+
+@pytest.mark.parametrize("size", [10, 4095, 4096, 4097, 10000, 3 * 4096])
+def test_multi_packet_response(pool, fake, size):
+    assert pool.execute("s1", f"big {size}") == "x" * size
+    # The connection is still in sync afterwards
+    assert pool.execute("s1", "list").startswith("There are")
+    assert fake.protocol_errors == 0
+
+
+def test_execute_many_runs_commands_in_order(pool, fake):
+    responses = pool.execute_many("s1", ["list", "big 9000", "nope", "list"])
+    assert [len(r) for r in responses[:2]] == [len("There are 0 of a max of 20 players online: "), 9000]
+    assert responses[2].startswith("Unknown")
+    assert responses[3] == responses[0]
+    assert fake.connections == 1
+    assert fake.protocol_errors == 0
+
+
+def test_pool_reuses_connections(pool, fake):
+    for _ in range(20):
+        pool.execute("s1", "list")
+    assert fake.connections == 1
+    assert pool.open_count["s1"] == 1
+
+
+def test_changed_settings_reconnect(fake):
+    settings = {"password": "secret"}
+    pool = RconPool()
+    pool.configure(get_settings=lambda name: (fake.port, settings["password"]))
+    pool.execute("s1", "list")
+    fake.password = settings["password"] = "rotated"
+    pool.execute("s1", "list")
+    assert fake.connections == 2
+    pool.forget("s1")
+
+
+def test_timeout_discards_the_connection(fake):
+    fake.delay = 0.5
+    pool = RconPool()
+    pool.configure(get_settings=lambda name: (fake.port, "secret"))
+    started = time.monotonic()
+    with pytest.raises(RconTimeout):
+        pool.execute("s1", "list", timeout=0.2)
+    assert time.monotonic() - started < 0.45
+    assert pool.open_count["s1"] == 0
+    # A late answer on the old connection can't end up as the response of the next command
+    fake.delay = 0
+    assert pool.execute("s1", "big 5") == "xxxxx"
+    assert fake.connections == 2
+
+
+def test_disabled_rcon_and_unreachable_port(free_port):
+    pool = RconPool()
+    pool.configure(get_settings=lambda name: None)
+    with pytest.raises(RconError, match="not enabled"):
+        pool.execute("s1", "list")
+    pool.configure(get_settings=lambda name: (free_port, "secret"))
+    with pytest.raises(RconError, match="Could not connect"):
+        pool.execute("s1", "list")
+    assert pool.open_count["s1"] == 0
+
+
+def test_too_long_command_is_rejected_before_sending(pool):
+    with pytest.raises(RconError, match="too long"):
+        pool.execute("s1", "say " + "x" * 2000)
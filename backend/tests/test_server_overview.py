@@ -0,0 +1,95 @@
+import threading
+import time
+
+from server_overview import OverviewCollector
+
+
+def _collector(state):
+    collector = OverviewCollector(interval=5)
+    calls = []
+
+    def collect(name):
+        calls.append(name)
+        if state[name] is None:
+            raise OSError("gone")
+        return dict(state[name])
+
+    collector.configure(servers=lambda: list(state), collect=collect)
+    collector.calls = calls
+    return collector
+
+
+def test_diff_reports_changed_fields_added_and_removed_servers():
+    old = {"a": {"status": "running", "ram": 100}, "b": {"status": "stopped"}}
+    new = {"a": {"status": "running", "ram": 120}, "c": {"status": "stopped"}}
+    assert OverviewCollector.diff(old, new) == {"a": {"ram": 120}, "c": {"status": "stopped"}, "b": None}
+
+
+def test_refresh_notifies_subscribers_only_with_changes():
+    state = {"a": {"status": "running", "players": 0}}
+    collector = _collector(state)
+    received = []
+    collector.subscribe(received.append)
+
+    collector.refresh()
+    collector.refresh()
+    state["a"]["players"] = 3
+    collector.refresh()
+    assert received == [{"a": {"status": "running", "players": 0}}, {"a": {"players": 3}}]
+
+
+def test_failing_server_is_left_out_of_snapshot():
+    collector = _collector({"a": {"status": "running"}, "b": None})
+    assert collector.refresh() == {"a": {"status": "running"}}
+
+
+def test_get_shares_a_fresh_snapshot():
+    collector = _collector({"a": {"status": "running"}})
+    collector.get()
+    collector.get()
+    assert collector.calls == ["a"]
+
+
+def test_unsubscribed_and_failing_listeners_do_not_block_others():
+    state = {"a": {"status": "stopped"}}
+    collector = _collector(state)
+    received, dropped = [], []
+
+    def broken(changes):
+        raise RuntimeError("socket gone")
+
+    collector.subscribe(broken)
+    collector.subscribe(dropped.append)
+    collector.subscribe(received.append)
+    collector.unsubscribe(dropped.append)
+    collector.unsubscribe(dropped.append)  # twice is fine
+    collector.refresh()
+    assert received == [{"a": {"status": "stopped"}}]
+    assert dropped == []
+
+
+def test_deleted_server_is_pushed_as_none():
+    state = {"a": {"status": "stopped"}, "b": {"status": "stopped"}}
+    collector = _collector(state)
+    collector.refresh()
+    received = []
+    collector.subscribe(received.append)
+    del state["b"]
+    collector.refresh()
+    assert received == [{"b": None}]
+
+
+def test_request_refresh_wakes_the_collector():
+    state = {"a": {"status": "stopped"}}
+    collector = _collector(state)
+    collector.interval = 60
+    changed = threading.Event()
+    collector.subscribe(lambda changes: changed.set() if changes.get("a") == {"status": "running"} else None)
+    collector.start()
+    # First pass runs at once because there is a subscriber
+    deadline = time.time() + 5
+    while not collector.collected_at and time.time() < deadline:
+        time.sleep(0.01)
+    state["a"]["status"] = "running"
+    collector.request_refresh()
+    assert changed.wait(5)
@@ -0,0 +1,107 @@
+import os
+import stat
+
+import pytest
+
+from server_properties import PropertiesStore, parse_properties, validate_changes
+
+CONTENT = "#Minecraft server properties\n#Sun Jan 04 10:00:00 UTC 2026\nmotd=A Minecraft Server\n\n" \
+          "difficulty=easy\nserver-port=25565\n"
+
+
+@pytest.fixture
+def props(tmp_path):
+    path = tmp_path / "server.properties"
+    path.write_text(CONTENT)
+    return str(path)
+
+
+def test_parse_skips_comments_and_last_key_wins():
+    assert parse_properties(["# comment\n", "! also\n", "\n", "a = 1\n", "b=x=y\n", "a=2\n"]) == {"a": "2", "b": "x=y"}
+
+
+@pytest.mark.parametrize("changes", [
+    {"": "x"}, {" motd": "x"}, {"#motd": "x"}, {"!motd": "x"}, {"a=b": "x"}, {"a:b": "x"}, {"a b": "x"},
+    {"motd": "two\nlines"}, {"motd": "two\rlines"},
+])
+def test_validate_rejects_what_doesnt_fit_one_line(changes):
+    with pytest.raises(ValueError):
+        validate_changes(changes)
+
+
+def test_validate_accepts_regular_values():
+    validate_changes({"motd": "Hello = World: §aGreen", "level-seed": "-123", "resource-pack": ""})
+
+
+def test_update_keeps_comments_order_and_appends_new_keys(props):
+    store = PropertiesStore()
+    changed = store.update(props, {"difficulty": "hard", "motd": "A Minecraft Server", "pvp": "false"})
+    assert changed == {"difficulty": "hard", "pvp": "false"}
+    assert open(props).read() == CONTENT.replace("difficulty=easy", "difficulty=hard") + "pvp=false\n"
+    assert store.update(props, {"difficulty": "hard"}) == {}
+
+
+def test_update_is_atomic_and_keeps_the_mode(props):
+    os.chmod(props, 0o640)
+    inode = os.stat(props).st_ino
+    store = PropertiesStore()
+    store.update(props, {"motd": "new"})
+    # Written to a temp file and renamed over the original
+    assert os.stat(props).st_ino != inode
+    assert stat.S_IMODE(os.stat(props).st_mode) == 0o640
+    assert os.listdir(os.path.dirname(props)) == ["server.properties"]
+
+
+def test_rejected_update_leaves_the_file_alone(props):
+    store = PropertiesStore()
+    with pytest.raises(ValueError):
+        store.update(props, {"motd": "ok", "bad\nkey": "x"})
+    assert open(props).read() == CONTENT
+
+
+def test_missing_file_is_created_on_update(tmp_path):
+    store = PropertiesStore()
+    path = str(tmp_path / "server.properties")
+    assert store.read(path) == {}
+    assert store.get(path, "motd", "default") == "default"
+    store.update(path, {"motd": "hi"})
+    assert open(path).read() == "motd=hi\n"
+
+
+def test_file_without_trailing_newline(tmp_path):
+    path = tmp_path / "server.properties"
+    path.write_text("motd=hi")
+    PropertiesStore().update(str(path), {"pvp": "true"})
+    assert path.read_text() == "motd=hi\npvp=true\n"
+
+
+def test_cache_is_refreshed_when_the_file_changes(props):
+    store = PropertiesStore()
+    assert store.get(props, "difficulty") == "easy"
+    # Edited outside the panel: different size
+    with open(props, "a") as f:
+        f.write("pvp=false\n")
+    assert store.get(props, "pvp") == "false"
+    # Same size, only the mtime differs
+    with open(props, "w") as f:
+        f.write(CONTENT.replace("easy", "hard"))
+    st = os.stat(props)
+    os.utime(props, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert store.read(props)["difficulty"] == "hard"
+    os.remove(props)
+    assert store.read(props) == {}
+    assert props not in store.cache
+
+
+def test_cache_is_reused_while_unchanged(props, monkeypatch):
+    store = PropertiesStore()
+    store.read(props)
+    monkeypatch.setattr("builtins.open", lambda *args, **kwargs: pytest.fail("file re-read"))
+    assert store.read(props)["motd"] == "A Minecraft Server"
+
+
+def test_forget_drops_a_servers_files(tmp_path, props):
+    store = PropertiesStore()
+    store.read(props)
+    store.forget(str(tmp_path) + os.sep)
+    assert store.cache == {}
@@ -0,0 +1,164 @@
+import time
+
+import pytest
+
+from metrics_sampler import MetricsSampler
+from metrics_store import MetricsStore
+from rcon_client import RconError, RconTimeout
+from tick_monitor import UNSUPPORTED_RETRY, TickMonitor, parse_mspt, parse_tps
+
+
+def test_parse_mspt():
+    values = parse_mspt("§6Server tick times §e(§7avg§e/§7min§e/§7max§e)§6 from last 5s§7,§6 10s§7,§6 1m§e:\n"
+                        "§6◴ §a40.0§7/§a12.5§7/§c80.1§7, §a0.6/0.4/1.7§7, §a0.6/0.4/1.7")
+    assert values == {"mspt": 40.0, "mspt_max": 80.1, "tps": 20.0}
+    assert parse_mspt("◴ 100.0/90.0/120.0")["tps"] == 10.0
+    assert parse_mspt("◴ 0.0/0.0/0.0")["tps"] == 20.0
+    assert parse_mspt("Unknown or incomplete command") is None
+
+
+def test_parse_tps():
+    assert parse_tps("§6TPS from last 1m, 5m, 15m: §a*20.0, §a19.97, §a20.0") == {"tps": 20.0}
+    assert parse_tps("TPS from last 1m, 5m, 15m: 17.5, 19.0, 19.9") == {"tps": 17.5}
+    assert parse_tps("Unknown command") is None
+
+
+class FakeQuery:
+    def __init__(self):
+        self.answers = {}
+        self.commands = []
+
+    def __call__(self, servername, command, timeout):
+        self.commands.append(command)
+        answer = self.answers.get(command, "Unknown or incomplete command")
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+
+@pytest.fixture
+def monitor():
+    monitor = TickMonitor(mspt_threshold=50, tps_threshold=18, sustain=30)
+    query = FakeQuery()
+    monitor.configure(query)
+    return monitor, query
+
+
+def test_sustained_breach_raises_lag_and_recovery(monitor):
+    monitor, query = monitor
+    query.answers["mspt"] = "◴ 10.0/5.0/15.0"
+    monitor.sample("s1", 1000)
+    query.answers["mspt"] = "◴ 80.0/60.0/120.0"
+    monitor.sample("s1", 1010)
+    monitor.sample("s1", 1030)
+    assert monitor.get_events() == []
+    monitor.sample("s1", 1040)
+    [lag] = monitor.get_events()
+    assert lag["type"] == "lag" and lag["since"] == 1010 and lag["mspt"] == 80.0 and not lag["unresponsive"]
+
+    query.answers["mspt"] = "◴ 10.0/5.0/15.0"
+    monitor.sample("s1", 1050)
+    # A short dip back below the threshold doesn't end the alert
+    query.answers["mspt"] = "◴ 90.0/60.0/120.0"
+    monitor.sample("s1", 1060)
+    query.answers["mspt"] = "◴ 10.0/5.0/15.0"
+    monitor.sample("s1", 1070)
+    monitor.sample("s1", 1100)
+    events = monitor.get_events(since=lag["id"])
+    assert [e["type"] for e in events] == ["lag_recovered"]
+    assert events[0]["duration"] == 60 and events[0]["worst_mspt"] == 90.0
+
+
+def test_short_breach_raises_nothing(monitor):
+    monitor, query = monitor
+    query.answers["mspt"] = "◴ 80.0/60.0/120.0"
+    monitor.sample("s1", 1000)
+    query.answers["mspt"] = "◴ 10.0/5.0/15.0"
+    monitor.sample("s1", 1020)
+    query.answers["mspt"] = "◴ 80.0/60.0/120.0"
+    monitor.sample("s1", 1040)
+    monitor.sample("s1", 1060)
+    assert monitor.get_events() == []
+
+
+def test_timeouts_count_as_breach(monitor):
+    monitor, query = monitor
+    query.answers["mspt"] = RconTimeout("timed out")
+    assert monitor.sample("s1", 1000) == {}
+    assert monitor.sample("s1", 1030) == {}
+    [lag] = monitor.get_events()
+    assert lag["unresponsive"] and lag["mspt"] is None and lag["tps"] is None
+    # Other RCON errors (RCON down, server stopping) don't
+    query.answers["mspt"] = RconError("Could not connect")
+    monitor.sample("s2", 1000)
+    monitor.sample("s2", 1100)
+    assert len(monitor.get_events()) == 1
+
+
+def test_falls_back_to_tps_then_unsupported(monitor):
+    monitor, query = monitor
+    query.answers["tps"] = "TPS from last 1m, 5m, 15m: 17.0, 19.0, 19.9"
+    assert monitor.sample("s1", 1000) == {}
+    assert monitor.sample("s1", 1010) == {"tps": 17.0}
+    assert query.commands == ["mspt", "tps"]
+
+    del query.answers["tps"]
+    monitor.sample("s1", 1020)
+    monitor.sample("s1", 1030)
+    assert monitor.sample("s1", 1040) == {}
+    # Unsupported servers aren't asked again until the retry interval has passed
+    assert query.commands == ["mspt", "tps", "tps"]
+    monitor.sample("s1", 1020 + UNSUPPORTED_RETRY)
+    assert query.commands[-1] == "mspt"
+
+
+def test_forget_closes_an_open_alert(monitor):
+    monitor, query = monitor
+    query.answers["mspt"] = "◴ 80.0/60.0/120.0"
+    monitor.sample("s1", 1000)
+    monitor.sample("s1", 1030)
+    monitor.forget("s1")
+    assert [e["type"] for e in monitor.get_events("s1")] == ["lag", "lag_recovered"]
+    assert monitor.get_events("s1")[-1]["stopped"]
+    # Next start begins with mspt and a fresh state
+    assert "s1" not in monitor.states
+    monitor.forget("s1")
+    assert len(monitor.get_events()) == 2
+
+
+def test_sample_is_dated_when_the_answer_arrives(monitor):
+    monitor, query = monitor
+    answer = query.__call__
+
+    def slow(servername, command, timeout):
+        time.sleep(0.2)
+        return answer(servername, command, timeout)
+
+    monitor.configure(slow)
+    query.answers["mspt"] = "◴ 80.0/60.0/120.0"
+    before = time.time()
+    monitor.sample("s1")
+    assert monitor.states["s1"].breach_since >= before + 0.2
+
+
+def test_sampler_queries_servers_concurrently(tmp_path, monkeypatch):
+    monkeypatch.setattr("metrics_sampler.established_sessions", lambda: {})
+    sampler = MetricsSampler(store=MetricsStore(str(tmp_path)))
+    monkeypatch.setattr(sampler.processes, "refresh",
+                        lambda name, pid: {"cpu_percent": 1.0, "rss_mb": 100.0, "threads": 10})
+    monkeypatch.setattr(sampler, "_disk_mb", lambda name, now: 1.0)
+
+    def tick_health(name):
+        time.sleep(0.3)
+        return {"tps": 20.0, "mspt": 5.0} if name != "broken" else {}
+
+    servers = ["a", "b", "c", "d", "broken"]
+    sampler.configure(servers=lambda: servers, get_pid=lambda name: 1, player_count=lambda name: 0,
+                      server_dir=lambda name: str(tmp_path), get_port=lambda name: 25565, tick_health=tick_health)
+    started = time.monotonic()
+    sampler.sample()
+    # Five slow servers take about as long as one
+    assert time.monotonic() - started < 0.9
+    assert sampler.latest["a"]["tps"] == 20.0 and sampler.latest["a"]["mspt"] == 5.0
+    assert sampler.latest["broken"]["tps"] is None
+    sampler.tick_executor.shutdown()
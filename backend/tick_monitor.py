@@ -0,0 +1,178 @@
+"""
+Tick Monitor für Minecraft Server
+Reads tick health over RCON with one query per sample: Purpur/Paper `mspt`
+(milliseconds per tick, TPS derived from it), `tps` as fallback for servers
+without it. Sustained lag raises events (lag / lag_recovered).
+"""
+import os
+import re
+import time
+import logging
+import itertools
+from collections import deque
+from typing import Callable, Dict, List, Optional
+from threading import Lock
+
+from rcon_client import RconError, RconTimeout
+
+logger = logging.getLogger(__name__)
+
+FORMAT_RE = re.compile(r"§[0-9a-fk-orx]|\x1b\[[0-9;]*m", re.IGNORECASE)
+# "◴ 0.6/0.5/1.1, 0.6/0.4/1.7, 0.6/0.4/1.7" -> avg/min/max of the last 5s, 10s, 1m
+MSPT_RE = re.compile(r"(\d+(?:\.\d+)?)/(\d+(?:\.\d+)?)/(\d+(?:\.\d+)?)")
+# "TPS from last 1m, 5m, 15m: 20.0, 19.97, *20.0"
+TPS_RE = re.compile(r"TPS from last[^:]*:\s*\*?(\d+(?:\.\d+)?)")
+
+# Servers that answer neither command are asked again after this long
+UNSUPPORTED_RETRY = 600.0
+
+
+def strip_formatting(text: str) -> str:
+    return FORMAT_RE.sub("", text)
+
+
+def parse_mspt(text: str) -> Optional[Dict[str, float]]:
+    """Average and max MSPT of the last 5 seconds, TPS derived from the average"""
+    m = MSPT_RE.search(strip_formatting(text))
+    if not m:
+        return None
+    avg, peak = float(m.group(1)), float(m.group(3))
+    tps = min(20.0, 1000.0 / avg) if avg > 0 else 20.0
+    return {"mspt": avg, "mspt_max": peak, "tps": round(tps, 2)}
+
+
+def parse_tps(text: str) -> Optional[Dict[str, float]]:
+    """TPS of the last minute"""
+    m = TPS_RE.search(strip_formatting(text))
+    if not m:
+        return None
+    return {"tps": float(m.group(1))}
+
+
+class TickState:
+    def __init__(self):
+        self.mode = "mspt"
+        self.unsupported_at = 0.0
+        self.breach_since: Optional[float] = None
+        self.ok_since: Optional[float] = None
+        self.alerting = False
+        self.alert_started: Optional[float] = None
+        self.worst_mspt: Optional[float] = None
+        self.min_tps: Optional[float] = None
+
+
+class TickMonitor:
+    def __init__(self,
+                 mspt_threshold: float = float(os.environ.get("MC_MSPT_ALERT", "50")),
+                 tps_threshold: float = float(os.environ.get("MC_TPS_ALERT", "18")),
+                 sustain: float = float(os.environ.get("MC_TICK_ALERT_SECONDS", "30")),
+                 query_timeout: float = 2.0,
+                 max_events: int = 1000):
+        self.mspt_threshold = mspt_threshold
+        self.tps_threshold = tps_threshold
+        # A breach (or the recovery from it) must last this long before an event is raised
+        self.sustain = sustain
+        self.query_timeout = query_timeout
+        self.lock = Lock()
+        self.states: Dict[str, TickState] = {}
+        self.events = deque(maxlen=max_events)
+        self.event_ids = itertools.count(1)
+        self.query: Optional[Callable[[str, str, float], str]] = None
+
+    def configure(self, query: Callable[[str, str, float], str]):
+        """query(servername, command, timeout) -> response text (RCON)"""
+        self.query = query
+
+    def _state(self, servername: str) -> TickState:
+        with self.lock:
+            return self.states.setdefault(servername, TickState())
+
+    def sample(self, servername: str, now: Optional[float] = None) -> Dict[str, Optional[float]]:
+        """One query against a running server; {} when tick health can't be read.
+        Without `now` the sample is dated when the answer (or the timeout) arrives."""
+        measured = now
+        now = now or time.time()
+        state = self._state(servername)
+        if self.query is None or (state.mode == "unsupported" and now - state.unsupported_at < UNSUPPORTED_RETRY):
+            return {}
+        if state.mode == "unsupported":
+            state.mode = "mspt"
+        command, parser = ("mspt", parse_mspt) if state.mode == "mspt" else ("tps", parse_tps)
+        try:
+            values = parser(self.query(servername, command, self.query_timeout))
+        except RconTimeout:
+            # The command waits for the main thread: no answer in time is a stalled server
+            self._evaluate(servername, state, None, True, measured or time.time())
+            return {}
+        except RconError as e:
+            logger.debug(f"Tick sample of {servername} failed: {e}")
+            return {}
+        if values is None:
+            # Next interval tries the fallback, no second query in this one
+            if state.mode == "mspt":
+                state.mode = "tps"
+            else:
+                state.mode = "unsupported"
+                state.unsupported_at = now
+                logger.info(f"Tick monitor: {servername} answers neither mspt nor tps")
+            return {}
+        breached = (values.get("mspt") is not None and values["mspt"] > self.mspt_threshold) or \
+            values["tps"] < self.tps_threshold
+        self._evaluate(servername, state, values, breached, measured or time.time())
+        return values
+
+    def _evaluate(self, servername: str, state: TickState, values: Optional[Dict[str, float]],
+                  breached: bool, now: float):
+        if values:
+            if values.get("mspt") is not None and (state.worst_mspt is None or values["mspt"] > state.worst_mspt):
+                state.worst_mspt = values["mspt"]
+            if state.min_tps is None or values["tps"] < state.min_tps:
+                state.min_tps = values["tps"]
+        if breached:
+            state.ok_since = None
+            if state.breach_since is None:
+                state.breach_since = now
+                if not state.alerting:
+                    state.worst_mspt = values.get("mspt") if values else None
+                    state.min_tps = values["tps"] if values else None
+            if not state.alerting and now - state.breach_since >= self.sustain:
+                state.alerting = True
+                state.alert_started = state.breach_since
+                logger.warning(f"Tick monitor: {servername} lagging since {int(now - state.breach_since)}s "
+                               f"(mspt {state.worst_mspt}, tps {state.min_tps})")
+                self._emit("lag", servername, now, since=state.breach_since,
+                           mspt=values.get("mspt") if values else None,
+                           tps=values["tps"] if values else None,
+                           unresponsive=values is None)
+            return
+        state.breach_since = None
+        if not state.alerting:
+            return
+        if state.ok_since is None:
+            state.ok_since = now
+        if now - state.ok_since >= self.sustain:
+            state.alerting = False
+            logger.info(f"Tick monitor: {servername} recovered")
+            self._emit("lag_recovered", servername, now, duration=round(state.ok_since - state.alert_started, 1),
+                       worst_mspt=state.worst_mspt, min_tps=state.min_tps)
+
+    def _emit(self, event_type: str, servername: str, now: float, **data):
+        with self.lock:
+            self.events.append({"id": next(self.event_ids), "type": event_type, "server": servername,
+                                "time": now, **data})
+
+    def get_events(self, servername: Optional[str] = None, since: int = 0, limit: int = 100) -> List[Dict]:
+        with self.lock:
+            events = [e for e in self.events if e["id"] > since and (servername is None or e["server"] == servername)]
+        return events[-limit:]
+
+    def forget(self, servername: str):
+        """Server stopped: start with mspt again next time, drop open breaches"""
+        with self.lock:
+            state = self.states.pop(servername, None)
+        if state and state.alerting:
+            self._emit("lag_recovered", servername, time.time(), duration=None, stopped=True,
+                       worst_mspt=state.worst_mspt, min_tps=state.min_tps)
+
+# Global instance
+tick_monitor = TickMonitor()
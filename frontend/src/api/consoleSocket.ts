@@ -0,0 +1,40 @@
+import { API_BASE } from "../config/api";
+
+export interface ConsoleHandlers {
+  onLines: (lines: string[]) => void;
+  onEvent?: (event: any) => void;
+  onClose?: () => void;
+}
+
+// Live-Konsole eines Servers per WebSocket (Backlog + neue Zeilen, Befehle über denselben Kanal)
+export function openConsoleSocket(servername: string, token: string | null | undefined, handlers: ConsoleHandlers, lines: number = 100) {
+  const authToken = token ?? localStorage.getItem("token") ?? "";
+  const protocol = window.location.protocol === "https:" ? "wss" : "ws";
+  const socket = new WebSocket(
+    `${protocol}://${window.location.host}${API_BASE}/server/console/ws?servername=${encodeURIComponent(servername)}&lines=${lines}&token=${encodeURIComponent(authToken)}`
+  );
+  socket.onmessage = (event) => {
+    const message = JSON.parse(event.data);
+    if (message.type === "lines") {
+      handlers.onLines(message.lines);
+    } else if (message.type === "dropped") {
+      handlers.onLines([`... ${message.count} lines skipped ...\n`]);
+    } else if (handlers.onEvent) {
+      handlers.onEvent(message);
+    }
+  };
+  socket.onclose = () => {
+    if (handlers.onClose) handlers.onClose();
+  };
+  return {
+    socket,
+    sendCommand(command: string) {
+      if (socket.readyState === WebSocket.OPEN) {
+        socket.send(JSON.stringify({ type: "command", command }));
+      }
+    },
+    close() {
+      socket.close();
+    },
+  };
+}
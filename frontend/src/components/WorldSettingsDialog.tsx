@@ -51,32 +51,22 @@ const WorldSettingsDialog: React.FC<WorldSettingsDialogProps> = ({
     if (!servername) return;
     const token = localStorage.getItem("token");
     const headers = {
-      "Content-Type": "application/x-www-form-urlencoded",
+      "Content-Type": "application/json",
       Authorization: token ? `Bearer ${token}` : ""
     };
     try {
-      // Seed setzen
-      await fetch(`/api/server/properties/set-seed`, {
+      // Alle Werte in einem Request: ein Schreibvorgang, ein RCON-Batch
+      await fetch(`/api/server/properties/batch?servername=${encodeURIComponent(servername)}`, {
         method: "POST",
         headers,
-        body: new URLSearchParams({ servername, seed })
-      });
-      // Nether und End gemeinsam setzen
-      await fetch(`/api/server/properties/set-nether`, {
-        method: "POST",
-        headers,
-        body: new URLSearchParams({ servername, allow: netherEnd ? "true" : "false" })
-      });
-      await fetch(`/api/server/properties/set`, {
-        method: "POST",
-        headers,
-        body: new URLSearchParams({ servername, key: "allow-end", value: netherEnd ? "true" : "false" })
-      });
-      // Difficulty setzen
-      await fetch(`/api/server/properties/set-difficulty`, {
-        method: "POST",
-        headers,
-        body: new URLSearchParams({ servername, difficulty })
+        body: JSON.stringify({
+          properties: {
+            "level-seed": seed,
+            "allow-nether": netherEnd,
+            "allow-end": netherEnd,
+            difficulty
+          }
+        })
       });
     } catch (e) {
       // Fehlerbehandlung kann hier ergänzt werden
@@ -63,64 +63,31 @@ function parsePercent(used: string, max: string): string {
 
   useEffect(() => {
     let isMounted = true;
+    let socket: WebSocket | null = null;
+    let poll: ReturnType<typeof setInterval> | null = null;
+    let reconnect: ReturnType<typeof setTimeout> | null = null;
+    // Letzter bekannter Stand, WebSocket-Updates enthalten nur geänderte Felder
+    let server: any = {};
+
+    function applyServer(data: any) {
+      setStatus(data.status ?? "");
+      setRam(data.ram_allocated !== undefined ? data.ram_allocated : "?");
+      setUptime(data.uptime !== undefined && data.uptime !== null ? data.uptime + " s" : "0 s");
+      setPlayerCount(data.player_count !== undefined ? String(data.player_count) : "?");
+      setMaxPlayers(data.max_players !== undefined ? String(data.max_players) : "?");
+      setVersion(data.version ?? "?");
+      setPlugins(Array.isArray(data.plugins) ? data.plugins : []);
+      setRamUsed(data.status === "running" && data.ram_used !== undefined && data.ram_used !== null ? data.ram_used + " MB" : "?");
+      setLogs(data.status === "running" ? data.logs ?? "" : "");
+    }
+
     async function fetchAllStats() {
       setLoading(true);
       try {
-        // Status (always available)
-        console.log("[ServerStats] Fetching status for", serverName);
-        const statusData = await fetchJson(`${API_BASE}/server/status?servername=${encodeURIComponent(serverName ?? "")}`, getAuthOptions());
-        if (isMounted) setStatus(statusData.status ?? "");
-
-        // Max RAM (always available)
-        console.log("[ServerStats] Fetching ram for", serverName);
-        const ramData = await fetchJson(`${API_BASE}/server/ram?servername=${encodeURIComponent(serverName ?? "")}`, getAuthOptions());
-        if (isMounted) setRam(ramData.ram !== undefined ? ramData.ram : "?");
-
-  // ...existing code...
-        // Uptime (always available, returns 0 if offline)
-        console.log("[ServerStats] Fetching uptime for", serverName);
-        const uptimeData = await fetchJson(`${API_BASE}/server/uptime?servername=${encodeURIComponent(serverName ?? "")}`, getAuthOptions());
-        if (isMounted) setUptime(uptimeData.uptime !== undefined ? uptimeData.uptime + " s" : "?");
-
-        // Player Count (always available)
-        console.log("[ServerStats] Fetching playercount for", serverName);
-        const playerData = await fetchJson(`${API_BASE}/server/playercount?servername=${encodeURIComponent(serverName ?? "")}`, getAuthOptions());
-        if (isMounted) {
-          setPlayerCount(playerData.player_count !== undefined ? playerData.player_count : "?");
-          setMaxPlayers(playerData.max_players !== undefined ? playerData.max_players : "?");
-        }
-
-        // Version (always available)
-        console.log("[ServerStats] Fetching version for", serverName);
-        const versionData = await fetchJson(`${API_BASE}/server/version?servername=${encodeURIComponent(serverName ?? "")}`, getAuthOptions());
-        if (isMounted) setVersion(versionData.version !== undefined ? versionData.version : "?");
-
-        // Plugins (always available)
-        console.log("[ServerStats] Fetching plugins for", serverName);
-        const pluginsData = await fetchJson(`${API_BASE}/server/plugins?servername=${encodeURIComponent(serverName ?? "")}`, getAuthOptions());
-        if (isMounted) setPlugins(Array.isArray(pluginsData.plugins) ? pluginsData.plugins : []);
-
-        // Used RAM (only if online, from /server/stats)
-        let usedRamValue = "?";
-        if (statusData.status === "running") {
-          console.log("[ServerStats] Fetching stats for", serverName);
-          const statsData = await fetchJson(`${API_BASE}/server/stats?servername=${encodeURIComponent(serverName ?? "")}`, getAuthOptions());
-          usedRamValue = statsData.ram_used !== undefined ? statsData.ram_used + " MB" : "?";
-        }
-        if (isMounted) setRamUsed(usedRamValue);
-
-        // Logs (only if online)
-        if (statusData.status === "running") {
-          console.log("[ServerStats] Fetching logs for", serverName);
-          try {
-            const logsData = await fetchJson(`${API_BASE}/server/log?servername=${encodeURIComponent(serverName ?? "")}&lines=50`, getAuthOptions());
-            if (isMounted) setLogs(logsData.log ?? "");
-          } catch (err) {
-            if (isMounted) setLogs("");
-          }
-        } else {
-          if (isMounted) setLogs("");
-        }
+        // Alle Dashboard-Daten aus einem Snapshot statt acht Einzel-Requests
+        const data = await fetchJson(`${API_BASE}/server/overview?servername=${encodeURIComponent(serverName ?? "")}`, getAuthOptions());
+        server = data.server ?? {};
+        if (isMounted) applyServer(server);
       } catch (e) {
         console.error("[ServerStats] Error fetching stats:", e);
         if (isMounted) {
@@ -138,11 +105,49 @@ function parsePercent(used: string, max: string): string {
         setLoading(false);
       }
     }
+
+    // Live-Updates per WebSocket, Polling nur als Fallback solange keine Verbindung besteht
+    function connect() {
+      const token = localStorage.getItem("token") ?? "";
+      const protocol = window.location.protocol === "https:" ? "wss" : "ws";
+      socket = new WebSocket(
+        `${protocol}://${window.location.host}${API_BASE}/server/overview/ws?servername=${encodeURIComponent(serverName ?? "")}&token=${encodeURIComponent(token)}`
+      );
+      socket.onopen = () => {
+        if (poll) {
+          clearInterval(poll);
+          poll = null;
+        }
+      };
+      socket.onmessage = (event) => {
+        const message = JSON.parse(event.data);
+        const changes = message.servers?.[serverName ?? ""];
+        if (message.type === "snapshot") {
+          server = changes ?? {};
+        } else if (changes) {
+          server = { ...server, ...changes };
+        } else {
+          return;
+        }
+        if (isMounted) {
+          applyServer(server);
+          setLoading(false);
+        }
+      };
+      socket.onclose = () => {
+        if (!isMounted) return;
+        if (!poll) poll = setInterval(fetchAllStats, 5000);
+        reconnect = setTimeout(connect, 5000);
+      };
+    }
+
     fetchAllStats();
-    const poll = setInterval(fetchAllStats, 5000);
+    connect();
     return () => {
       isMounted = false;
-      clearInterval(poll);
+      if (socket) socket.close();
+      if (poll) clearInterval(poll);
+      if (reconnect) clearTimeout(reconnect);
     };
   }, [serverName]);
 
@@ -1,7 +1,7 @@
 import React, { useEffect, useState } from "react";
 import { Box, Typography, Paper, CircularProgress, Button } from "@mui/material";
 // import { fetchServers } from "../api/servers";
-import { getServerLog } from "../api/getServerLog";
+import { openConsoleSocket } from "../api/consoleSocket";
 
 interface ServerStatusPanelProps {
   serverName: string;
@@ -9,7 +9,8 @@ interface ServerStatusPanelProps {
   token?: string | null;
 }
 
-const POLL_INTERVAL = 2000;
+const MAX_LINES = 500;
+const DONE_PATTERN = /\[.*?\] \[Server thread\/INFO\]: Done \((\d+\.?\d*)s\)!/;
 
 const ServerStatusPanel: React.FC<ServerStatusPanelProps> = ({ serverName, onClose, token }) => {
   const [log, setLog] = useState("");
@@ -19,33 +20,39 @@ const ServerStatusPanel: React.FC<ServerStatusPanelProps> = ({ serverName, onClo
 
   useEffect(() => {
     let active = true;
-    async function poll() {
-      try {
-        // const servers = await fetchServers(token || null);
-        // const server = servers.find((s) => s.name === serverName);
-        const logRes = await getServerLog(serverName, token);
-        const logText = logRes.log || "";
-        setLog(logText);
+    let buffer: string[] = [];
+    // Konsole wird live gestreamt statt alle 2 s das Log neu zu laden
+    const stream = openConsoleSocket(serverName, token, {
+      onLines: (lines) => {
+        if (!active) return;
+        buffer = buffer.concat(lines).slice(-MAX_LINES);
+        setLog(buffer.join(""));
         setError(null);
-
-        // Improved status logic: show "booting up" until the final Done (xx.xxs)! line
-        const doneMatch = logText.match(/\[.*?\] \[Server thread\/INFO\]: Done \((\d+\.?\d*)s\)!/g);
-        if (doneMatch && doneMatch.length > 0) {
+        // "booting up" anzeigen, bis die finale Done (xx.xxs)! Zeile kommt
+        if (lines.some((line) => DONE_PATTERN.test(line))) {
           setStatus("running");
           setLoading(false);
-        } else {
+        }
+      },
+      onEvent: (event) => {
+        if (!active) return;
+        if (event.type === "started") {
+          buffer = [];
           setStatus("booting");
           setLoading(true);
+        } else if (event.type === "exit") {
+          setError(`Server exited (code ${event.code})`);
+          setLoading(false);
         }
-      } catch (e: any) {
-        setError(e?.response?.data?.detail || e?.message || "Error loading logs or status.");
-      }
-      if (active && status !== "running") {
-        setTimeout(poll, POLL_INTERVAL);
-      }
-    }
-    poll();
-    return () => { active = false; };
+      },
+      onClose: () => {
+        if (active) setError("Console connection lost.");
+      },
+    });
+    return () => {
+      active = false;
+      stream.close();
+    };
   }, [serverName, token]);
 
   return (
@@ -48,30 +48,23 @@ const WorldSettingsPage: React.FC = () => {
     setSuccess(false);
     const token = localStorage.getItem("token");
     const headers = {
-      "Content-Type": "application/x-www-form-urlencoded",
+      "Content-Type": "application/json",
       Authorization: token ? `Bearer ${token}` : ""
     };
     try {
-      await fetch(`/api/server/properties/set-seed`, {
+      const res = await fetch(`/api/server/properties/batch?servername=${encodeURIComponent(servername)}`, {
         method: "POST",
         headers,
-        body: new URLSearchParams({ servername, seed })
-      });
-      await fetch(`/api/server/properties/set-nether`, {
-        method: "POST",
-        headers,
-        body: new URLSearchParams({ servername, allow: netherEnd ? "true" : "false" })
-      });
-      await fetch(`/api/server/properties/set`, {
-        method: "POST",
-        headers,
-        body: new URLSearchParams({ servername, key: "allow-end", value: netherEnd ? "true" : "false" })
-      });
-      await fetch(`/api/server/properties/set-difficulty`, {
-        method: "POST",
-        headers,
-        body: new URLSearchParams({ servername, difficulty })
+        body: JSON.stringify({
+          properties: {
+            "level-seed": seed,
+            "allow-nether": netherEnd,
+            "allow-end": netherEnd,
+            difficulty
+          }
+        })
       });
+      if (!res.ok) throw new Error(`HTTP ${res.status}`);
       setSuccess(true);
     } catch (e) {
       setError("Failed to save world settings.");